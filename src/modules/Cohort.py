@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains a runner to compute the competences of a whole cohort of students.
+
+Instead of reading each history (:meth:`modules.Score.read_json`), getting the best scores and
+walking over the graphs (:meth:`modules.grid.Competence.BFS.walk`) by hand, :meth:`run` reads a
+directory of parsed histories (the ``assets/parsed_scores`` folder), splits them into chunks and
+scores them in a :class:`concurrent.futures.ProcessPoolExecutor`.
+
+- Each worker compiles the competence graphs only once (see :class:`modules.grid.Scoring.ScoringEngine`)
+- The results are written (in order) to a CSV or Parquet file, chunk by chunk, so the memory\
+    doesn't grow with the number of students
+
+Example
+-------
+>>> from modules import Cohort
+>>> from modules.grid import Competence
+>>> grafos = Competence.BFS.generate_graphs(out, nodes)
+>>> Cohort.run(path.join('..', 'assets', 'parsed_scores'), grafos, 'competences.csv')
+1530
+
+It can also be called from the command line, using the graphs saved with :func:`pickle.dump`:
+
+.. code-block:: bash
+
+    python -m modules.Cohort ../assets/parsed_scores competences.csv --graphs grafos.pickle
+"""
+
+# imports
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from os import cpu_count, path, scandir
+from typing import Deque, Dict, Final, Iterator, List, Optional
+from networkx.classes.digraph import DiGraph
+from pandas.core.frame import DataFrame
+import pickle
+import logging
+from . import Score
+from .grid.Scoring import ScoringEngine
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# Nome da coluna (índice) com o identificador do aluno
+STUDENT: Final[str] = 'Matricula'
+
+# Número de históricos processados por tarefa
+DEFAULT_CHUNKSIZE: Final[int] = 256
+
+# engine do processo (criada uma única vez, em :func:`_init_worker`)
+_engine: Optional[ScoringEngine] = None
+
+
+def list_histories(directory: str) -> List[str]:
+    """
+    Get all parsed histories (json files) of a directory.
+
+    Args
+    ----
+    `directory`:
+        The directory where the histories are placed. E.g: `assets/parsed_scores`
+
+    Returns
+    -------
+    List[str]
+        The path of each json file, sorted by name
+    """
+    with scandir(directory) as it:
+        return sorted(
+            e.path for e in it if e.is_file() and e.name.endswith('.json'))
+
+
+def _chunks(files: List[str], chunksize: int) -> Iterator[List[str]]:
+    """
+    Split the files into chunks of `chunksize`.
+    """
+    for i in range(0, len(files), chunksize):
+        yield files[i:i+chunksize]
+
+
+def _init_worker(grafos: Dict[str, DiGraph], isBFS: bool, roundp: int) -> None:
+    """
+    Compile the graphs once, for each worker process.
+
+    Args
+    ----
+    `grafos`:
+        A dictionary mapping competences to graphs equivalent.
+    `isBFS`:
+        If settled, scores like :meth:`modules.grid.Competence.BFS.walk`. Otherwise, like DFS.
+    `roundp`:
+        The number of decimal places used when rounding.
+    """
+    global _engine
+    _engine = ScoringEngine(grafos, isBFS=isBFS, roundp=roundp)
+
+
+def _score_chunk(files: List[str]) -> DataFrame:
+    """
+    Score a chunk of histories, using the engine of the current worker.
+
+    Args
+    ----
+    `files`:
+        The path of each history (json)
+
+    Returns
+    -------
+    DataFrame
+        A dataframe mapping each student (the file name) to its competences
+    """
+    notas = [Score.best_scores(Score.read_json(f)) for f in files]
+    alunos = [path.splitext(path.basename(f))[0] for f in files]
+
+    frame = DataFrame(
+        _engine.score(_engine.grades(notas)),
+        index=alunos,
+        columns=_engine.competences)
+    frame.index.name = STUDENT
+    return frame
+
+
+class _Writer:
+    """
+    Append chunks of results to a CSV or Parquet file (chosen by the extension of `output`).
+
+    Args
+    ----
+    `output`:
+        The file path. If it ends with `.parquet`, it will use :mod:`pyarrow`.
+
+    Important
+    ---------
+    Writing parquet files requires the `pyarrow` package.
+    """
+
+    def __init__(self, output: str) -> None:
+        self.output: str = output
+        self.parquet: bool = output.endswith('.parquet')
+        self._writer = None
+        self._header: bool = True
+
+        if self.parquet:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as e:
+                raise ImportError(
+                    'Writing parquet files requires the "pyarrow" package') from e
+
+    def write(self, frame: DataFrame) -> None:
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.output, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(
+                self.output, mode='w' if self._header else 'a', header=self._header)
+        self._header = False
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run(
+        directory: str,
+        grafos: Dict[str, DiGraph],
+        output: str,
+        isBFS: bool = True,
+        roundp: int = 2,
+        workers: Optional[int] = None,
+        chunksize: int = DEFAULT_CHUNKSIZE) -> int:
+    """
+    Compute the competences of all students of a directory.
+
+    Args
+    ----
+    `directory`:
+        The directory where the parsed histories (json) are placed. E.g: `assets/parsed_scores`
+    `grafos`:
+        A dictionary mapping competences to graphs equivalent.\
+            See :meth:`modules.grid.Competence.BFS.generate_graphs`
+    `output`:
+        The output file (`.csv` or `.parquet`). Each row is a student (the file name) and each\
+            column is a competence.
+
+    Keyword Args
+    ------------
+    `isBFS`:
+        If settled, scores like :meth:`modules.grid.Competence.BFS.walk`. Otherwise, like\
+            :meth:`modules.grid.Competence.DFS._dag_walk` (see :class:`modules.grid.Scoring.ScoringEngine`)
+    `roundp`:
+        The number of decimal places used when rounding.
+    `workers`:
+        The number of processes. If None, it uses the number of processors.
+    `chunksize`:
+        The number of histories scored by each task (and written at once).
+
+    Returns
+    -------
+    int
+        The number of students written
+
+    Note
+    ----
+    Only a few chunks (twice the number of workers) are processed at the same time, so the memory\
+        doesn't depend on the number of students. The output keeps the order of the files.
+
+    Important
+    ---------
+    When a student has no score in a competence, its value is 0.0 (see\
+        :class:`modules.grid.Scoring.ScoringEngine`).
+    """
+    files: List[str] = list_histories(directory)
+    logger.info(f'Scoring {len(files)} students from "{directory}"')
+
+    workers = workers or cpu_count() or 1
+    # número máximo de chunks em processamento (ou esperando para serem escritos)
+    window: int = 2*workers
+
+    writer = _Writer(output)
+    total: int = 0
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(grafos, isBFS, roundp)) as executor:
+        pending: Deque[Future] = deque()
+        try:
+            for chunk in _chunks(files, chunksize):
+                pending.append(executor.submit(_score_chunk, chunk))
+                # escreve o mais antigo, quando a janela estiver cheia
+                if len(pending) >= window:
+                    frame = pending.popleft().result()
+                    writer.write(frame)
+                    total += len(frame)
+            while pending:
+                frame = pending.popleft().result()
+                writer.write(frame)
+                total += len(frame)
+        finally:
+            writer.close()
+            for future in pending:
+                future.cancel()
+
+    logger.info(f'{total} students written to "{output}"')
+    return total
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command line entry point. See :meth:`run`.
+    """
+    parser = ArgumentParser(
+        description='Compute the competences of all students of a directory')
+    parser.add_argument(
+        'directory', help='The directory of parsed histories (json)')
+    parser.add_argument('output', help='The output file (.csv or .parquet)')
+    parser.add_argument(
+        '--graphs', required=True,
+        help='A pickle file of the competence graphs (Dict[str, DiGraph])')
+    parser.add_argument(
+        '--dfs', action='store_true', help='Score like DFS.walk (default: BFS)')
+    parser.add_argument('--roundp', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args(argv)
+
+    with open(args.graphs, 'rb') as f:
+        grafos: Dict[str, DiGraph] = pickle.load(f)
+
+    run(args.directory, grafos, args.output,
+        isBFS=not args.dfs,
+        roundp=args.roundp,
+        workers=args.workers,
+        chunksize=args.chunksize)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
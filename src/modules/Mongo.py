@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains a registry of the mongo clients, shared by the whole process.
+
+Each :class:`pymongo.MongoClient` has its own connection pool (and monitoring threads), so creating
+one for each object (e.g: each call of :meth:`modules.grid.Grid.get_grid`) means new handshakes and
+leaked pools. The :class:`ClientRegistry` creates a single client for each connection string, and
+closes all of them when the interpreter exits.
+
+Both :class:`modules.ahp.Database.SigaaDatabase` and :class:`modules.grid.Database.Grids` use the
+shared :data:`registry`.
+
+Example
+-------
+>>> from modules import Mongo
+>>> client = Mongo.get_client(connection_string)
+>>> client is Mongo.get_client(connection_string)
+True
+>>> db = client['sigaadb']
+"""
+
+# imports
+from typing import Any, Callable, Dict, Final, Optional
+from pymongo import MongoClient
+import atexit
+import threading
+import logging
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# Número máximo padrão de conexões de cada cliente (o mesmo do pymongo)
+DEFAULT_POOL_SIZE: Final[int] = 100
+
+
+class ClientRegistry:
+    """
+    A thread-safe registry of pooled mongo clients, keyed by connection string.
+
+    Keyword Args
+    ------------
+    `factory`:
+        The function that creates a client (e.g: `mongomock.MongoClient`, in tests)
+    `max_pool_size`:
+        The default maximum number of connections of each client
+
+    Important
+    ---------
+    The clients are shared, so they must not be closed by their users. Use :meth:`close`.
+    """
+
+    def __init__(
+            self,
+            factory: Callable[..., Any] = MongoClient,
+            max_pool_size: int = DEFAULT_POOL_SIZE) -> None:
+        self.factory: Callable[..., Any] = factory
+        self.max_pool_size: int = max_pool_size
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, connection_string: str, max_pool_size: Optional[int] = None) -> MongoClient:
+        """
+        Get the client of a connection string, creating it if needed.
+
+        Args
+        ----
+        `connection_string`:
+            A connection string to mongo server.
+
+        Keyword Args
+        ------------
+        `max_pool_size`:
+            The maximum number of connections (:attr:`max_pool_size` by default). It's only\
+                used when the client is created.
+
+        Returns
+        -------
+        MongoClient
+            The shared client
+        """
+        with self._lock:
+            client = self._clients.get(connection_string)
+            if client is None:
+                size: int = self.max_pool_size if max_pool_size is None else max_pool_size
+                client = self._clients[connection_string] = self.factory(
+                    connection_string, maxPoolSize=size)
+                logger.debug(f'Creating a MongoClient (pool of {size}) for {connection_string}')
+            elif max_pool_size is not None:
+                logger.debug(
+                    f'Reusing the MongoClient for {connection_string}, max_pool_size ignored')
+            return client
+
+    def close(self, connection_string: Optional[str] = None) -> None:
+        """
+        Close the client of a connection string (or all of them).
+
+        Keyword Args
+        ------------
+        `connection_string`:
+            The connection string. All clients are closed, by default.
+
+        Note
+        ----
+        It's called when the interpreter exits (for :data:`registry`).
+        """
+        with self._lock:
+            if connection_string is None:
+                clients = list(self._clients.values())
+                self._clients.clear()
+            else:
+                client = self._clients.pop(connection_string, None)
+                clients = [] if client is None else [client]
+
+        for client in clients:
+            client.close()
+        if clients:
+            logger.debug(f'{len(clients)} MongoClient closed')
+
+    def __contains__(self, connection_string: str) -> bool:
+        return connection_string in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+# Registro compartilhado pelo processo
+registry: ClientRegistry = ClientRegistry()
+atexit.register(lambda: registry.close())
+
+
+def get_client(connection_string: str, max_pool_size: Optional[int] = None) -> MongoClient:
+    """
+    The same of :meth:`ClientRegistry.get`, using the shared registry (:data:`registry`).
+    """
+    return registry.get(connection_string, max_pool_size=max_pool_size)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains numeric helpers shared by the vectorized implementations (e.g:\
+    :mod:`modules.grid.Scoring` and :mod:`modules.ahp.Ahp`).
+
+They don't depend on the other modules, so any of them can import it.
+
+Example
+-------
+>>> from modules import Numeric
+>>> Numeric.around(np.array([2.675, 2.6751]), 2)
+array([2.67, 2.68])
+"""
+
+# imports
+from typing import Tuple
+import numpy as np
+
+
+def around(values: np.ndarray, roundp: int) -> np.ndarray:
+    """
+    Round all values, like the built-in :func:`round` does for each float.
+
+    Args
+    ----
+    `values`:
+        The values to be rounded
+    `roundp`:
+        The number of decimal places
+
+    Returns
+    -------
+    np.ndarray
+        The rounded values
+
+    Note
+    ----
+    :func:`numpy.round` scales the value before rounding, so it may differ from :func:`round` when\
+        the value is (almost) a tie. E.g: ``round(2.675, 2)`` is 2.67, however, ``np.round(2.675, 2)`` is 2.68.\
+            Those values are rounded by :func:`round`.
+    """
+    result: np.ndarray = np.round(values, roundp)
+    scaled: np.ndarray = values * 10**roundp
+    with np.errstate(invalid='ignore'):
+        empates: np.ndarray = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in zip(*np.nonzero(empates)):
+        result[i] = round(float(values[i]), roundp)
+    return result
+
+
+def broadcast_shapes(*shapes: Tuple[int, ...]) -> Tuple[int, ...]:
+    """
+    The shape of the arrays with `shapes` broadcasted together.
+
+    Args
+    ----
+    `shapes`:
+        The shapes of the arrays
+
+    Returns
+    -------
+    Tuple[int, ...]
+        The broadcasted shape (an empty tuple, if there are no shapes)
+
+    Raises
+    ------
+    `ValueError`:
+        If the shapes can't be broadcasted
+
+    Note
+    ----
+    The same of :func:`numpy.broadcast_shapes`, which only exists since numpy 1.20. The arrays are\
+        views of a scalar (nothing is allocated).
+    """
+    # o escalar (shape vazio) não muda o resultado, e garante ao menos dois argumentos
+    return np.broadcast(0, 0, *(np.broadcast_to(0, shape) for shape in shapes)).shape
@@ -6,6 +6,7 @@ This module contains methods to:
 - Read a given student history (pdf), and parse it into a dataframe. :meth:`parse_pdf`
 - Save the dataframe into a json. :meth:`save_analysis`
 - Load the json equivalent to a dataframe object. :meth:`read_json`
+- Get the best score of each class of a student's history. :meth:`best_scores`
 
 Todo
 ----
@@ -21,9 +22,7 @@ Implement loggers for:
 """
 
 from os import path
-from typing import List, Union
-# Tabula also needs the java installed
-import tabula
+from typing import Dict, List, Union
 # Pandas dataframe type
 from pandas import DataFrame
 # Parse json to string
@@ -64,6 +63,47 @@ def read_json(filepath: str) -> json:
     return out
 
 
+def best_scores(student_grid: json) -> Dict[str, float]:
+    """
+    Get the best score of each class that the student took.
+
+    Args
+    ----
+    `student_grid`:
+        The student history, as returned by :meth:`read_json` (or :meth:`parse_pdf`)
+
+    Returns
+    -------
+    Dict[str, float]
+        A dictionary mapping a class acronym to the highest student's score for it
+
+    Note
+    ----
+    The classes that the student is still taking (score equal to "--") are ignored.
+
+    Example
+    -------
+    >>> from modules import Score
+    >>> notas = Score.best_scores(Score.read_json('2016001942.json'))
+    >>> Competence.BFS.walk(grafos, notas)
+    """
+    notas: Dict[str, float] = {}
+
+    # anda sobre os períodos
+    for periodo in student_grid.values():
+        # itera sobre as matérias
+        for materia, dados in periodo.items():
+            score = dados['scores']
+            # pode ser uma string ("--") se ainda está cursando a matéria, ignora
+            if type(score) is str:
+                continue
+            score = float(score)
+            # Coloca a maior nota do aluno, caso este já tenha repetido a matéria
+            notas[materia] = max(notas[materia], score) \
+                if materia in notas else score
+    return notas
+
+
 def save_analysis(out: DataFrame, filename: str, dirname: str) -> None:
     """
     Save the score loaded into a json object.
@@ -104,6 +144,9 @@ def parse_pdf(studentId: str, inputDir: str, outDir: str = None) -> DataFrame:
         Returns a dataframe containing the parsed value
     """
 
+    # Tabula also needs the java installed (only needed to parse the pdf)
+    import tabula
+
     # Read pdf file
     df: List[DataFrame] = tabula.read_pdf(  # type: ignore
         path.join(inputDir, f'historico_{studentId}.pdf'),
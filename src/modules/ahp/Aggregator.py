@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains an online (streaming) version of :meth:`modules.util.calc_mean_matrix`.
+
+When a new answer arrives, :meth:`modules.util.calc_mean_matrix` must be called again with all
+answers (loaded from the database). The :class:`AhpAggregator` keeps, for each respondent type and
+matrix id, the running sum, the count, the sum of logarithms (of the positive entries) and the number
+of zero entries of the valid matrices, so an answer
+can be added (or removed) in O(k²), and the mean matrices are calculated on demand.
+
+Example
+-------
+>>> from modules.ahp.Aggregator import AhpAggregator
+>>> aggregator = AhpAggregator()
+>>> for response in ahp.getAll():
+...     aggregator.add(response)
+>>> aggregator.add(new_response)
+['root', 'q1', 'q12', 'q13', 'q15', 'q2', 'q3']
+>>> aggregator.mean_matrices(FormDataType.MARKET)  # like calc_mean_matrix(market_responses)
+>>> aggregator.priorities(FormDataType.MARKET)  # like calc_ahp_for_new_mat(...)
+>>> # the state can be stored (e.g: json), and restored later
+>>> state = aggregator.to_dict()
+>>> aggregator = AhpAggregator.from_dict(state)
+"""
+
+# imports
+from typing import Any, Dict, Final, List, Optional, Union
+import numpy as np
+import logging
+from modules import util
+from modules.ahp import Ahp, Cache
+from modules.ahp.Types import FormData, FormDataType
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# Id da matriz que é um escalar
+SCALAR: Final[str] = 'q15'
+
+# Versão do formato do estado
+VERSION: Final[str] = 'ahp-aggregator-v2'
+
+
+class _Accumulator:
+    """
+    The running sums of a matrix id (of a respondent type).
+    """
+    __slots__ = ('count', 'sum', 'logsum', 'zeros')
+
+    def __init__(self, shape: tuple) -> None:
+        self.count: int = 0
+        self.sum: np.ndarray = np.zeros(shape)
+        # log(0) é -inf (e -inf - -inf é NaN), então os zeros são contados à parte
+        self.logsum: np.ndarray = np.zeros(shape)
+        self.zeros: np.ndarray = np.zeros(shape, dtype=np.int64)
+
+
+class AhpAggregator:
+    """
+    Aggregates the AHP answers, as they arrive.
+
+    Keyword Args
+    ------------
+    `method`:
+        The AHP method used to check if a matrix is valid. See :meth:`modules.ahp.Ahp.calculate`
+
+    Important
+    ---------
+    Like :meth:`modules.util.calc_mean_matrix`, the matrices that weren't filled (or whose CR is\
+        greater than 0.1), and the scalars (q15) equal to 0 are ignored. A (valid) matrix may have\
+            zero entries, those cells have a geometric mean equal to 0 while they are in the aggregator.
+
+    Caution
+    -------
+    :meth:`remove` must only be called with answers that were added. Since the sums are updated\
+        in place, after many removals the means may differ (in the last bits) from the ones\
+            calculated from scratch.
+    """
+
+    def __init__(self, method: str = Ahp.APPROXIMATE) -> None:
+        self.method: str = method
+        # type -> matrix id -> acumuladores
+        self._data: Dict[str, Dict[str, _Accumulator]] = {}
+
+    def _valid(self, matrix: str, value: Any) -> Optional[np.ndarray]:
+        """
+        Get the value used in the mean (or None if it must be ignored).
+        See :meth:`modules.util.calc_mean_matrix`
+        """
+        if matrix == SCALAR:
+            return np.array(Ahp.get_q15_value(value)) if value != 0 else None
+
+        # a matriz deve estar preenchida e ser um ahp válido
+        if value[0][0] == 0:
+            return None
+        cr, _ = Cache.calculate(value, method=self.method)
+        return np.asarray(value, dtype=np.float64) if cr <= 0.1 else None
+
+    def _update(self, response: FormData, sign: int) -> List[str]:
+        """
+        Add (sign=1) or remove (sign=-1) an answer.
+        """
+        t: str = response.getType().value
+        acumuladores: Dict[str, _Accumulator] = self._data.setdefault(t, {})
+
+        # valida todas as matrizes antes de alterar os acumuladores
+        valores: Dict[str, np.ndarray] = {}
+        for matrix, value in response.getMatrices().items():
+            v: Optional[np.ndarray] = self._valid(matrix, value)
+            if v is None:
+                continue
+            acc: Optional[_Accumulator] = acumuladores.get(matrix)
+            if sign < 0 and (acc is None or acc.count == 0):
+                raise ValueError(f'The matrix {matrix} ({t}) has no answers')
+            if acc is not None and acc.sum.shape != v.shape:
+                raise ValueError(
+                    f'The matrix {matrix} ({t}) has shape {acc.sum.shape}, got {v.shape}')
+            valores[matrix] = v
+
+        for matrix, v in valores.items():
+            acc = acumuladores.get(matrix)
+            if acc is None:
+                acc = acumuladores[matrix] = _Accumulator(v.shape)
+            acc.count += sign
+            acc.sum += sign * v
+            if matrix != SCALAR:
+                positivo: np.ndarray = v > 0
+                acc.logsum += sign * np.log(np.where(positivo, v, 1.0))
+                acc.zeros += sign * ~positivo
+
+        changed: List[str] = list(valores)
+        logger.debug(f'{"Added" if sign > 0 else "Removed"} {response.getName()}: {changed}')
+        return changed
+
+    def add(self, response: FormData) -> List[str]:
+        """
+        Add an answer.
+
+        Args
+        ----
+        `response`:
+            The answer
+
+        Returns
+        -------
+        List[str]
+            The matrix ids whose values were used (the valid ones)
+        """
+        return self._update(response, 1)
+
+    def remove(self, response: FormData) -> List[str]:
+        """
+        Remove an answer (previously added).
+
+        Args
+        ----
+        `response`:
+            The answer
+
+        Returns
+        -------
+        List[str]
+            The matrix ids whose values were removed
+
+        Raises
+        ------
+        `ValueError`:
+            If some matrix of this answer has no answers (it wasn't added)
+        """
+        return self._update(response, -1)
+
+    def count(self, tt: FormDataType, matrix: str) -> int:
+        """
+        The number of valid answers of a matrix.
+        """
+        acc: Optional[_Accumulator] = self._data.get(tt.value, {}).get(matrix)
+        return acc.count if acc is not None else 0
+
+    def mean(
+            self,
+            tt: FormDataType,
+            matrix: str,
+            mode: str = util.ARITHMETIC,
+            roundp: int = 4) -> Union[float, List[List[float]]]:
+        """
+        The mean of a matrix. See :meth:`modules.util.average`
+
+        Args
+        ----
+        `tt`:
+            The respondent type
+        `matrix`:
+            The matrix id
+
+        Keyword Args
+        ------------
+        `mode`:
+            `ARITHMETIC` or `GEOMETRIC` mean (the scalar always uses the arithmetic one)
+        `roundp`:
+            Number of decimal places used to round
+
+        Returns
+        -------
+        Union[float, List[List[float]]]
+            The mean matrix (or value, for q15)
+
+        Raises
+        ------
+        `MinimumLenghtError`:
+            If there are less than 2 valid answers
+        `ValueError`:
+            If the `mode` is unknown
+        """
+        acc: Optional[_Accumulator] = self._data.get(tt.value, {}).get(matrix)
+        if acc is None or acc.count < 2:
+            raise util.MinimumLenghtError(
+                f'The matrix {matrix} ({tt.value}) must have, at least, 2 valid answers')
+
+        if mode == util.ARITHMETIC or matrix == SCALAR:
+            out: np.ndarray = acc.sum / acc.count
+        elif mode == util.GEOMETRIC:
+            # um elemento 0 resulta em 0
+            out = np.where(acc.zeros > 0, 0.0, np.exp(acc.logsum / acc.count))
+        else:
+            raise ValueError(
+                f'Unknown mode "{mode}". Expected "{util.ARITHMETIC}" or "{util.GEOMETRIC}"')
+
+        if matrix == SCALAR:
+            return round(float(out), roundp)
+        return np.round(out, roundp).tolist()
+
+    def mean_matrices(
+            self,
+            tt: FormDataType,
+            mode: str = util.ARITHMETIC) -> Dict[str, Union[float, List[List[float]]]]:
+        """
+        The mean of all matrices of a respondent type.
+        It's equivalent to :meth:`modules.util.calc_mean_matrix`.
+
+        Args
+        ----
+        `tt`:
+            The respondent type
+
+        Keyword Args
+        ------------
+        `mode`:
+            `ARITHMETIC` or `GEOMETRIC` mean
+
+        Returns
+        -------
+        Dict[str, Union[float, List[List[float]]]]
+            A dictionary mapping each matrix to its equivalent mean matrix (as lists, like\
+                :meth:`modules.util.calc_mean_matrix`).
+        """
+        return {matrix: self.mean(tt, matrix, mode=mode)
+                for matrix in self._data.get(tt.value, {})}
+
+    def priorities(
+            self,
+            tt: FormDataType,
+            mode: str = util.ARITHMETIC) -> Dict[str, Union[List[float], float]]:
+        """
+        The priority vectors of the mean matrices.
+        It's equivalent to :meth:`modules.util.calc_ahp_for_new_mat` of :meth:`mean_matrices`.
+
+        Args
+        ----
+        `tt`:
+            The respondent type
+
+        Keyword Args
+        ------------
+        `mode`:
+            `ARITHMETIC` or `GEOMETRIC` mean
+
+        Returns
+        -------
+        Dict[str, Union[List[float], float]]
+            A dictionary containing the *priority vector* of each matrix.
+        """
+        return util.calc_ahp_for_new_mat(
+            self.mean_matrices(tt, mode=mode), method=self.method)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The state of the aggregator (JSON serializable).
+
+        Returns
+        -------
+        Dict[str, Any]
+            The state. See :meth:`from_dict`
+        """
+        return {
+            'version': VERSION,
+            'method': self.method,
+            'data': {
+                t: {matrix: {
+                    'count': acc.count,
+                    'sum': acc.sum.tolist(),
+                    'logsum': acc.logsum.tolist(),
+                    'zeros': acc.zeros.tolist()}
+                    for matrix, acc in acumuladores.items()}
+                for t, acumuladores in self._data.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'AhpAggregator':
+        """
+        Restore an aggregator.
+
+        Args
+        ----
+        `state`:
+            The state, created by :meth:`to_dict`
+
+        Returns
+        -------
+        AhpAggregator
+            The aggregator
+
+        Raises
+        ------
+        `ValueError`:
+            If the state was created by another version
+        """
+        if state.get('version') != VERSION:
+            raise ValueError(f'Invalid state version: {state.get("version")}')
+
+        aggregator = cls(method=state['method'])
+        for t, acumuladores in state['data'].items():
+            for matrix, value in acumuladores.items():
+                acc = _Accumulator(())
+                acc.count = value['count']
+                acc.sum = np.array(value['sum'], dtype=np.float64)
+                acc.logsum = np.array(value['logsum'], dtype=np.float64)
+                acc.zeros = np.array(value['zeros'], dtype=np.int64)
+                aggregator._data.setdefault(t, {})[matrix] = acc
+        return aggregator
@@ -17,6 +17,9 @@ from copy import deepcopy
 from typing import Dict, Final, List, Tuple, Union, no_type_check
 import typing
 import logging
+import numpy as np
+from modules import Numeric
+from modules.ahp import RandomIndex
 logger = logging.getLogger(__name__)
 
 # Inconsistency index (Random Index, RI) mapping.\
@@ -46,8 +49,48 @@ __RI: List[float] = [
     1.59
 ]
 
+# Maior matriz cujo RI foi calculado por Saaty
+MAX_TABLE_LENGTH: Final[int] = len(__RI)
 
-def calculate(obj: List[List[float]], roundp: int = 4) -> Tuple[float, List[float]]:
+# Métodos usados para calcular o vetor de prioridades (e o lambda_max)
+APPROXIMATE: Final[str] = 'approximate'
+EIGENVECTOR: Final[str] = 'eigenvector'
+METHODS: Final[List[str]] = [APPROXIMATE, EIGENVECTOR]
+
+# Critérios de parada padrão da iteração das potências (método do autovetor)
+DEFAULT_TOLERANCE: Final[float] = 1e-10
+DEFAULT_MAX_ITER: Final[int] = 1000
+
+# Posições (em COMPETENCES_MATRIX_FORM_Q1) das competências usadas do q1. See :meth:`Mapping.remove_unused_keys`
+Q1_FORM_INDEX: Final[np.ndarray] = np.array([0, 3, 5], dtype=np.intp)
+
+
+def random_index(length: int) -> float:
+    """
+    Get the random index (RI) of a matrix with `length` columns.
+
+    Beyond the table calculated by Saaty (15 columns), the RI is estimated by Monte Carlo\
+        (see :mod:`modules.ahp.RandomIndex`), and stored in disk.
+
+    Raises
+    ------
+    `IndexError`:
+        If there's no RI for this size
+
+    .. versionchanged:: 0.0.10
+        Matrices greater than 15×15 use :data:`modules.ahp.RandomIndex.default`
+    """
+    if length > MAX_TABLE_LENGTH:
+        return RandomIndex.default.get(length)
+    return __RI[length-1]
+
+
+def calculate(
+        obj: List[List[float]],
+        roundp: int = 4,
+        method: str = APPROXIMATE,
+        tol: float = DEFAULT_TOLERANCE,
+        max_iter: int = DEFAULT_MAX_ITER) -> Tuple[float, List[float]]:
     """
     Calculates AHP and returns the *IC* and *priority_vector*.
     To an AHP be valid, it must have its IC bellow than 0.1.
@@ -61,6 +104,13 @@ def calculate(obj: List[List[float]], roundp: int = 4) -> Tuple[float, List[floa
     ------------
     `roundp`:
         The number of decimal places used to round.
+    `method`:
+        How the priority vector is calculated: `APPROXIMATE` (the average of the normalized\
+            columns) or `EIGENVECTOR` (the principal eigenvector). See :meth:`calculate_batch`
+    `tol`:
+        The convergence tolerance of the `EIGENVECTOR` method
+    `max_iter`:
+        The maximum number of iterations of the `EIGENVECTOR` method
 
     Returns
     -------
@@ -94,7 +144,17 @@ def calculate(obj: List[List[float]], roundp: int = 4) -> Tuple[float, List[floa
 
     .. _Analytic Hierarchy Process:
         https://www.youtube.com/watch?v=J4T70o8gjlk&ab_channel=ManojMathew
+
+    .. versionchanged:: 0.0.10
+        Added the `method` argument.
     """
+    if method != APPROXIMATE:
+        cr, priorityVec = calculate_batch(
+            [obj], roundp=roundp, method=method, tol=tol, max_iter=max_iter)
+        if not priorityVec.size:
+            return 1, []
+        return float(cr[0]), priorityVec[0].tolist()
+
     # The AHP work as follows:
     # 1) Developing a hierarchical structure with a goal at the top level, the attributes/criteria at
     #     the second level and the alternatives at the third level
@@ -113,6 +173,10 @@ def calculate(obj: List[List[float]], roundp: int = 4) -> Tuple[float, List[floa
     # 1) The Main objective is get the discrepance bettween answers, the alternatives are the questions
     logger.debug(f'Calculating AHP for {obj}. Rounding by {roundp}')
 
+    # os cálculos (e o arredondamento) são feitos com floats do python
+    if isinstance(obj, np.ndarray):
+        obj = obj.tolist()
+
     # the length of my matrix
     length = len(obj)
 
@@ -234,7 +298,7 @@ def calculate(obj: List[List[float]], roundp: int = 4) -> Tuple[float, List[floa
 
     # Calculate the consistency ratio CR, which is given by the formula:\
     # CR = CI/RI, where RI is the random index calculated by Saaty
-    cr = ci / __RI[length-1]
+    cr = ci / random_index(length)
 
     # to compare, it must be less than 0.1 by Saaty
     logger.debug(
@@ -242,6 +306,172 @@ def calculate(obj: List[List[float]], roundp: int = 4) -> Tuple[float, List[floa
     return cr, priorityVec
 
 
+def _sequential_sum(values: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Sum the values along an `axis`, one by one (like the built-in :func:`sum`).
+
+    Note
+    ----
+    :func:`numpy.sum` uses a pairwise summation, which may differ (in the last bits) from the\
+        sums done by :meth:`calculate`.
+    """
+    return np.cumsum(values, axis=axis).take(-1, axis=axis)
+
+
+def _power_iteration(
+        matrices: np.ndarray,
+        tol: float,
+        max_iter: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the principal eigenvalue (lambda_max) and eigenvector of each matrix.
+
+    Args
+    ----
+    `matrices`:
+        The matrices (n×k×k)
+    `tol`:
+        The iteration stops when the vector changes less than it (maximum absolute difference)
+    `max_iter`:
+        The maximum number of iterations
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The lambda_max (shape n) and the eigenvectors, normalized to sum 1 (shape n×k)
+
+    Note
+    ----
+    Only the matrices that didn't converge are multiplied on each iteration.
+    """
+    n, length = matrices.shape[0], matrices.shape[1]
+    vector: np.ndarray = np.full((n, length), 1/length)
+    lambda_max: np.ndarray = np.zeros(n)
+
+    # matrizes que ainda não convergiram
+    ativas: np.ndarray = np.arange(n)
+    iteracoes: int = 0
+    while ativas.size and iteracoes < max_iter:
+        iteracoes += 1
+        produto: np.ndarray = np.einsum(
+            'nij,nj->ni', matrices[ativas], vector[ativas])
+        # como o vetor anterior soma 1, a soma do produto é o lambda_max
+        soma: np.ndarray = produto.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            novo: np.ndarray = produto / soma[:, np.newaxis]
+            # NaN (e.g: uma matriz de zeros) nunca converge, então é descartado
+            convergiu: np.ndarray = ~(
+                np.abs(novo - vector[ativas]).max(axis=1) >= tol)
+        vector[ativas] = novo
+        lambda_max[ativas] = soma
+        ativas = ativas[~convergiu]
+
+    # assim como no método aproximado, uma matriz inválida resulta em NaN
+    lambda_max[~np.isfinite(vector).all(axis=1)] = np.nan
+
+    if ativas.size:
+        logger.warning(
+            f'{ativas.size} matrices didn\'t converge after {max_iter} iterations')
+    logger.debug(f'Power iteration stopped after {iteracoes} iterations')
+    return lambda_max, vector
+
+
+def calculate_batch(
+        stack: Union[np.ndarray, List[List[List[float]]]],
+        roundp: int = 4,
+        method: str = APPROXIMATE,
+        tol: float = DEFAULT_TOLERANCE,
+        max_iter: int = DEFAULT_MAX_ITER) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculates AHP for many matrices (with the same size) at once.
+    It's the vectorized version of :meth:`calculate`.
+
+    Args
+    ----
+    `stack`:
+        The matrices (an array with shape n×k×k) that holds the ahp values
+
+    Keyword Args
+    ------------
+    `roundp`:
+        The number of decimal places used to round (only used by the `APPROXIMATE` method).
+    `method`:
+        `APPROXIMATE`, the same calculation of :meth:`calculate`, or `EIGENVECTOR`, where the\
+            priority vector is the principal eigenvector (and lambda_max, its eigenvalue).\
+                It's found through a (batched) power iteration.
+    `tol`:
+        The convergence tolerance of the `EIGENVECTOR` method
+    `max_iter`:
+        The maximum number of iterations of the `EIGENVECTOR` method
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The CR of each matrix (shape n) and their priority vectors (shape n×k).
+
+    Raises
+    ------
+    `ValueError`:
+        If `stack` isn't a stack of square matrices, the `method` is unknown or `max_iter` is lower\
+            than 1 (with the `EIGENVECTOR` method)
+
+    Example
+    -------
+    >>> from modules.ahp import Ahp
+    >>> stack = np.array([matrix_a, matrix_b, matrix_c])
+    >>> cr, priority = Ahp.calculate_batch(stack)
+    >>> stack[cr < 0.1]  # the consistent ones
+
+    Note
+    ----
+    With the `APPROXIMATE` method, the results are exactly the same of :meth:`calculate`, for each\
+        matrix. When k <= 2, the CR is 1 and the priority vectors are empty (shape n×0).
+
+    Caution
+    -------
+    A matrix with a column summing 0 (which raises a `ZeroDivisionError` in :meth:`calculate`)\
+        results in NaN (or inf).
+    """
+    if method not in METHODS:
+        raise ValueError(f'Unknown method "{method}". Expected one of {METHODS}')
+    if method == EIGENVECTOR and max_iter < 1:
+        raise ValueError(f'The maximum number of iterations must be positive. Got {max_iter}')
+
+    matrices: np.ndarray = np.asarray(stack, dtype=np.float64)
+    if matrices.ndim != 3 or matrices.shape[1] != matrices.shape[2]:
+        raise ValueError(
+            f'Expected a stack of square matrices (n×k×k), got shape {matrices.shape}')
+
+    n, length = matrices.shape[0], matrices.shape[1]
+    logger.debug(f'Calculating AHP for {n} matrices {length}x{length}')
+
+    # If exist only 2 questions, ahp is not needed
+    if length <= 2:
+        return np.ones(n), np.empty((n, 0))
+
+    if method == EIGENVECTOR:
+        lambda_max, priorityVec = _power_iteration(matrices, tol, max_iter)
+        ci: np.ndarray = (lambda_max - length) / (length-1)
+        return ci / random_index(length), priorityVec
+
+    # as mesmas operações de "calculate", na mesma ordem, para todas as matrizes
+    with np.errstate(divide='ignore', invalid='ignore'):
+        column_sum: np.ndarray = _sequential_sum(matrices, axis=1)
+        normalized: np.ndarray = matrices / column_sum[:, np.newaxis, :]
+        priorityVec: np.ndarray = _sequential_sum(normalized, axis=2) / length
+
+        weighted: np.ndarray = Numeric.around(
+            priorityVec[:, np.newaxis, :] * matrices, roundp)
+        weightVec: np.ndarray = _sequential_sum(weighted, axis=2)
+
+        lambda_max: np.ndarray = _sequential_sum(
+            weightVec / priorityVec, axis=1) / length
+    ci = (lambda_max - length) / (length-1)
+    cr: np.ndarray = ci / random_index(length)
+
+    logger.debug(f'AHP calculated for {n} matrices')
+    return cr, priorityVec
+
+
 def get_q15_value(v: float, roundp: int = 3) -> float:
     """
     Get the equivalent value `v`, in percentual terms. (Normalized value)
@@ -276,6 +506,208 @@ def get_q15_value(v: float, roundp: int = 3) -> float:
     return round((v-1/9) / (9-1/9), roundp)
 
 
+class CompetenceLayout:
+    """
+    A frozen layout of the competences of each section (matrix), with its positions precomputed.
+
+    It maps a flat competence vector (or a matrix of students × competences) into the sections\
+        (e.g: `q1`, `q12`), and back, using NumPy indexing.
+
+    Args
+    ----
+    `sections`:
+        A dictionary mapping each section to its (ordered) competences. The flat vector is the\
+            concatenation of all sections (in this order).
+
+    Raises
+    ------
+    `ValueError`:
+        If a competence is in more than one section
+
+    Example
+    -------
+    >>> from modules.ahp.Ahp import SECTIONS_LAYOUT
+    >>> SECTIONS_LAYOUT.to_sections(notas_aluno)  # a dictionary
+    {'q1': array([0.8, 0.9, 0.3]), 'q12': array([...]), ...}
+    >>> # or, a matrix (students × competences), whose columns are `engine.competences`
+    >>> SECTIONS_LAYOUT.to_sections(engine.score(notas), columns=engine.competences)
+    {'q1': array([[0.8, 0.9, 0.3], [0.1, 0.2, 0.5]]), ...}
+    >>> SECTIONS_LAYOUT.from_sections(sections)  # the flat vector (or matrix)
+
+    Note
+    ----
+    The form section `q1` has 6 competences, however, only 3 of them are used\
+        (see :meth:`Mapping.remove_unused_keys`). A section `q1` with 6 values is reduced to 3. And,\
+            the scalar `q15` (x) is mapped to [x, 1-x].
+    """
+    __slots__ = ('sections', 'competences', 'position', 'index', '_names')
+
+    def __init__(self, sections: Dict[str, typing.Sequence[str]]) -> None:
+        competences: Tuple[str, ...] = tuple(
+            c for names in sections.values() for c in names)
+        position: Dict[str, int] = {c: i for i, c in enumerate(competences)}
+        if len(position) != len(competences):
+            raise ValueError('A competence must be in a single section')
+
+        index: Dict[str, np.ndarray] = {}
+        for section, names in sections.items():
+            idx = np.array([position[c] for c in names], dtype=np.intp)
+            idx.flags.writeable = False
+            index[section] = idx
+
+        # os atributos não podem ser alterados (veja __setattr__)
+        object.__setattr__(self, '_names', {k: tuple(v) for k, v in sections.items()})
+        object.__setattr__(self, 'sections', tuple(sections))
+        object.__setattr__(self, 'competences', competences)
+        object.__setattr__(self, 'position', position)
+        object.__setattr__(self, 'index', index)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f'{type(self).__name__} is frozen')
+
+    def __reduce__(self):
+        return (type(self), (dict(self._names),))
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({list(self.sections)})'
+
+    def columns(self, names: typing.Sequence[str]) -> np.ndarray:
+        """
+        The index of each competence of this layout, in a list of `names` (e.g: the columns\
+            of a matrix).
+
+        Raises
+        ------
+        `ValueError`:
+            If some competence isn't in `names`
+        """
+        where: Dict[str, int] = {c: i for i, c in enumerate(names)}
+        missing: List[str] = [c for c in self.competences if c not in where]
+        if missing:
+            raise ValueError(f"Element {missing[0]} not in competences")
+        return np.array([where[c] for c in self.competences], dtype=np.intp)
+
+    def vector(self, values: Dict[str, float]) -> np.ndarray:
+        """
+        The flat vector of a dictionary mapping competences to values.
+
+        Raises
+        ------
+        `ValueError`:
+            If some competence isn't in `values`
+        """
+        try:
+            return np.array([values[c] for c in self.competences], dtype=np.float64)
+        except KeyError as e:
+            raise ValueError(f"Element {e.args[0]} not in competences")
+
+    def to_dict(
+            self,
+            values: np.ndarray,
+            sections: typing.Optional[typing.Iterable[str]] = None) -> Dict[str, float]:
+        """
+        The dictionary (competence -> value) of a flat vector.
+
+        Args
+        ----
+        `values`:
+            The flat vector
+
+        Keyword Args
+        ------------
+        `sections`:
+            The sections included. If None, all of them
+        """
+        incluidas = set(self.sections if sections is None else sections)
+        vector: List[float] = np.asarray(values, dtype=np.float64).tolist()
+        return {c: vector[i]
+                for section in self.sections if section in incluidas
+                for c, i in zip(self._names[section], self.index[section].tolist())}
+
+    def to_sections(
+            self,
+            values: Union[Dict[str, float], np.ndarray],
+            columns: typing.Optional[typing.Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Split the competences into sections.
+
+        Args
+        ----
+        `values`:
+            A dictionary (competence -> value), a flat vector or a matrix (students × competences)
+
+        Keyword Args
+        ------------
+        `columns`:
+            The competence of each column of `values` (when it's an array). If None, the columns\
+                are in the order of :attr:`competences`
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            The values of each section. For a matrix, each section is a matrix (students × section).
+
+        Raises
+        ------
+        `ValueError`:
+            If some competence doesn't exist
+        """
+        if isinstance(values, dict):
+            values = self.vector(values)
+        else:
+            values = np.asarray(values, dtype=np.float64)
+            if columns is not None:
+                values = values[..., self.columns(columns)]
+            elif values.shape[-1] != len(self.competences):
+                raise ValueError(
+                    f'Expected {len(self.competences)} competences, got {values.shape[-1]}')
+        return {section: values[..., idx] for section, idx in self.index.items()}
+
+    def from_sections(self, sections: Dict[str, Union[List[float], float, np.ndarray]]) -> np.ndarray:
+        """
+        Join the sections into a flat vector (or a matrix, students × competences).
+
+        Args
+        ----
+        `sections`:
+            The values of each section (a list, or a matrix students × section).
+
+        Returns
+        -------
+        np.ndarray
+            The flat vector (or matrix). The competences of the missing sections are NaN.
+
+        Raises
+        ------
+        `ValueError`:
+            If a section doesn't have the expected length
+        """
+        arrays: Dict[str, np.ndarray] = {}
+        for section, value in sections.items():
+            if section not in self.index:
+                continue
+            v = np.asarray(value, dtype=np.float64)
+            length: int = self.index[section].size
+
+            # o q15 é um escalar (x), equivalente a [x, 1-x]
+            if section == 'q15' and length == 2 and v.ndim <= 1 and v.shape != (2,):
+                v = np.stack([v, 1 - v], axis=-1)
+            # o q1 do formulário possui competências que não são usadas
+            elif section == 'q1' and v.shape[-1:] == (len(Mapping.COMPETENCES_MATRIX_FORM_Q1),) \
+                    and length == len(Mapping.COMPETENCES_MATRIX_Q1):
+                v = v[..., Q1_FORM_INDEX]
+
+            if v.shape[-1:] != (length,):
+                raise ValueError(f'Length of {section} matrix aren\'t corrent')
+            arrays[section] = v
+
+        shape = Numeric.broadcast_shapes(*(v.shape[:-1] for v in arrays.values()))
+        out = np.full((*shape, len(self.competences)), np.nan)
+        for section, v in arrays.items():
+            out[..., self.index[section]] = v
+        return out
+
+
 class Mapping:
     """
     A class object used to encapsulate all the mapping methods.
@@ -366,7 +798,8 @@ class Mapping:
 
         Raises
         ------
-        `Exception`:
+        `ValueError`:
+            If some competence doesn't exist in `competences`
 
 
         Note
@@ -384,63 +817,13 @@ class Mapping:
         ... }
         >>> Mapping.to_sections(competences)
         { "q1": [0.8, 0.9, 0.3] }
+
+        .. versionchanged:: 0.0.10
+            Uses the :data:`SECTIONS_LAYOUT`. To map many students at once, use\
+                :meth:`CompetenceLayout.to_sections` with a matrix.
         """
-        keys: List[str] = list(competences.keys())
-
-        # mapping root
-        # NOTE: root can't be tracked due to its functionality
-        # root: List[str] = []
-        # for competence in Mapping.COMPETENCES_MATRIX_ROOT:
-        #     if competence not in keys:
-        #         raise Exception(f"Element {competence} not in competences")
-        #     else:
-        #         root.append(competences[competence])
-
-        q1: List[str] = []
-        for competence in Mapping.COMPETENCES_MATRIX_Q1:
-            if competence not in keys:
-                raise Exception(f"Element {competence} not in competences")
-            else:
-                q1.append(competences[competence])
-
-        q12: List[str] = []
-        for competence in Mapping.COMPETENCES_MATRIX_Q12:
-            if competence not in keys:
-                raise Exception(f"Element {competence} not in competences")
-            else:
-                q12.append(competences[competence])
-
-        q13: List[str] = []
-        for competence in Mapping.COMPETENCES_MATRIX_Q13:
-            if competence not in keys:
-                raise Exception(f"Element {competence} not in competences")
-            else:
-                q13.append(competences[competence])
-
-        q15: List[str] = []
-        for competence in Mapping.COMPETENCES_MATRIX_Q15:
-            if competence not in keys:
-                raise Exception(f"Element {competence} not in competences")
-            else:
-                q15.append(competences[competence])
-
-        q2: List[str] = []
-        for competence in Mapping.COMPETENCES_MATRIX_Q2:
-            if competence not in keys:
-                raise Exception(f"Element {competence} not in competences")
-            else:
-                q2.append(competences[competence])
-
-        q3: List[str] = []
-        for competence in Mapping.COMPETENCES_MATRIX_Q3:
-            if competence not in keys:
-                raise Exception(f"Element {competence} not in competences")
-            else:
-                q3.append(competences[competence])
-
-        return dict(zip(
-            ['q1', 'q12', 'q13', 'q15', 'q2', 'q3'],
-            [q1, q12, q13, q15, q2, q3]))
+        return {section: values.tolist()
+                for section, values in SECTIONS_LAYOUT.to_sections(competences).items()}
 
     # It's just a bidding to :meth:`.to_sections`
     to_matrices = to_sections
@@ -469,60 +852,50 @@ class Mapping:
         Dict[str, float]
             It returns a dictionary mapping competences to an specific scalar.
 
+        Raises
+        ------
+        `Exception`:
+            If some matrix doesn't exist, or its length isn't correct (`ValueError`)
+
         Tip
         ---
         Usually used with values of *priority vector*, obtained in function :meth:`calculate`
-        """
-        competences: Dict[str, float] = {}
 
+        .. versionchanged:: 0.0.10
+            Uses the :data:`COMPETENCES_LAYOUT`, and `matrices` isn't changed anymore.
+        """
         # check if all matrices exists
         for matrix in ['q1', 'q12', 'q13', 'q2', 'q3']:
             if matrix not in matrices.keys():
                 raise Exception(
                     f'Matrix {matrix} doesn\' not exist in matrices dict')
 
-        if 'root' in matrices:
-            if len(matrices['root']) != 3:
-                raise Exception('Length of root matrix aren\'t corrent')
-            for index, competence in enumerate(Mapping.COMPETENCES_MATRIX_ROOT):
-                competences[competence] = matrices['root'][index]
-
-        # NOTE: that you can pass COMPETENCES_MATRIX_FORM_Q1, however
-        # it will be mapped to COMPETENCES_MATRIX_Q1
-        if len(matrices['q1']) == 6:
-            matrices['q1'] = Mapping.remove_unused_keys(matrices['q1'])
-
-        if len(matrices['q1']) != 3:
-            raise Exception('Length of q1 matrix aren\'t corrent')
-        for index, competence in enumerate(Mapping.COMPETENCES_MATRIX_Q1):
-            competences[competence] = matrices['q1'][index]
-
-        if len(matrices['q12']) != 3:
-            raise Exception('Length of q12 matrix aren\'t corrent')
-        for index, competence in enumerate(Mapping.COMPETENCES_MATRIX_Q12):
-            competences[competence] = matrices['q12'][index]
-
-        if len(matrices['q13']) != 6:
-            raise Exception('Length of q13 matrix aren\'t corrent')
-        for index, competence in enumerate(Mapping.COMPETENCES_MATRIX_Q13):
-            competences[competence] = matrices['q13'][index]
-
-        if type(matrices['q15']) == float:
-            competences[Mapping.COMPETENCES_MATRIX_Q15[0]] = matrices['q15']
-            competences[Mapping.COMPETENCES_MATRIX_Q15[1]] = 1 - \
-                matrices['q15']
-        elif type(matrices['q15']) == list:
-            for index, competence in enumerate(Mapping.COMPETENCES_MATRIX_Q15):
-                competences[competence] = matrices['q15'][index]
-
-        if len(matrices['q2']) != 5:
-            raise Exception('Length of q2 matrix aren\'t corrent')
-        for index, competence in enumerate(Mapping.COMPETENCES_MATRIX_Q2):
-            competences[competence] = matrices['q2'][index]
-
-        if len(matrices['q3']) != 4:
-            raise Exception('Length of q3 matrix aren\'t corrent')
-        for index, competence in enumerate(Mapping.COMPETENCES_MATRIX_Q3):
-            competences[competence] = matrices['q3'][index]
-
-        return competences
+        # o q15 pode ser um escalar (x -> [x, 1-x]) ou uma lista
+        secoes: Dict[str, Union[List[float], float]] = {
+            k: v for k, v in matrices.items()
+            if k != 'q15' or type(v) in (float, list)}
+
+        vector: np.ndarray = COMPETENCES_LAYOUT.from_sections(secoes)
+        return COMPETENCES_LAYOUT.to_dict(vector, sections=secoes.keys())
+
+
+# Layout das competências dos alunos (a raiz não existe para eles). See :meth:`Mapping.to_sections`
+SECTIONS_LAYOUT: Final[CompetenceLayout] = CompetenceLayout({
+    'q1': Mapping.COMPETENCES_MATRIX_Q1,
+    'q12': Mapping.COMPETENCES_MATRIX_Q12,
+    'q13': Mapping.COMPETENCES_MATRIX_Q13,
+    'q15': Mapping.COMPETENCES_MATRIX_Q15,
+    'q2': Mapping.COMPETENCES_MATRIX_Q2,
+    'q3': Mapping.COMPETENCES_MATRIX_Q3,
+})
+
+# Layout de todas as competências (com a raiz). See :meth:`Mapping.to_competences`
+COMPETENCES_LAYOUT: Final[CompetenceLayout] = CompetenceLayout({
+    'root': Mapping.COMPETENCES_MATRIX_ROOT,
+    'q1': Mapping.COMPETENCES_MATRIX_Q1,
+    'q12': Mapping.COMPETENCES_MATRIX_Q12,
+    'q13': Mapping.COMPETENCES_MATRIX_Q13,
+    'q15': Mapping.COMPETENCES_MATRIX_Q15,
+    'q2': Mapping.COMPETENCES_MATRIX_Q2,
+    'q3': Mapping.COMPETENCES_MATRIX_Q3,
+})
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module used to compare the AHP methods (see :meth:`modules.ahp.Ahp.calculate_batch`), in speed
+and accuracy, over the matrices stored in the database (or random ones).
+
+The accuracy is measured against the exact principal eigenvector (and eigenvalue), found by
+:func:`numpy.linalg.eig`.
+
+Example
+-------
+>>> from modules.ahp import Benchmark, Database
+>>> ahp = Database.AhpForm(connection_string)
+>>> stacks = Benchmark.stored_matrices(ahp.getAll())
+>>> Benchmark.compare_methods(stacks['q2'])
+              seconds  priority_error      cr_error
+approximate  0.000112    3.110412e-02  9.431350e-03
+eigenvector  0.000950    8.807788e-11  6.119435e-10
+
+Or, through the command line:
+
+.. code-block:: bash
+
+    python -m modules.ahp.Benchmark --connection "mongodb://..."
+    python -m modules.ahp.Benchmark --random 10000 --size 6
+    python -m modules.ahp.Benchmark --random-index 30
+"""
+
+# imports
+from argparse import ArgumentParser
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import timeit
+import logging
+from modules.ahp import Ahp, RandomIndex
+from modules.ahp.Types import FormData
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# Escala de Saaty usada nas matrizes aleatórias (apenas os valores ímpares)
+SCALE: List[float] = [1/9, 1/7, 1/5, 1/3, 1, 3, 5, 7, 9]
+
+
+def stored_matrices(forms: List[FormData]) -> Dict[str, np.ndarray]:
+    """
+    Group the matrices of all answers by its identifier.
+
+    Args
+    ----
+    `forms`:
+        The answers. See :meth:`modules.ahp.Database.AhpForm.getAll`
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        A dictionary mapping each matrix identifier (e.g: `q1`) to a stack (n×k×k)
+
+    Note
+    ----
+    The scalar (`q15`) and the matrices that weren't answered (filled with 0) are ignored.
+    """
+    matrices: Dict[str, List[List[List[float]]]] = {}
+    for form in forms:
+        for k, v in form.getMatrices().items():
+            if k == 'q15' or np.ndim(v) != 2 or v[0][0] == 0:
+                continue
+            matrices.setdefault(k, []).append(v)
+    return {k: np.array(v, dtype=np.float64) for k, v in matrices.items()}
+
+
+def _reference(stack: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The exact CR and principal eigenvector (normalized to sum 1) of each matrix.
+    """
+    length: int = stack.shape[1]
+    values, vectors = np.linalg.eig(stack)
+    principal: np.ndarray = np.argmax(values.real, axis=1)
+    lambda_max: np.ndarray = np.take_along_axis(
+        values.real, principal[:, np.newaxis], axis=1)[:, 0]
+    vector: np.ndarray = np.take_along_axis(
+        vectors.real, principal[:, np.newaxis, np.newaxis], axis=2)[..., 0]
+    vector = vector / vector.sum(axis=1, keepdims=True)
+
+    cr: np.ndarray = (lambda_max - length) / (length-1) / Ahp.random_index(length)
+    return cr, vector
+
+
+def compare_methods(stack: np.ndarray, repeat: int = 5) -> pd.DataFrame:
+    """
+    Compare the AHP methods over a stack of matrices.
+
+    Args
+    ----
+    `stack`:
+        The matrices (n×k×k), with k > 2
+
+    Keyword Args
+    ------------
+    `repeat`:
+        How many times each method runs (the best time is used)
+
+    Returns
+    -------
+    pd.DataFrame
+        For each method (rows): the time spent (`seconds`), and the maximum absolute difference\
+            of the priority vectors (`priority_error`) and CR (`cr_error`) to the exact values.
+    """
+    expected_cr, expected_pv = _reference(stack)
+
+    result: Dict[str, Dict[str, float]] = {}
+    for method in Ahp.METHODS:
+        cr, pv = Ahp.calculate_batch(stack, method=method)
+        seconds: float = min(timeit.repeat(
+            lambda: Ahp.calculate_batch(stack, method=method),
+            number=1, repeat=repeat))
+        result[method] = {
+            'seconds': seconds,
+            'priority_error': float(np.nanmax(np.abs(pv - expected_pv))),
+            'cr_error': float(np.nanmax(np.abs(cr - expected_cr))),
+        }
+        logger.debug(f'{method}: {result[method]}')
+    return pd.DataFrame.from_dict(result, orient='index')
+
+
+def random_index_table(
+        sizes: List[int],
+        samples: int = RandomIndex.DEFAULT_SAMPLES) -> pd.DataFrame:
+    """
+    Estimate the random index of each size (see :func:`modules.ahp.RandomIndex.estimate`).
+
+    Args
+    ----
+    `sizes`:
+        The number of columns of the matrices (at least 3)
+
+    Keyword Args
+    ------------
+    `samples`:
+        The number of random matrices of each size
+
+    Returns
+    -------
+    pd.DataFrame
+        For each size (rows): the estimated RI (`ri`), the one calculated by Saaty (`saaty`, NaN\
+            beyond the table) and the time spent (`seconds`).
+    """
+    result: Dict[int, Dict[str, float]] = {}
+    for length in sizes:
+        start: float = timeit.default_timer()
+        ri: float = RandomIndex.estimate(length, samples=samples, seed=length)
+        seconds: float = timeit.default_timer() - start
+        saaty: float = Ahp.random_index(length) \
+            if length <= Ahp.MAX_TABLE_LENGTH else np.nan
+        result[length] = {'ri': ri, 'saaty': saaty, 'seconds': seconds}
+        logger.debug(f'RI({length}): {result[length]}')
+    return pd.DataFrame.from_dict(result, orient='index')
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command line entry point. See :meth:`compare_methods`.
+    """
+    parser = ArgumentParser(description='Compare the AHP methods')
+    parser.add_argument(
+        '--connection', help='The mongo connection string (uses the stored answers)')
+    parser.add_argument('--database', default='')
+    parser.add_argument(
+        '--random', type=int, default=1000,
+        help='The number of random matrices (when there\'s no connection)')
+    parser.add_argument('--size', type=int, nargs='+', default=[3, 4, 5, 6])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--random-index', type=int, metavar='MAX',
+        help='Estimate the random index of the sizes 3 to MAX (instead of comparing the methods)')
+    parser.add_argument('--samples', type=int, default=RandomIndex.DEFAULT_SAMPLES)
+    args = parser.parse_args(argv)
+
+    if args.random_index:
+        table = random_index_table(
+            list(range(3, args.random_index + 1)), samples=args.samples)
+        print(table.to_string())
+        print(f'Total: {table["seconds"].sum():.2f} seconds')
+        return
+
+    if args.connection:
+        from modules.ahp.Database import AhpForm
+        forms: List[FormData] = AhpForm(args.connection, args.database).getAll()
+        stacks: Dict[str, np.ndarray] = stored_matrices(forms)
+    else:
+        stacks = {f'random {k}x{k}': RandomIndex.random_matrices(args.random, k, 0, scale=SCALE)
+                  for k in args.size}
+
+    for name, stack in stacks.items():
+        if stack.shape[1] <= 2:
+            continue
+        print(f'{name}: {stack.shape[0]} matrices {stack.shape[1]}x{stack.shape[2]}')
+        print(compare_methods(stack, repeat=args.repeat).to_string(), end='\n\n')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
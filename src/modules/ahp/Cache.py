@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains a memoization layer for the AHP results (see :meth:`modules.ahp.Ahp.calculate`).
+
+The same answers are calculated many times, e.g: :meth:`modules.util.get_competences_and_consistency`
+calculates the CR and the priority vector of each matrix, and :meth:`modules.util.calc_mean_matrix`
+calculates them again to filter the valid ones. The :class:`AhpCache` stores the results in a
+bounded LRU, addressed by a hash of the matrix (its values, as float64) and the arguments.
+
+Example
+-------
+>>> from modules.ahp import Cache
+>>> cr, priority = Cache.calculate(matrix)  # calculated
+>>> cr, priority = Cache.calculate(matrix)  # from the cache
+>>> Cache.default.info()
+CacheInfo(hits=1, misses=1, maxsize=4096, currsize=1)
+>>> results = Cache.calculate_batch([matrix, other])  # only "other" is calculated
+
+Or, with its own cache (persisted to disk):
+
+>>> cache = Cache.AhpCache(maxsize=1024, path=path.join('..', 'assets', 'ahp_cache.json'))
+>>> cr, priority = cache.calculate(matrix, method=Ahp.EIGENVECTOR)
+>>> cache.save()
+
+Note
+----
+The :data:`default` cache is shared by all callers (e.g: :mod:`modules.util`), and it's kept only in memory.
+"""
+
+# imports
+from collections import OrderedDict
+from os import path as ospath, makedirs, replace
+from typing import Any, Dict, Final, List, NamedTuple, Optional, Sequence, Tuple, Union
+import numpy as np
+import atexit
+import hashlib
+import json
+import tempfile
+import threading
+import logging
+from modules.ahp import Ahp
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# Versão do formato das chaves/arquivo (deve mudar sempre que o cálculo mudar)
+VERSION: Final[str] = 'ahp-cache-v1'
+
+# Número máximo padrão de resultados armazenados
+DEFAULT_MAXSIZE: Final[int] = 4096
+
+# An AHP result: (CR, priority vector)
+Result = Tuple[float, List[float]]
+
+
+class CacheInfo(NamedTuple):
+    """
+    The cache statistics (like :func:`functools.lru_cache`)
+    """
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class AhpCache:
+    """
+    A bounded LRU cache of AHP results.
+
+    Keyword Args
+    ------------
+    `maxsize`:
+        The maximum number of results. When exceeded, the least recently used ones are removed.
+    `path`:
+        A JSON file where the results are persisted. When settled, the results are loaded from\
+            it (if it exists) and saved when the interpreter exits, if there are new results\
+                (or by calling :meth:`save`).
+
+    Important
+    ---------
+    The priority vectors are copied when returned, so the caller can change them.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, path: Optional[str] = None) -> None:
+        self.maxsize: int = maxsize
+        self.path: Optional[str] = path
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._results: 'OrderedDict[str, Result]' = OrderedDict()
+        self._lock = threading.Lock()
+        # existem resultados que ainda não foram salvos
+        self._dirty: bool = False
+
+        if path is not None:
+            self.load()
+            atexit.register(self._flush)
+
+    @staticmethod
+    def key(obj: Any, roundp: int = 4, method: str = Ahp.APPROXIMATE, **kwargs) -> str:
+        """
+        Calculate the key (hash) of a matrix, with the arguments of :meth:`modules.ahp.Ahp.calculate`.
+
+        Args
+        ----
+        `obj`:
+            The matrix(NxN) that holds the ahp values
+
+        Keyword Args
+        ------------
+        `roundp`:
+            The number of decimal places used to round.
+        `method`:
+            The AHP method
+        `kwargs`:
+            The other arguments of :meth:`modules.ahp.Ahp.calculate` (e.g: `tol`)
+
+        Returns
+        -------
+        str
+            A SHA-256 (hexadecimal)
+        """
+        matrix: np.ndarray = np.ascontiguousarray(obj, dtype=np.float64) + 0.0
+
+        h = hashlib.sha256()
+        h.update(json.dumps(
+            [VERSION, roundp, method, kwargs, matrix.shape], sort_keys=True).encode())
+        h.update(matrix.tobytes())
+        return h.hexdigest()
+
+    def calculate(
+            self,
+            obj: List[List[float]],
+            roundp: int = 4,
+            method: str = Ahp.APPROXIMATE,
+            **kwargs) -> Result:
+        """
+        The same of :meth:`modules.ahp.Ahp.calculate`, using the cached results.
+
+        Args
+        ----
+        `obj`:
+            The matrix(NxN) that holds the ahp values
+
+        Keyword Args
+        ------------
+        `roundp`:
+            The number of decimal places used to round.
+        `method`:
+            The AHP method
+        `kwargs`:
+            The other arguments of :meth:`modules.ahp.Ahp.calculate` (e.g: `tol`)
+
+        Returns
+        -------
+        Tuple[float, List[float]]
+            The CR and the priority vector
+        """
+        key: str = self.key(obj, roundp=roundp, method=method, **kwargs)
+
+        with self._lock:
+            result: Optional[Result] = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return result[0], list(result[1])
+            self.misses += 1
+
+        cr, priorityVec = Ahp.calculate(
+            obj, roundp=roundp, method=method, **kwargs)
+
+        with self._lock:
+            self._put(key, (cr, list(priorityVec)))
+        return cr, list(priorityVec)
+
+    def calculate_batch(
+            self,
+            stack: Union[np.ndarray, Sequence[List[List[float]]]],
+            roundp: int = 4,
+            method: str = Ahp.APPROXIMATE,
+            **kwargs) -> List[Result]:
+        """
+        The same of :meth:`modules.ahp.Ahp.calculate_batch`, using (and filling) the cached results.
+
+        Only the matrices that aren't cached are calculated, at once. Their results are stored with\
+            the same keys of :meth:`calculate`, so a later :meth:`calculate` of the same matrix\
+                (and arguments) is a lookup.
+
+        Args
+        ----
+        `stack`:
+            The matrices (with the same size) that holds the ahp values
+
+        Keyword Args
+        ------------
+        `roundp`:
+            The number of decimal places used to round.
+        `method`:
+            The AHP method
+        `kwargs`:
+            The other arguments of :meth:`modules.ahp.Ahp.calculate_batch` (e.g: `tol`)
+
+        Returns
+        -------
+        List[Tuple[float, List[float]]]
+            The CR and the priority vector of each matrix, like :meth:`calculate`
+
+        Note
+        ----
+        The invalid results (NaN or inf, where :meth:`modules.ahp.Ahp.calculate` raises an error)\
+            are returned, but not stored.
+        """
+        keys: List[str] = [
+            self.key(obj, roundp=roundp, method=method, **kwargs) for obj in stack]
+        results: List[Optional[Result]] = [None]*len(keys)
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                result: Optional[Result] = self._results.get(key)
+                if result is not None:
+                    self._results.move_to_end(key)
+                    results[i] = result
+            faltando: List[int] = [i for i, r in enumerate(results) if r is None]
+            self.hits += len(keys) - len(faltando)
+            self.misses += len(faltando)
+
+        if faltando:
+            cr, priority = Ahp.calculate_batch(
+                [stack[i] for i in faltando], roundp=roundp, method=method, **kwargs)
+            validos: np.ndarray = np.isfinite(cr) & np.isfinite(priority).all(axis=1)
+
+            with self._lock:
+                for i, c, p, valido in zip(faltando, cr.tolist(), priority.tolist(), validos):
+                    # assim como em "Ahp.calculate", matrizes 2x2 (ou menores) não possuem vetor
+                    results[i] = (c, p) if p else (1, [])
+                    if valido:
+                        self._put(keys[i], results[i])  # type: ignore
+
+        return [(c, list(p)) for c, p in results]  # type: ignore
+
+    def _put(self, key: str, result: Result) -> None:
+        """
+        Store a result, removing the least recently used ones (the lock must be held).
+        """
+        self._results[key] = result
+        self._dirty = True
+        # remove os mais antigos
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        """
+        The cache statistics.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._results))
+
+    def clear(self) -> None:
+        """
+        Remove all results (from memory) and reset the statistics.
+        """
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = 0
+
+    def load(self) -> int:
+        """
+        Load the results persisted in :attr:`path`.
+
+        Returns
+        -------
+        int
+            The number of loaded results
+
+        Note
+        ----
+        A file that can't be read (or from another version) is ignored.
+        """
+        if self.path is None or not ospath.isfile(self.path):
+            return 0
+
+        try:
+            with open(self.path, 'r') as f:
+                data: Dict[str, Any] = json.load(f)
+            if data.get('version') != VERSION:
+                raise ValueError(f'version {data.get("version")}')
+            results: List[Tuple[str, Result]] = [
+                (key, (cr, priorityVec)) for key, cr, priorityVec in data['results']]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f'Ignoring the cache file "{self.path}": {e}')
+            return 0
+
+        with self._lock:
+            for key, result in results:
+                self._results[key] = result
+                self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        logger.debug(f'{len(results)} results loaded from "{self.path}"')
+        return len(results)
+
+    def save(self) -> Optional[str]:
+        """
+        Persist the results in :attr:`path` (the least recently used first).
+
+        Returns
+        -------
+        Optional[str]
+            The path of the file, or None if there's no :attr:`path`
+        """
+        if self.path is None:
+            return None
+
+        with self._lock:
+            results = [[key, cr, priorityVec]
+                       for key, (cr, priorityVec) in self._results.items()]
+            self._dirty = False
+
+        directory: str = ospath.dirname(ospath.abspath(self.path))
+        makedirs(directory, exist_ok=True)
+        # escreve em um arquivo temporário, para que o arquivo nunca fique incompleto
+        with tempfile.NamedTemporaryFile(
+                'w', dir=directory, suffix='.tmp', delete=False) as f:
+            json.dump({'version': VERSION, 'results': results}, f)
+        replace(f.name, self.path)
+        logger.debug(f'{len(results)} results saved into "{self.path}"')
+        return self.path
+
+    def _flush(self) -> None:
+        """
+        Save the results, if there are new ones (used when the interpreter exits).
+        """
+        if self._dirty:
+            self.save()
+
+
+# Cache compartilhado por todos os módulos
+default: AhpCache = AhpCache()
+
+
+def calculate(
+        obj: List[List[float]],
+        roundp: int = 4,
+        method: str = Ahp.APPROXIMATE,
+        **kwargs) -> Result:
+    """
+    The same of :meth:`modules.ahp.Ahp.calculate`, using the shared cache (:data:`default`).
+    See :meth:`AhpCache.calculate`.
+    """
+    return default.calculate(obj, roundp=roundp, method=method, **kwargs)
+
+
+def calculate_batch(
+        stack: Union[np.ndarray, Sequence[List[List[float]]]],
+        roundp: int = 4,
+        method: str = Ahp.APPROXIMATE,
+        **kwargs) -> List[Result]:
+    """
+    The same of :meth:`modules.ahp.Ahp.calculate_batch`, using the shared cache (:data:`default`).
+    See :meth:`AhpCache.calculate_batch`.
+    """
+    return default.calculate_batch(stack, roundp=roundp, method=method, **kwargs)
@@ -16,13 +16,22 @@ Implement tests for:
 """
 
 
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Final, Iterator, List, Optional, Union
 from modules.ahp.Types import FormData, FormDataType
 from bson.objectid import ObjectId
-from pymongo import MongoClient
+from modules import Mongo
 import logging
 logger = logging.getLogger(__name__)
 
+# Número padrão de documentos trazidos do servidor a cada vez
+DEFAULT_BATCH_SIZE: Final[int] = 500
+
+# Campos usados nas análises (e.g: calc_mean_matrix)
+MATRICES_PROJECTION: Final[List[str]] = ['type', 'name', 'matrices']
+
+# Uma projeção do mongo: lista de campos, ou um dicionário (campo -> 0/1)
+Projection = Optional[Union[List[str], Dict[str, Any]]]
+
 
 class SigaaDatabase:
     """
@@ -37,31 +46,32 @@ class SigaaDatabase:
     ------------
     `database_name`:
         *OPTIONAL*, Default value is "sigaadb"
+    `max_pool_size`:
+        *OPTIONAL*, The maximum number of connections of the client. See :mod:`modules.Mongo`
 
     Note
     ----
     When you didn't pass a connection_string, it will create the `self.__client` and the \
         `self._db` assigned to None.
+
+    .. versionchanged:: 0.0.10
+        The client is shared by all objects with the same connection string\
+            (see :func:`modules.Mongo.get_client`).
     """
 
     def __init__(self,
                  connection_string: str = "",
-                 database_name: str = "") -> None:
+                 database_name: str = "",
+                 max_pool_size: Optional[int] = None) -> None:
         self.__client = None
         self._db = None
 
         if connection_string:
-            # Create a mongoclient
-            self.__client = MongoClient(connection_string)
-
-            logger.debug(f'Creating a MongoClient for {connection_string}')
+            # Get the (shared) mongoclient
+            self.__client = Mongo.get_client(connection_string, max_pool_size=max_pool_size)
 
-            if database_name:
-                connection = "self.__client.{}".format(database_name)
-                self._db = eval(connection)
-            else:
-                # Connect to database sigaadb (default)
-                self._db = self.__client.sigaadb
+            # Connect to database sigaadb (default)
+            self._db = self.__client[database_name or 'sigaadb']
 
             logger.debug('Created MongoDatabase')
 
@@ -129,9 +139,50 @@ class AhpForm(SigaaDatabase):
         ---------
         The list will be empty if didn't found objects that matches with it
         """
-        element = self._db.AhpForm.find(args)
-        element = list(map(lambda el: FormData(el), element))  # type: ignore
-        return element
+        return list(self.iterByDict(args))
+
+    def iterByDict(
+            self,
+            args: Dict[str, Any],
+            projection: Projection = None,
+            batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[FormData]:
+        """
+        Iterate over the elements that matches with this field, lazily.
+
+        Args
+        ----
+        `args`:
+            A dictionary containing the filters to object keys.
+
+        Keyword Args
+        ------------
+        `projection`:
+            The fields returned by the server (e.g: :data:`MATRICES_PROJECTION`). All fields, by\
+                default.
+        `batch_size`:
+            The number of documents fetched from the server at once.
+
+        Returns
+        -------
+        Iterator[FormData]
+            A :class:`.Types.FormData` for each matched object. Only `batch_size` documents are\
+                kept in memory.
+
+        Example
+        -------
+        >>> aggregator = AhpAggregator()
+        >>> for response in ahp.iterByDict({'type': 'market'}, projection=MATRICES_PROJECTION):
+        ...     aggregator.add(response)
+
+        Important
+        ---------
+        The fields that weren't projected are None in the :class:`.Types.FormData`. E.g: without\
+            `type`, :meth:`modules.ahp.Types.FormData.getType` raises a `ValueError` (and so does\
+                :meth:`modules.ahp.Aggregator.AhpAggregator.add`).
+        """
+        cursor = self._db.AhpForm.find(args, projection).batch_size(batch_size)
+        for element in cursor:
+            yield FormData(element)
 
     def findByType(self, type: FormDataType) -> List[FormData]:
         """
@@ -157,6 +208,21 @@ class AhpForm(SigaaDatabase):
         """
         return self.findByDict({"type": type.value})
 
+    def iterByType(
+            self,
+            type: FormDataType,
+            projection: Projection = None,
+            batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[FormData]:
+        """
+        Iterate over the elements of a type, lazily. See :meth:`iterByDict`
+
+        Example
+        -------
+        >>> for response in ahp.iterByType(FormDataType.MARKET, projection=MATRICES_PROJECTION):
+        ...     aggregator.add(response)
+        """
+        return self.iterByDict({"type": type.value}, projection, batch_size)
+
     def getAll(self) -> List[FormData]:
         """
         Get all database elements.
@@ -175,9 +241,20 @@ class AhpForm(SigaaDatabase):
         The list will be empty if didn't found objects that matches with it
         """
         # iterate and get all elements
-        cursor = self._db.AhpForm.find()
-        elements = [FormData(el) for el in cursor]
-        return elements
+        return list(self.iterAll())
+
+    def iterAll(
+            self,
+            projection: Projection = None,
+            batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[FormData]:
+        """
+        Iterate over all database elements, lazily. See :meth:`iterByDict`
+
+        Example
+        -------
+        >>> names = [response.getName() for response in ahp.iterAll(projection=['name'])]
+        """
+        return self.iterByDict({}, projection, batch_size)
 
     def insert(self, args: Dict[str, Any]) -> FormData:
         """
@@ -250,7 +327,7 @@ class AhpForm(SigaaDatabase):
         """
         element = self._db.AhpForm.insert_one(args)
         logger.debug('Data inserted into Database')
-        return FormData(element)  # type:ignore
+        return FormData({**args, '_id': element.inserted_id})
 
     def delete(self, id: str) -> FormData:
         """
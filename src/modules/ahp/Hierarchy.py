@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the composition of the AHP priorities down the hierarchy (tree).
+
+The form is a tree: the `root` compares the 3 groups of competences (technical, personal and\
+interpersonal), whose matrices are `q1`, `q2` and `q3`, and some elements of `q1` are compared in\
+their own matrices (`q12`, `q13` and `q15`). The global weight of a competence is the product of\
+the local priorities along its path, e.g: the global weight of "PAA" is\
+`root[0] * q1[1] * q12[2]`. So, the global weights of all competences sum to 1.
+
+The :class:`Hierarchy` precomputes the paths, so the composition is vectorized: the priorities of\
+each section can be a vector (one view) or a matrix (views × section), and the result is a matrix\
+(views × competences), whose columns are :attr:`Hierarchy.competences`. The scalar section (`q15`)\
+can be given as x (or a vector, one x for each view), or as [x, 1-x] (a matrix, for many views).
+
+Example
+-------
+>>> from modules.ahp import Hierarchy
+>>> views = Hierarchy.stack([priorities_market, priorities_teacher])
+>>> weights = Hierarchy.compose(views)  # 2 × 23
+>>> weights.sum(axis=1)
+array([1., 1.])
+>>> Hierarchy.DEFAULT.layout.to_dict(weights[0])  # the market's view
+{'Matemática e física': 0.0312, ...}
+"""
+
+# imports
+from typing import Dict, Final, List, Sequence, Tuple, Union
+import numpy as np
+import logging
+from modules import Numeric
+from modules.ahp.Ahp import CompetenceLayout, Mapping
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# Seção que é um escalar (x), equivalente a [x, 1-x]
+SCALAR: Final[str] = 'q15'
+
+# Árvore do formulário. Os elementos que também são chaves, são seções (filhos)
+TREE: Final[Dict[str, List[str]]] = {
+    'root': ['q1', 'q2', 'q3'],
+    'q1': [
+        Mapping.COMPETENCES_MATRIX_Q1[0],
+        'q12',
+        'q13',
+        Mapping.COMPETENCES_MATRIX_Q1[1],
+        'q15',
+        Mapping.COMPETENCES_MATRIX_Q1[2],
+    ],
+    'q12': Mapping.COMPETENCES_MATRIX_Q12,
+    'q13': Mapping.COMPETENCES_MATRIX_Q13,
+    'q15': Mapping.COMPETENCES_MATRIX_Q15,
+    'q2': Mapping.COMPETENCES_MATRIX_Q2,
+    'q3': Mapping.COMPETENCES_MATRIX_Q3,
+}
+
+Priorities = Dict[str, Union[List[float], float, np.ndarray]]
+
+
+class Hierarchy:
+    """
+    A precomputed AHP tree, used to compose the local priorities into global weights.
+
+    Args
+    ----
+    `tree`:
+        A dictionary mapping each section to its (ordered) elements. An element that is also a key\
+            is a child section, otherwise, it's a competence (leaf).
+
+    Raises
+    ------
+    `ValueError`:
+        If the tree doesn't have a single root, has a cycle (or a section with more than one\
+            parent), or a competence is repeated
+
+    Note
+    ----
+    The competences are ordered by section (in the order of `tree`), so, for :data:`TREE`, they're\
+        the same of :data:`modules.ahp.Ahp.SECTIONS_LAYOUT`.
+    """
+
+    def __init__(self, tree: Dict[str, Sequence[str]]) -> None:
+        self.tree: Dict[str, Tuple[str, ...]] = {k: tuple(v) for k, v in tree.items()}
+
+        filhos: List[str] = [e for v in self.tree.values() for e in v if e in self.tree]
+        raizes: List[str] = [k for k in self.tree if k not in filhos]
+        if len(raizes) != 1:
+            raise ValueError(f'The tree must have a single root, found {raizes}')
+        if len(filhos) != len(set(filhos)):
+            raise ValueError('A section must have a single parent')
+        self.root: str = raizes[0]
+
+        # ordem em que as seções são visitadas (os pais antes dos filhos)
+        self.order: List[str] = [self.root]
+        for section in self.order:
+            self.order.extend(e for e in self.tree[section] if e in self.tree)
+        if len(self.order) != len(self.tree):
+            raise ValueError('The tree has a cycle')
+
+        self.layout: CompetenceLayout = CompetenceLayout({
+            section: [e for e in elements if e not in self.tree]
+            for section, elements in self.tree.items()
+            if any(e not in self.tree for e in elements)})
+
+        # para cada seção: (posições das folhas, colunas delas) e (posição, filho)
+        self._leaves: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._children: Dict[str, List[Tuple[int, str]]] = {}
+        for section, elements in self.tree.items():
+            posicoes: List[int] = [i for i, e in enumerate(elements) if e not in self.tree]
+            self._leaves[section] = (
+                np.array(posicoes, dtype=np.intp),
+                np.array([self.layout.position[elements[i]] for i in posicoes], dtype=np.intp))
+            self._children[section] = [
+                (i, e) for i, e in enumerate(elements) if e in self.tree]
+
+    @property
+    def competences(self) -> Tuple[str, ...]:
+        """
+        The competences (leaves), i.e., the columns of :meth:`compose`.
+        """
+        return self.layout.competences
+
+    def _local(self, section: str, priorities: Priorities) -> np.ndarray:
+        """
+        The local priorities of a section, as an array (..., k).
+        """
+        if section not in priorities:
+            raise ValueError(f'Missing the priorities of section {section}')
+
+        v: np.ndarray = np.asarray(priorities[section], dtype=np.float64)
+        length: int = len(self.tree[section])
+        if section == SCALAR and length == 2 and v.ndim <= 1 and v.shape != (2,):
+            v = np.stack([v, 1 - v], axis=-1)
+        if v.shape[-1:] != (length,):
+            raise ValueError(
+                f'The section {section} must have {length} priorities, got {v.shape[-1:]}')
+        return v
+
+    def section_weights(self, priorities: Priorities) -> Dict[str, np.ndarray]:
+        """
+        The global weight of each section (the product of the priorities of its ancestors).
+
+        Args
+        ----
+        `priorities`:
+            The local priority vector of each section (or a matrix, views × section). See\
+                :meth:`modules.util.calc_ahp_for_new_mat`
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            A dictionary mapping each section to its global weight (an array with the views shape)
+
+        Raises
+        ------
+        `ValueError`:
+            If a section is missing or doesn't have the expected length. Or if the scalar section\
+                (q15) has shape (2,), while the other sections are batched (it could be [x, 1-x] or\
+                    the x of 2 views).
+        """
+        return self._compose(priorities)[0]
+
+    def compose(self, priorities: Priorities) -> np.ndarray:
+        """
+        Compose the local priorities down the tree, into the global weights of the competences.
+
+        Args
+        ----
+        `priorities`:
+            The local priority vector of each section (or a matrix, views × section). See\
+                :meth:`modules.util.calc_ahp_for_new_mat`
+
+        Returns
+        -------
+        np.ndarray
+            The global weights (views × competences). Its columns are :attr:`competences`.
+
+        Raises
+        ------
+        `ValueError`:
+            If a section is missing or doesn't have the expected length. Or if the scalar section\
+                (q15) has shape (2,), while the other sections are batched (it could be [x, 1-x] or\
+                    the x of 2 views).
+
+        Tip
+        ---
+        Use :meth:`modules.ahp.Ahp.CompetenceLayout.to_dict` (of :attr:`layout`) to get a\
+            dictionary like :meth:`modules.ahp.Ahp.Mapping.to_competences`.
+        """
+        return self._compose(priorities)[1]
+
+    def _compose(self, priorities: Priorities) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        The global weights of the sections and of the competences.
+        """
+        locais: Dict[str, np.ndarray] = {
+            section: self._local(section, priorities) for section in self.order}
+
+        # [x, 1-x] de uma visão, ou x de 2 visões? (ambíguo quando há um lote de visões)
+        if SCALAR in locais and len(self.tree[SCALAR]) == 2 \
+                and np.shape(priorities[SCALAR]) == (2,) \
+                and any(v.shape[:-1] for k, v in locais.items() if k != SCALAR):
+            raise ValueError(
+                f'The section {SCALAR} is ambiguous (shape (2,)) when the other sections are batched.'
+                ' Use a matrix (views × 2), see stack')
+        shape = Numeric.broadcast_shapes(*(v.shape[:-1] for v in locais.values()))
+
+        pesos: Dict[str, np.ndarray] = {self.root: np.ones(shape)}
+        out: np.ndarray = np.empty((*shape, len(self.competences)))
+        for section in self.order:
+            # pesos globais dos elementos da seção
+            w: np.ndarray = pesos[section][..., np.newaxis] * locais[section]
+            posicoes, colunas = self._leaves[section]
+            out[..., colunas] = w[..., posicoes]
+            for i, child in self._children[section]:
+                pesos[child] = w[..., i]
+        return pesos, out
+
+
+# Hierarquia do formulário
+DEFAULT: Final[Hierarchy] = Hierarchy(TREE)
+
+
+def stack(views: Sequence[Priorities]) -> Dict[str, np.ndarray]:
+    """
+    Stack the priorities of many views (e.g: market, teachers and students), by section.
+
+    Args
+    ----
+    `views`:
+        The priorities of each view. See :meth:`modules.util.calc_ahp_for_new_mat`
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        A dictionary mapping each section (present in all views) to a matrix (views × section)
+
+    Note
+    ----
+    The scalar (q15) x is stacked as [x, 1-x].
+    """
+    sections = [k for k in views[0] if all(k in view for view in views)] if views else []
+    out: Dict[str, np.ndarray] = {}
+    for k in sections:
+        v: np.ndarray = np.array([view[k] for view in views], dtype=np.float64)
+        # o escalar é expandido, para não ser confundido com um vetor (2 visões)
+        out[k] = np.stack([v, 1 - v], axis=-1) if k == SCALAR and v.ndim == 1 else v
+    return out
+
+
+def compose(priorities: Priorities) -> np.ndarray:
+    """
+    The same of :meth:`Hierarchy.compose`, using the form's tree (:data:`DEFAULT`).
+    """
+    return DEFAULT.compose(priorities)
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains a Monte Carlo estimator of the random index (RI), used to calculate the CR.
+
+The table calculated by Saaty (see :meth:`modules.ahp.Ahp.random_index`) stops at 15 elements.
+The RI of a size is the mean consistency index (CI) of random reciprocal matrices, whose values are
+uniformly chosen from the Saaty scale. The :func:`estimate` generates these matrices in batches
+and finds their principal eigenvalues at once (:func:`numpy.linalg.eigvals`).
+
+Since estimating is slow (seconds), the estimated values are stored by the :class:`RandomIndexTable`,
+in memory and in a JSON file, and :meth:`modules.ahp.Ahp.random_index` uses the :data:`default` one
+for the sizes that aren't in Saaty's table.
+
+Example
+-------
+>>> from modules.ahp import RandomIndex
+>>> RandomIndex.estimate(3, seed=0)
+0.5194
+>>> RandomIndex.default.get(20)  # estimated once, then read from disk
+1.6294
+
+Or, with its own table:
+
+>>> table = RandomIndex.RandomIndexTable(path=path.join('..', 'assets', 'random_index.json'))
+>>> table.get(30, samples=50000)
+"""
+
+# imports
+from os import path as ospath, makedirs, replace
+from typing import Any, Dict, Final, Optional, Sequence, Union
+import numpy as np
+import json
+import tempfile
+import threading
+import logging
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# Versão do formato do arquivo (deve mudar sempre que a estimativa mudar)
+VERSION: Final[str] = 'ahp-random-index-v1'
+
+# Escala de Saaty completa (1/9, 1/8, ..., 1, 2, ..., 9)
+SCALE: Final[np.ndarray] = np.array([1/i for i in range(9, 1, -1)] + list(range(1, 10)))
+
+# Número padrão de matrizes aleatórias usadas em cada estimativa
+DEFAULT_SAMPLES: Final[int] = 10000
+
+# Número de matrizes geradas (e calculadas) de uma vez
+DEFAULT_BATCH_SIZE: Final[int] = 2000
+
+# Arquivo padrão onde os valores estimados são salvos
+DEFAULT_PATH: Final[str] = ospath.join(
+    ospath.expanduser('~'), '.cache', 'sigaa-analysis', 'random_index.json')
+
+
+def random_matrices(
+        n: int,
+        length: int,
+        rng: Union[int, np.random.Generator, None] = None,
+        scale: Sequence[float] = SCALE) -> np.ndarray:
+    """
+    Create `n` random reciprocal matrices (length×length), with values of the Saaty scale.
+
+    Args
+    ----
+    `n`:
+        The number of matrices
+    `length`:
+        The number of columns
+
+    Keyword Args
+    ------------
+    `rng`:
+        The random generator, or its seed
+    `scale`:
+        The values of the upper triangle (uniformly chosen). By default, the complete Saaty scale\
+            (:data:`SCALE`)
+
+    Returns
+    -------
+    np.ndarray
+        The matrices (n×length×length)
+    """
+    rng = np.random.default_rng(rng)
+    i, j = np.triu_indices(length, 1)
+    values: np.ndarray = rng.choice(np.asarray(scale, dtype=np.float64), (n, i.size))
+
+    stack: np.ndarray = np.ones((n, length, length))
+    stack[:, i, j] = values
+    stack[:, j, i] = 1/values
+    return stack
+
+
+def estimate(
+        length: int,
+        samples: int = DEFAULT_SAMPLES,
+        seed: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE) -> float:
+    """
+    Estimate the random index of matrices with `length` columns.
+
+    Args
+    ----
+    `length`:
+        The number of columns
+
+    Keyword Args
+    ------------
+    `samples`:
+        The number of random matrices
+    `seed`:
+        The seed of the random generator
+    `batch_size`:
+        The number of matrices generated at once (bounds the memory used)
+
+    Returns
+    -------
+    float
+        The mean CI of the random matrices, rounded to 4 decimal places
+
+    Raises
+    ------
+    `ValueError`:
+        If `length` is lower than 3 (the CI isn't defined), or `samples` isn't positive
+    """
+    if length < 3:
+        raise ValueError(f'The random index needs, at least, 3 columns. Got {length}')
+    if samples <= 0:
+        raise ValueError(f'The number of samples must be positive. Got {samples}')
+
+    rng = np.random.default_rng(seed)
+    soma: float = 0.0
+    for start in range(0, samples, batch_size):
+        stack = random_matrices(min(batch_size, samples - start), length, rng)
+        # o autovalor principal (de Perron) é real e possui a maior parte real
+        lambda_max: np.ndarray = np.linalg.eigvals(stack).real.max(axis=1)
+        soma += float(np.sum(lambda_max))
+
+    ri: float = (soma/samples - length) / (length-1)
+    logger.debug(f'RI({length}) estimated with {samples} matrices: {ri}')
+    return round(ri, 4)
+
+
+class RandomIndexTable:
+    """
+    The estimated random indexes, persisted to disk.
+
+    Keyword Args
+    ------------
+    `path`:
+        A JSON file where the values are persisted. When settled, the values are loaded from it\
+            (if it exists) and saved after each new estimate.
+    `samples`:
+        The default number of random matrices of each estimate. See :func:`estimate`
+
+    Important
+    ---------
+    Each size is estimated with a fixed seed (its length), so the values are reproducible.
+    """
+
+    def __init__(self, path: Optional[str] = None, samples: int = DEFAULT_SAMPLES) -> None:
+        self.path: Optional[str] = path
+        self.samples: int = samples
+        # "length:samples" -> RI
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        if path is not None:
+            self.load()
+
+    def get(self, length: int, samples: Optional[int] = None) -> float:
+        """
+        Get the random index of matrices with `length` columns, estimating it if needed.
+
+        Args
+        ----
+        `length`:
+            The number of columns
+
+        Keyword Args
+        ------------
+        `samples`:
+            The number of random matrices (:attr:`samples` by default)
+
+        Returns
+        -------
+        float
+            The random index
+
+        Raises
+        ------
+        `ValueError`:
+            If `length` is lower than 3
+        """
+        samples = self.samples if samples is None else samples
+        key: str = f'{length}:{samples}'
+
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = estimate(length, samples=samples, seed=length)
+                self.save()
+            return self._values[key]
+
+    def load(self) -> int:
+        """
+        Load the values persisted in :attr:`path`.
+
+        Returns
+        -------
+        int
+            The number of loaded values
+
+        Note
+        ----
+        A file that can't be read (or from another version) is ignored.
+        """
+        if self.path is None or not ospath.isfile(self.path):
+            return 0
+
+        try:
+            with open(self.path, 'r') as f:
+                data: Dict[str, Any] = json.load(f)
+            if data.get('version') != VERSION:
+                raise ValueError(f'version {data.get("version")}')
+            values: Dict[str, float] = {str(k): float(v) for k, v in data['values'].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f'Ignoring the random index file "{self.path}": {e}')
+            return 0
+
+        self._values.update(values)
+        logger.debug(f'{len(values)} random indexes loaded from "{self.path}"')
+        return len(values)
+
+    def save(self) -> Optional[str]:
+        """
+        Persist the values in :attr:`path`.
+
+        Returns
+        -------
+        Optional[str]
+            The path of the file, or None if there's no :attr:`path` (or it can't be written)
+        """
+        if self.path is None:
+            return None
+
+        try:
+            directory: str = ospath.dirname(ospath.abspath(self.path))
+            makedirs(directory, exist_ok=True)
+            # escreve em um arquivo temporário, para que o arquivo nunca fique incompleto
+            with tempfile.NamedTemporaryFile(
+                    'w', dir=directory, suffix='.tmp', delete=False) as f:
+                json.dump({'version': VERSION, 'values': self._values}, f)
+            replace(f.name, self.path)
+        except OSError as e:
+            logger.warning(f'Couldn\'t save the random indexes into "{self.path}": {e}')
+            return None
+        return self.path
+
+
+# Tabela usada por :meth:`modules.ahp.Ahp.random_index`
+default: RandomIndexTable = RandomIndexTable(path=DEFAULT_PATH)
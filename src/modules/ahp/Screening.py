@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the consistency screening of all AHP answers.
+
+It calculates the CR of every (answer, matrix) pair at once (see
+:meth:`modules.ahp.Ahp.calculate_batch`), returning which ones are valid, how many answers of
+each respondent type are valid (or not), and the valid matrices stacked, ready to be aggregated
+(see :meth:`modules.util.average`).
+
+Example
+-------
+>>> from modules.ahp import Screening
+>>> result = Screening.screen(ahp.getAll())
+>>> result.counts.loc['teacher']
+        valid  invalid  unfilled  total
+matrix
+root        9        2         0     11
+q1          7        3         1     11
+...
+>>> result.mask[:, result.matrices.index('q2')]  # valid answers of q2
+array([ True, False,  True, ...])
+>>> util.average(result.stacks['market']['q2'], mode=util.GEOMETRIC)
+"""
+
+# imports
+from typing import Dict, Final, List, NamedTuple, Tuple
+import numpy as np
+import pandas as pd
+import logging
+from modules.ahp import Ahp
+from modules.ahp.Types import FormData
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# CR máximo de uma matriz válida (segundo Saaty)
+DEFAULT_THRESHOLD: Final[float] = 0.1
+
+
+class Screening(NamedTuple):
+    """
+    The result of :meth:`screen`.
+    """
+    #: The type of each answer (shape n)
+    types: np.ndarray
+    #: The matrix ids (the columns of `cr` and `mask`)
+    matrices: List[str]
+    #: The CR of each (answer, matrix). NaN when the matrix wasn't filled (shape n×m)
+    cr: np.ndarray
+    #: The valid (answer, matrix) pairs (shape n×m)
+    mask: np.ndarray
+    #: The number of valid, invalid (inconsistent) and unfilled answers of each (type, matrix)
+    counts: pd.DataFrame
+    #: The valid matrices stacked (valid×k×k), for each type and matrix id
+    stacks: Dict[str, Dict[str, np.ndarray]]
+
+
+def screen(
+        data: List[FormData],
+        threshold: float = DEFAULT_THRESHOLD,
+        method: str = Ahp.APPROXIMATE) -> Screening:
+    """
+    Check the consistency of all matrices of all answers.
+
+    Args
+    ----
+    `data`:
+        The answers. See :meth:`modules.ahp.Database.AhpForm.getAll`
+
+    Keyword Args
+    ------------
+    `threshold`:
+        A matrix is valid when it's filled and its CR is lower than it
+    `method`:
+        The AHP method. See :meth:`modules.ahp.Ahp.calculate`
+
+    Returns
+    -------
+    Screening
+        The CR, the mask of valid matrices, the counts and the stacks of valid matrices
+
+    Note
+    ----
+    The scalar (q15) isn't a matrix, so it's ignored. A matrix is filled when its first element\
+        isn't 0 (like :meth:`modules.util.get_competences_and_consistency`).
+
+    Caution
+    -------
+    The valid matrices have CR *lower* than `threshold` (like the notebook), while\
+        :meth:`modules.util.calc_mean_matrix` also accepts CR equal to 0.1.
+    """
+    respostas = [response.getMatrices() for response in data]
+    types: np.ndarray = np.array(
+        [response.getType().value for response in data], dtype=object)
+
+    # ids das matrizes, na ordem padrão (os desconhecidos no final)
+    ids: List[str] = []
+    for matrices in respostas:
+        ids.extend(k for k in matrices if k != 'q15' and k not in ids)
+    ordem: List[str] = Ahp.Mapping.MATRICES_IDENTIFIERS
+    ids.sort(key=lambda k: ordem.index(k) if k in ordem else len(ordem))
+
+    cr = np.full((len(data), len(ids)), np.nan)
+    filled = np.zeros((len(data), len(ids)), dtype=bool)
+    valores: Dict[str, Dict[int, np.ndarray]] = {k: {} for k in ids}
+    tamanhos: Dict[str, Tuple[int, ...]] = {}
+
+    for j, k in enumerate(ids):
+        # agrupa as matrizes preenchidas pelo tamanho
+        grupos: Dict[int, List[int]] = {}
+        for i, matrices in enumerate(respostas):
+            v = matrices.get(k)
+            if v is not None and v[0][0] != 0:  # type: ignore
+                grupos.setdefault(len(v), []).append(i)  # type: ignore
+
+        for indices in grupos.values():
+            stack: np.ndarray = np.array(
+                [respostas[i][k] for i in indices], dtype=np.float64)
+            cr[indices, j] = Ahp.calculate_batch(stack, method=method)[0]
+            filled[indices, j] = True
+            valores[k].update(zip(indices, stack))
+            tamanhos[k] = stack.shape[1:]
+
+    mask: np.ndarray = filled & (cr < threshold)
+
+    linhas = []
+    stacks: Dict[str, Dict[str, np.ndarray]] = {}
+    for t in sorted(set(types.tolist())):
+        do_tipo: np.ndarray = types == t
+        stacks[t] = {}
+        for j, k in enumerate(ids):
+            validos: np.ndarray = np.flatnonzero(do_tipo & mask[:, j])
+            preenchidos: int = int((do_tipo & filled[:, j]).sum())
+            total: int = int(do_tipo.sum())
+            linhas.append((t, k, validos.size, preenchidos - validos.size,
+                           total - preenchidos, total))
+            stacks[t][k] = np.array([valores[k][i] for i in validos.tolist()]) \
+                if validos.size else np.empty((0, *tamanhos.get(k, (0, 0))))
+
+    counts = pd.DataFrame(
+        linhas, columns=['type', 'matrix', 'valid', 'invalid', 'unfilled', 'total'])
+    counts = counts.set_index(['type', 'matrix'])
+
+    logger.debug(f'{int(mask.sum())}/{mask.size} valid matrices')
+    return Screening(types, ids, cr, mask, counts, stacks)
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains a columnar snapshot of the answers (the `AhpForm` collection).
+
+Every analysis loads all answers from the database (see :meth:`modules.ahp.Database.AhpForm.getAll`).
+The :func:`export` writes them into a single (uncompressed) `.npz` file, with a column per field:
+each matrix is stored as a stack (n×k×k), and `q15`, the types, names, emails and dates as arrays
+(of strings, with a validity mask, so None is restored).
+The :func:`load` memory-maps these columns, so the answers are read without a database (e.g: offline,
+in the CI), and only the pages that are used are read from disk.
+
+Example
+-------
+>>> from modules.ahp import Database, Snapshot
+>>> ahp = Database.AhpForm(connection_string)
+>>> Snapshot.export(ahp.getAll(), path.join('..', 'assets', 'ahp.npz'))
+>>> snapshot = Snapshot.load(path.join('..', 'assets', 'ahp.npz'))
+>>> len(snapshot)
+3000
+>>> stack, filled = snapshot.stack('q2', FormDataType.MARKET)  # see Ahp.calculate_batch
+>>> market = snapshot.findByType(FormDataType.MARKET)  # like AhpForm.findByType
+
+Or, through the command line:
+
+.. code-block:: bash
+
+    python -m modules.ahp.Snapshot --connection "mongodb://..." --output ../assets/ahp.npz
+"""
+
+# imports
+from argparse import ArgumentParser
+from os import path as ospath, makedirs, replace
+from typing import Any, Dict, Final, List, Optional, Tuple
+import numpy as np
+import struct
+import tempfile
+import zipfile
+import logging
+from bson.objectid import ObjectId
+from modules.ahp.Types import SCALAR, FormData, FormDataType
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# Versão do formato do arquivo
+VERSION: Final[str] = 'ahp-snapshot-v2'
+
+# Colunas de texto (campo do documento -> coluna)
+FIELDS: Final[Dict[str, str]] = {
+    'type': 'types', 'name': 'names', 'email': 'emails', 'date': 'dates'}
+
+
+def _text(values: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    A column of strings, and its validity mask (None is stored as an empty string, not valid).
+    """
+    return (
+        np.array(['' if v is None else str(v) for v in values], dtype=np.str_),
+        np.array([v is not None for v in values], dtype=bool))
+
+
+def export(forms: List[FormData], path: str) -> str:
+    """
+    Write the answers into a snapshot file.
+
+    Args
+    ----
+    `forms`:
+        The answers. See :meth:`modules.ahp.Database.AhpForm.getAll`
+    `path`:
+        The `.npz` file (it's replaced, if it exists)
+
+    Returns
+    -------
+    str
+        The path of the file
+
+    Raises
+    ------
+    `ValueError`:
+        If a matrix doesn't have the same shape in all answers
+
+    Note
+    ----
+    The matrices that an answer doesn't have are stored as zeros (not filled), with the column\
+        `has/<matrix>` set to False. Likewise, the ids, names, emails and dates equal to None are\
+            stored as empty strings, with the column `valid/<column>` set to False. The fields that\
+                aren't in :class:`modules.ahp.Types.FormData` getters are not stored.
+
+    Important
+    ---------
+    The text fields are stored as strings, so a date that isn't a string (e.g: a `datetime`) is\
+        read back as ``str(date)``.
+    """
+    columns: Dict[str, np.ndarray] = {
+        'version': np.array(VERSION),
+        'objectid': np.array(
+            [isinstance(form.getId(), ObjectId) for form in forms], dtype=bool),
+    }
+    textos: Dict[str, List[Any]] = {
+        'ids': [form.getId() for form in forms],
+        'types': [form.getType().value for form in forms],
+        'names': [form.getName() for form in forms],
+        'emails': [form.getEmail() for form in forms],
+        'dates': [form.getDate() for form in forms],
+    }
+    for column, valores in textos.items():
+        columns[column], columns[f'valid/{column}'] = _text(valores)
+
+    # ids das matrizes, na ordem em que aparecem
+    ids: List[str] = []
+    for form in forms:
+        ids.extend(k for k in form.getMatrices() if k not in ids)
+
+    for k in ids:
+        has: np.ndarray = np.array([k in form.getMatrices() for form in forms], dtype=bool)
+        if k == SCALAR:
+            values: np.ndarray = np.zeros(len(forms))
+            values[has] = [form.getMatrices()[k] for form, h in zip(forms, has) if h]
+        else:
+            shapes = {np.shape(form.getMatrices()[k]) for form, h in zip(forms, has) if h}
+            if len(shapes) != 1:
+                raise ValueError(f'The matrix {k} has different shapes: {sorted(shapes)}')
+            values = np.zeros((len(forms), *shapes.pop()))
+            values[has] = FormData.to_stack([form for form, h in zip(forms, has) if h], k)
+        columns[f'matrix/{k}'] = values
+        columns[f'has/{k}'] = has
+
+    directory: str = ospath.dirname(ospath.abspath(path))
+    makedirs(directory, exist_ok=True)
+    # escreve em um arquivo temporário, para que o arquivo nunca fique incompleto
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.npz', delete=False) as f:
+        np.savez(f, **columns)
+    replace(f.name, path)
+    logger.debug(f'{len(forms)} answers exported into "{path}"')
+    return path
+
+
+def _mmap_npz(path: str) -> Dict[str, np.ndarray]:
+    """
+    Memory-map each array of an uncompressed `.npz` file.
+
+    Note
+    ----
+    :func:`numpy.load` ignores the `mmap_mode` of `.npz` files. However, its members are `.npy`\
+        files stored (not compressed) in the zip, so they can be mapped at their offsets.
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    with zipfile.ZipFile(path) as z, open(path, 'rb') as f:
+        for info in z.infolist():
+            name: str = info.filename[:-len('.npy')] \
+                if info.filename.endswith('.npy') else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with z.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+
+            # o cabeçalho local do zip possui 30 bytes, o nome e o campo extra
+            f.seek(info.header_offset)
+            header: bytes = f.read(30)
+            name_length, extra_length = struct.unpack('<HH', header[26:30])
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+
+            if dtype.hasobject or not np.prod(shape):
+                f.seek(info.header_offset + 30 + name_length + extra_length)
+                arrays[name] = np.lib.format.read_array(f)
+                continue
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                order='F' if fortran else 'C')
+    return arrays
+
+
+class Snapshot:
+    """
+    The answers read from a snapshot file (see :func:`load`).
+
+    Args
+    ----
+    `columns`:
+        The columns of the file
+
+    Important
+    ---------
+    The arrays (and the matrices of the :class:`modules.ahp.Types.FormData` created from them) are\
+        read-only, since they're mapped from the file.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]) -> None:
+        self.columns: Dict[str, np.ndarray] = columns
+        self.types: np.ndarray = columns['types']
+        self.names: np.ndarray = columns['names']
+        self.emails: np.ndarray = columns['emails']
+        self.dates: np.ndarray = columns['dates']
+        self.matrices: List[str] = [
+            k[len('matrix/'):] for k in columns if k.startswith('matrix/')]
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def _mask(self, tt: Optional[FormDataType]) -> np.ndarray:
+        """
+        The answers of a type (or all of them).
+        """
+        if tt is None:
+            return np.ones(len(self), dtype=bool)
+        return self.types == tt.value
+
+    def stack(
+            self,
+            matrix: str,
+            tt: Optional[FormDataType] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The values of a matrix of all answers (of a type).
+
+        Args
+        ----
+        `matrix`:
+            The matrix id
+
+        Keyword Args
+        ------------
+        `tt`:
+            The respondent type (all answers, by default)
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            The matrices (n×k×k, or n for `q15`), and if each answer has this matrix (n). See\
+                :meth:`modules.ahp.Ahp.calculate_batch`
+
+        Raises
+        ------
+        `KeyError`:
+            If there's no such matrix
+        """
+        mask: np.ndarray = self._mask(tt)
+        values: np.ndarray = self.columns[f'matrix/{matrix}']
+        has: np.ndarray = self.columns[f'has/{matrix}']
+        if mask.all():
+            return values, has
+        return values[mask], has[mask]
+
+    def _text(self, column: str, i: int) -> Optional[str]:
+        """
+        The value `i` of a text column (None, if it isn't valid).
+        """
+        return str(self.columns[column][i]) if self.columns[f'valid/{column}'][i] else None
+
+    def _form(self, i: int) -> FormData:
+        """
+        The answer `i`, as a :class:`modules.ahp.Types.FormData` (its matrices are views).
+        """
+        _id: Any = self._text('ids', i)
+        if _id is not None and self.columns['objectid'][i]:
+            _id = ObjectId(_id)
+
+        document: Dict[str, Any] = {
+            field: self._text(column, i) for field, column in FIELDS.items()}
+        document['_id'] = _id
+        document['matrices'] = {
+            k: self.columns[f'matrix/{k}'][i] for k in self.matrices
+            if self.columns[f'has/{k}'][i]}
+        return FormData(document)
+
+    def getAll(self) -> List[FormData]:
+        """
+        All answers. See :meth:`modules.ahp.Database.AhpForm.getAll`
+        """
+        return [self._form(i) for i in range(len(self))]
+
+    def findByType(self, type: FormDataType) -> List[FormData]:
+        """
+        The answers of a type. See :meth:`modules.ahp.Database.AhpForm.findByType`
+        """
+        return [self._form(i) for i in np.flatnonzero(self._mask(type)).tolist()]
+
+
+def load(path: str, mmap: bool = True) -> Snapshot:
+    """
+    Read a snapshot file (created by :func:`export`).
+
+    Args
+    ----
+    `path`:
+        The `.npz` file
+
+    Keyword Args
+    ------------
+    `mmap`:
+        Memory-map the columns. Otherwise, they're read into memory.
+
+    Returns
+    -------
+    Snapshot
+        The answers
+
+    Raises
+    ------
+    `ValueError`:
+        If the file was created by another version
+    """
+    if mmap:
+        columns: Dict[str, np.ndarray] = _mmap_npz(path)
+    else:
+        with np.load(path) as data:
+            columns = {k: data[k] for k in data.files}
+
+    version: str = str(columns.get('version', ''))
+    if version != VERSION:
+        raise ValueError(f'Invalid snapshot version: {version}')
+    logger.debug(f'{len(columns["types"])} answers loaded from "{path}"')
+    return Snapshot(columns)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command line entry point. See :func:`export`.
+    """
+    parser = ArgumentParser(description='Export the AHP answers into a snapshot file')
+    parser.add_argument('--connection', required=True, help='The mongo connection string')
+    parser.add_argument('--database', default='')
+    parser.add_argument('--output', required=True, help='The .npz file')
+    args = parser.parse_args(argv)
+
+    from modules.ahp.Database import AhpForm
+    forms: List[FormData] = AhpForm(args.connection, args.database).getAll()
+    print(f'{len(forms)} answers exported into {export(forms, args.output)}')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -3,33 +3,13 @@
 """
 Module that contains some common classes to handle with ahp data.
 It has the class to hold and retrieve ahp data.
-
-Todo
-----
-Implements tests for:
-
-- test_email
-- test_type
-- test_date
-- test_matrix_root
-- test_matrix_q1
-- test_matrix_q1sec2
-- test_matrix_q1sec3
-- test_matrix_q1sec5
-- test_matrix_q2
-- test_matrix_q3
-- test_parse
-- test_repr
-- test_pretty
-- test_toDict
 """
 
 from __future__ import annotations
 from enum import Enum, unique
-import json
 import pprint
-from typing import Dict, List, Union
-from copy import deepcopy
+from typing import Any, Dict, Final, List, Optional, Sequence, Union
+import numpy as np
 
 
 @unique
@@ -38,14 +18,37 @@ class FormDataType(Enum):
     MARKET = 'market'
 
 
+# Id da matriz que é um escalar
+SCALAR: Final[str] = 'q15'
+
+# Tamanho de cada matriz do formulário
+MATRICES_SHAPE: Final[Dict[str, int]] = {
+    'q1': 6, 'q12': 3, 'q13': 6, 'q2': 5, 'q3': 4, 'root': 3}
+
+# Campos do documento que são armazenados separadamente
+_FIELDS: Final[List[str]] = ['_id', 'date', 'email', 'matrices', 'type', 'name']
+
+
+def _as_matrix(key: str, value: Any) -> Union[np.ndarray, float]:
+    """
+    Convert a value of the document into a (contiguous) float matrix, or a float (q15).
+    """
+    if key == SCALAR:
+        return float(value)
+    return np.ascontiguousarray(value, dtype=np.float64)
+
+
 class FormData:
     """
     This class hold some usefull methods to handle with *AHP* site data.
 
+    The matrices are stored as contiguous float arrays (and `q15` as a float), built straight\
+        from the document (it isn't copied). Use :meth:`to_stack` to join the matrices of many\
+            answers (see :meth:`modules.ahp.Ahp.calculate_batch`).
+
     Todo
     ----
 
-    - Missing tests
     - Add hide id
 
     Examples
@@ -114,28 +117,35 @@ class FormData:
         ...     [1,0.33,1,1],
         ...     [1,0.33,1,1],
         ... ])
+
+    .. versionchanged:: 0.0.10
+        The matrices are float arrays, and the document isn't deepcopied anymore.
     """
+    __slots__ = ('_id', '_date', '_email', '_type', '_name', '_matrices', '_extra')
 
     def __init__(self, obj: Dict = {}):
         if not obj:
-            # create a sample model
-            self._obj = {
+            # create a sample model (with the matrices not filled)
+            obj = {
                 'date': 'None',
                 'email': 'None',
                 'matrices': {
-                    'q1': 'A 6x6 matrix',
-                    'q12': 'A 3x3 matrix',
-                    'q13': 'A 6x6 matrix',
-                    'q15': 0,
-                    'q2': 'A 5x5 matrix',
-                    'q3': 'A 4x4 matrix',
-                    'root': 'A 3x3 matrix'
+                    **{k: np.zeros((n, n)) for k, n in MATRICES_SHAPE.items()},
+                    SCALAR: 0,
                 },
                 'type': FormDataType.MARKET.value,
                 'name': 'SomeName'
             }
-        else:
-            self._obj = deepcopy(obj)
+
+        self._id: Optional[Any] = obj.get('_id')
+        self._date: str = obj.get('date')
+        self._email: str = obj.get('email')
+        self._type: str = obj.get('type')
+        self._name: str = obj.get('name')
+        self._matrices: Dict[str, Union[np.ndarray, float]] = {
+            k: _as_matrix(k, v) for k, v in obj.get('matrices', {}).items()}
+        # os outros campos do documento (mantidos por referência)
+        self._extra: Dict[str, Any] = {k: v for k, v in obj.items() if k not in _FIELDS}
 
     def setEmail(self, email: str) -> FormData:
         """
@@ -151,7 +161,7 @@ class FormData:
         FormData
             This object itself. It can use nested calls.
         """
-        self._obj['email'] = email
+        self._email = email
         return self
 
     def setType(self, type: FormDataType) -> FormData:
@@ -168,7 +178,7 @@ class FormData:
         FormData
             This object itself. It can use nested calls.
         """
-        self._obj['type'] = type.value
+        self._type = type.value
         return self
 
     def setName(self, name: str) -> FormData:
@@ -185,7 +195,7 @@ class FormData:
         FormData
             This object itself. It can use nested calls.
         """
-        self._obj['name'] = name
+        self._name = name
         return self
 
     def setDate(self, date: str) -> FormData:
@@ -202,7 +212,7 @@ class FormData:
         FormData
             This object itself. It can use nested calls.
         """
-        self._obj['date'] = date
+        self._date = date
         return self
 
     def setMatrixRoot(self, matrix: List[List[float]]) -> FormData:
@@ -219,7 +229,7 @@ class FormData:
         FormData
             This object itself. It can use nested calls.
         """
-        self._obj['matrices']['root'] = matrix
+        self._matrices['root'] = _as_matrix('root', matrix)
         return self
 
     def setMatrixQ1(self, matrix: List[List[float]]) -> FormData:
@@ -236,7 +246,7 @@ class FormData:
         FormData
             This object itself. It can use nested calls.
         """
-        self._obj['matrices']['q1'] = matrix
+        self._matrices['q1'] = _as_matrix('q1', matrix)
         return self
 
     def setMatrixQ1sec2(self, matrix: List[List[float]]) -> FormData:
@@ -253,7 +263,7 @@ class FormData:
         FormData
             This object itself. It can use nested calls.
         """
-        self._obj['matrices']['q12'] = matrix
+        self._matrices['q12'] = _as_matrix('q12', matrix)
         return self
 
     def setMatrixQ1sec3(self, matrix: List[List[float]]) -> FormData:
@@ -270,7 +280,7 @@ class FormData:
         FormData
             This object itself. It can use nested calls.
         """
-        self._obj['matrices']['q13'] = matrix
+        self._matrices['q13'] = _as_matrix('q13', matrix)
         return self
 
     def setMatrixQ1sec5(self, number: int) -> FormData:
@@ -287,7 +297,7 @@ class FormData:
         FormData
             This object itself. It can use nested calls.
         """
-        self._obj['matrices']['q15'] = number
+        self._matrices['q15'] = _as_matrix('q15', number)
         return self
 
     def setMatrixQ2(self, matrix: List[List[float]]) -> FormData:
@@ -304,7 +314,7 @@ class FormData:
         FormData
             This object itself. It can use nested calls.
         """
-        self._obj['matrices']['q2'] = matrix
+        self._matrices['q2'] = _as_matrix('q2', matrix)
         return self
 
     def setMatrixQ3(self, matrix: List[List[float]]) -> FormData:
@@ -321,22 +331,29 @@ class FormData:
         FormData
             This object itself. It can use nested calls.
         """
-        self._obj['matrices']['q3'] = matrix
+        self._matrices['q3'] = _as_matrix('q3', matrix)
         return self
 
-    def parse(self) -> json:
+    def parse(self) -> Dict[str, Any]:
         """
-        Parse into json objects. It's a destructive action
+        Parse into json objects.
 
         Returns
         -------
-        json
-            Parsed json objects
+        Dict[str, Any]
+            Parsed json objects (the id is converted into `str`)
+
+        Raises
+        ------
+        `KeyError`:
+            If this object hasn't an id (`_id`)
+
+        .. versionchanged:: 0.0.10
+            It isn't a destructive action anymore.
         """
-        obj = deepcopy(self._obj)
+        obj = self.toDict()
         # conver unique id into str
         obj['id'] = str(obj.pop('_id'))
-        obj = json.loads(json.dumps(obj))
         return obj
 
     def __repr__(self) -> str:
@@ -348,7 +365,7 @@ class FormData:
         str
             A formatted string
         """
-        return pprint.pformat(self._obj, indent=1)
+        return pprint.pformat(self.toDict(), indent=1)
 
     def pretty(self) -> str:
         """
@@ -359,15 +376,24 @@ class FormData:
         str
             A formatted string
         """
-        local_obj = deepcopy(self._obj)
+        local_obj = self.toDict()
 
-        if "id" not in local_obj:
-            obj_id = local_obj.pop('_id')
-            local_obj['id'] = str(obj_id)
-            local_obj = json.loads(json.dumps(local_obj))
+        if "id" not in local_obj and '_id' in local_obj:
+            local_obj['id'] = str(local_obj.pop('_id'))
 
         return pprint.pformat(local_obj, indent=1)
 
+    def getId(self) -> Optional[Any]:
+        """
+        Get this id
+
+        Returns
+        --------
+        Optional[Any]
+            The id (`_id`) in database, or None if it wasn't stored.
+        """
+        return self._id
+
     def getEmail(self) -> str:
         """
         Get this email
@@ -377,7 +403,7 @@ class FormData:
         str
             A email string.
         """
-        return self._obj['email']
+        return self._email
 
     def getName(self) -> str:
         """
@@ -388,7 +414,7 @@ class FormData:
         str
             A name string.
         """
-        return self._obj['name']
+        return self._name
 
     def getDate(self) -> str:
         """
@@ -399,62 +425,73 @@ class FormData:
         str
             A date string.
         """
-        return self._obj['date']
+        return self._date
 
-    def getMatrices(self) -> Dict[str, Union[List[List[float]], float]]:
+    def getType(self) -> FormDataType:
+        """
+        Get this type
+
+        Returns
+        --------
+        FormDataType
+            The type of the respondent.
+        """
+        return FormDataType(self._type)
+
+    def getMatrices(self) -> Dict[str, Union[np.ndarray, float]]:
         """
         Get the dictionary equivalent to matrices.
 
         Returns
         --------
-        Union[List[List[float]], float]]
+        Union[np.ndarray, float]]
             A dictionary mapping to matrices.
         """
-        return self._obj['matrices']
+        return self._matrices
 
-    def getMatrixRoot(self) -> List[List[float]]:
+    def getMatrixRoot(self) -> np.ndarray:
         """
         Get the root matrix.
 
         Returns
         --------
-        List[List[float]]
+        np.ndarray
             The root matrix object.
         """
-        return self._obj['matrices']['root']
+        return self._matrices['root']
 
-    def getMatrixQ1(self) -> List[List[float]]:
+    def getMatrixQ1(self) -> np.ndarray:
         """
         Get the q1 matrix.
 
         Returns
         --------
-        List[List[float]]
+        np.ndarray
             The q1 matrix object.
         """
-        return self._obj['matrices']['q1']
+        return self._matrices['q1']
 
-    def getMatrixQ1sec2(self) -> List[List[float]]:
+    def getMatrixQ1sec2(self) -> np.ndarray:
         """
         Get the Q1sec2 matrix.
 
         Returns
         --------
-        List[List[float]]
+        np.ndarray
             The Q1sec2 matrix object.
         """
-        return self._obj['matrices']['q12']
+        return self._matrices['q12']
 
-    def getMatrixQ1sec3(self) -> List[List[float]]:
+    def getMatrixQ1sec3(self) -> np.ndarray:
         """
         Get the Q1sec3 matrix.
 
         Returns
         --------
-        List[List[float]]
+        np.ndarray
             The Q1sec3 matrix object.
         """
-        return self._obj['matrices']['q13']
+        return self._matrices['q13']
 
     def getMatrixQ1sec5(self) -> float:
         """
@@ -465,29 +502,29 @@ class FormData:
         float
             The Q1sec5 matrix object.
         """
-        return self._obj['matrices']['q15']
+        return self._matrices['q15']
 
-    def getMatrixQ2(self) -> List[List[float]]:
+    def getMatrixQ2(self) -> np.ndarray:
         """
         Get the Q2 matrix.
 
         Returns
         --------
-        List[List[float]]
+        np.ndarray
             The Q2 matrix object.
         """
-        return self._obj['matrices']['q2']
+        return self._matrices['q2']
 
-    def getMatrixQ3(self) -> List[List[float]]:
+    def getMatrixQ3(self) -> np.ndarray:
         """
         Get the Q3 matrix.
 
         Returns
         --------
-        List[List[float]]
+        np.ndarray
             The Q3 matrix object.
         """
-        return self._obj['matrices']['q3']
+        return self._matrices['q3']
 
     def toDict(self) -> Dict[str, Union[str, Dict[str, Union[List[List[float]], float]]]]:
         """
@@ -495,10 +532,63 @@ class FormData:
 
         Returns
         --------
-        List[List[float]]
-            A dictionary equivalent to this object.
+        Dict[str, Union[str, Dict[str, Union[List[List[float]], float]]]]
+            A dictionary equivalent to this object (a new one), whose matrices are lists.\
+                It can be stored in database (see :meth:`modules.ahp.Database.AhpForm.insert`).
+
+        .. versionchanged:: 0.0.10
+            Returns a new dictionary (changing it doesn't change this object).
+        """
+        obj: Dict[str, Any] = {} if self._id is None else {'_id': self._id}
+        obj.update({
+            'date': self._date,
+            'email': self._email,
+            'matrices': {
+                k: v if k == SCALAR else v.tolist()  # type: ignore
+                for k, v in self._matrices.items()},
+            'type': self._type,
+            'name': self._name,
+        })
+        obj.update(self._extra)
+        return obj
+
+    @staticmethod
+    def to_stack(responses: Sequence[FormData], matrix: str) -> np.ndarray:
         """
-        return self._obj
+        Join a matrix of many answers.
+
+        Args
+        ----
+        `responses`:
+            The answers
+        `matrix`:
+            The matrix id (e.g: `q1`)
+
+        Returns
+        -------
+        np.ndarray
+            The matrices stacked (n×k×k), ready to :meth:`modules.ahp.Ahp.calculate_batch`.\
+                For `q15`, an array with the values (n).
+
+        Raises
+        ------
+        `KeyError`:
+            If some answer hasn't this matrix
+        `ValueError`:
+            If the matrices have different shapes
+
+        Example
+        -------
+        >>> stack = FormData.to_stack(ahp.getAll(), 'q2')
+        >>> cr, priorities = Ahp.calculate_batch(stack)
+        """
+        values = [response._matrices[matrix] for response in responses]
+        if matrix == SCALAR:
+            return np.array(values, dtype=np.float64)
+        if not values:
+            n: int = MATRICES_SHAPE.get(matrix, 0)
+            return np.empty((0, n, n))
+        return np.stack(values)  # type: ignore
 
     # Alias to toDict function
     getDict = toDict
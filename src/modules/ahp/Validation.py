@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains a batch validator of the answers (their matrices).
+
+The malformed answers (e.g: a 5×5 `q1`, or a matrix that isn't reciprocal) were only found when
+calculating the AHP of each one. The :class:`Validator` is compiled once, from the expected shape of
+each matrix, and checks the shape, diagonal, reciprocity and values (range) of all answers at once,
+returning an error bitmask (see :class:`Error`) for each answer. So, the bad answers can be rejected
+before any AHP calculation.
+
+Example
+-------
+>>> from modules.ahp import Validation
+>>> result = Validation.validate(ahp.getAll())  # or the documents, before creating the FormData
+>>> result.errors
+array([0, 0, 8, ...])
+>>> Validation.Error(result.errors[2])
+<Error.RECIPROCITY: 8>
+>>> result.detail[2, result.matrices.index('q1')]  # the errors of the matrix q1
+8
+>>> valid = [form for form, ok in zip(forms, result.valid) if ok]
+"""
+
+# imports
+from enum import IntFlag
+from typing import Any, Dict, Final, List, NamedTuple, Sequence, Tuple, Union
+import numpy as np
+import logging
+from modules.ahp.Types import MATRICES_SHAPE, SCALAR, FormData
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# Menor e maior valores da escala de Saaty
+DEFAULT_RANGE: Final[Tuple[float, float]] = (1/9, 9)
+
+# Tolerância relativa (os valores do formulário são arredondados, e.g: 1/7 -> 0.14)
+DEFAULT_RTOL: Final[float] = 0.05
+
+
+class Error(IntFlag):
+    """
+    The errors of a matrix (or answer). They're combined as a bitmask.
+    """
+    #: No errors
+    NONE = 0
+    #: The matrix wasn't filled (all zeros). It isn't an error, the matrix is ignored by the analyses
+    UNFILLED = 1
+    #: The answer doesn't have the matrix
+    MISSING = 2
+    #: The matrix doesn't have the expected shape (or it isn't numeric)
+    SHAPE = 4
+    #: The matrix isn't reciprocal (a[i][j]*a[j][i] != 1)
+    RECIPROCITY = 8
+    #: The diagonal isn't 1
+    DIAGONAL = 16
+    #: Some value is out of the Saaty scale (or it isn't finite)
+    RANGE = 32
+
+
+#: The errors that make an answer invalid
+INVALID: Final[Error] = \
+    Error.MISSING | Error.SHAPE | Error.RECIPROCITY | Error.DIAGONAL | Error.RANGE
+
+
+class Validation(NamedTuple):
+    """
+    The result of :meth:`Validator.validate`.
+    """
+    #: The errors of each answer (shape n), see :class:`Error`
+    errors: np.ndarray
+    #: The matrix ids (the columns of `detail`)
+    matrices: List[str]
+    #: The errors of each (answer, matrix) (shape n×m)
+    detail: np.ndarray
+
+    @property
+    def valid(self) -> np.ndarray:
+        """
+        The answers without errors (the unfilled matrices are accepted).
+        """
+        return (self.errors & INVALID) == 0
+
+
+class Validator:
+    """
+    A validator compiled from the expected matrices.
+
+    Keyword Args
+    ------------
+    `shapes`:
+        The number of columns of each matrix. The scalar (q15) is always checked if present.
+    `scale`:
+        The smallest and the greatest values
+    `rtol`:
+        The relative tolerance of the range, the reciprocity and the diagonal
+
+    Important
+    ---------
+    A matrix is unfilled when all its values are 0 (:attr:`Error.UNFILLED`), and the other checks\
+        are skipped. Matrices whose first value is 0 (but aren't all zeros) have wrong diagonals.
+    """
+
+    def __init__(
+            self,
+            shapes: Dict[str, int] = MATRICES_SHAPE,
+            scale: Tuple[float, float] = DEFAULT_RANGE,
+            rtol: float = DEFAULT_RTOL) -> None:
+        self.shapes: Dict[str, int] = dict(shapes)
+        self.matrices: List[str] = [*self.shapes, SCALAR]
+        self.rtol: float = rtol
+        self.low: float = scale[0] * (1 - rtol)
+        self.high: float = scale[1] * (1 + rtol)
+
+        # posições fora da diagonal, de cada tamanho
+        self._off: Dict[int, np.ndarray] = {
+            n: ~np.eye(n, dtype=bool) for n in set(self.shapes.values())}
+
+    def validate_stack(self, matrix: str, stack: np.ndarray) -> np.ndarray:
+        """
+        Check a stack of matrices (of the same id).
+
+        Args
+        ----
+        `matrix`:
+            The matrix id
+        `stack`:
+            The matrices (n×k×k), or the values (n) of the scalar (q15)
+
+        Returns
+        -------
+        np.ndarray
+            The errors of each matrix (n). See :class:`Error`
+
+        Raises
+        ------
+        `KeyError`:
+            If the matrix id is unknown
+        """
+        stack = np.asarray(stack, dtype=np.float64)
+        errors: np.ndarray = np.zeros(len(stack), dtype=np.int64)
+
+        if matrix == SCALAR:
+            if stack.ndim != 1:
+                errors[:] = Error.SHAPE
+                return errors
+            unfilled: np.ndarray = stack == 0
+            with np.errstate(invalid='ignore'):
+                fora = ~((stack >= self.low) & (stack <= self.high))
+            errors[unfilled] |= Error.UNFILLED
+            errors[fora & ~unfilled] |= Error.RANGE
+            return errors
+
+        n: int = self.shapes[matrix]
+        if stack.shape[1:] != (n, n):
+            errors[:] = Error.SHAPE
+            return errors
+
+        unfilled = ~stack.any(axis=(1, 2))
+        with np.errstate(invalid='ignore', over='ignore'):
+            fora = ~((stack >= self.low) & (stack <= self.high)).all(axis=(1, 2))
+            diagonal = ~(np.abs(np.diagonal(stack, axis1=1, axis2=2) - 1)
+                         <= self.rtol).all(axis=1)
+            produto: np.ndarray = stack * np.swapaxes(stack, 1, 2)
+            reciprocidade = ~(np.abs(produto[:, self._off[n]] - 1) <= self.rtol).all(axis=1)
+
+        errors[unfilled] |= Error.UNFILLED
+        errors[fora & ~unfilled] |= Error.RANGE
+        errors[diagonal & ~unfilled] |= Error.DIAGONAL
+        errors[reciprocidade & ~unfilled] |= Error.RECIPROCITY
+        return errors
+
+    def validate(self, data: Sequence[Union[FormData, Dict[str, Any]]]) -> Validation:
+        """
+        Check all matrices of all answers.
+
+        Args
+        ----
+        `data`:
+            The answers, or the documents of the database (before creating the\
+                :class:`modules.ahp.Types.FormData`)
+
+        Returns
+        -------
+        Validation
+            The errors of each answer, and of each (answer, matrix)
+        """
+        respostas: List[Dict[str, Any]] = [
+            d.getMatrices() if isinstance(d, FormData) else d.get('matrices') or {}
+            for d in data]
+        detail: np.ndarray = np.zeros((len(data), len(self.matrices)), dtype=np.int64)
+
+        for j, k in enumerate(self.matrices):
+            shape: Tuple[int, ...] = () if k == SCALAR else (self.shapes[k],)*2
+            indices: List[int] = []
+            values: List[np.ndarray] = []
+            for i, matrices in enumerate(respostas):
+                if k not in matrices:
+                    detail[i, j] = Error.MISSING if k != SCALAR else Error.NONE
+                    continue
+                try:
+                    v: np.ndarray = np.asarray(matrices[k], dtype=np.float64)
+                except (TypeError, ValueError):
+                    detail[i, j] = Error.SHAPE
+                    continue
+                if v.shape != shape:
+                    detail[i, j] = Error.SHAPE
+                    continue
+                indices.append(i)
+                values.append(v)
+
+            if indices:
+                detail[indices, j] = self.validate_stack(k, np.stack(values))
+
+        errors: np.ndarray = np.bitwise_or.reduce(detail, axis=1) \
+            if detail.size else np.zeros(len(data), dtype=np.int64)
+        logger.debug(f'{int(((errors & INVALID) != 0).sum())}/{len(data)} invalid answers')
+        return Validation(errors, list(self.matrices), detail)
+
+
+# Validador do formulário
+DEFAULT: Final[Validator] = Validator()
+
+
+def validate(data: Sequence[Union[FormData, Dict[str, Any]]]) -> Validation:
+    """
+    The same of :meth:`Validator.validate`, using the form's validator (:data:`DEFAULT`).
+    """
+    return DEFAULT.validate(data)
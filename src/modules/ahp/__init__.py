@@ -4,6 +4,14 @@ This module contains some usefull functions to:
 - Parse/read data from `ahp-form`_, :mod:`.Types`
 - Managing ahp retrieve data from database, :mod:`.Database`
 - Calculate Ahp, :mod:`.Ahp`
+- Aggregate the answers as they arrive, :mod:`.Aggregator`
+- Compare the Ahp methods, :mod:`.Benchmark`
+- Memoize the Ahp results, :mod:`.Cache`
+- Compose the priorities down the Ahp tree, :mod:`.Hierarchy`
+- Estimate the random index of large matrices, :mod:`.RandomIndex`
+- Check the consistency of all answers at once, :mod:`.Screening`
+- Export/load the answers into a columnar file, :mod:`.Snapshot`
+- Validate the matrices of all answers at once, :mod:`.Validation`
 
 .. _ahp-form: http://www.sigaaanalise.xyz/
 """
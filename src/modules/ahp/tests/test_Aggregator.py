@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+from typing import List
+import json
+import unittest
+from modules import util
+from modules.ahp.Aggregator import AhpAggregator
+from modules.ahp.Types import FormData, FormDataType
+import numpy as np
+
+
+def consistent_forms(n: int, tt: FormDataType, seed: int = 0) -> List[FormData]:
+    """
+    Create `n` answers, with (almost) consistent matrices (some of them aren't filled).
+    """
+    rng = np.random.default_rng(seed)
+    sizes = {'root': 3, 'q1': 6, 'q12': 3, 'q13': 6, 'q2': 5, 'q3': 4}
+    forms: List[FormData] = []
+    for i in range(n):
+        matrices = {}
+        for k, size in sizes.items():
+            w = rng.uniform(1, 9, size)
+            matrices[k] = np.zeros((size, size)).tolist() if rng.random() < 0.2 \
+                else np.round(w[:, None] / w[None, :], 2).tolist()
+        matrices['q15'] = float(rng.choice([0, 1/9, 1/3, 1, 3, 9]))
+        forms.append(FormData(
+            {'matrices': matrices, 'name': f'{tt.value} {i}', 'type': tt.value}))
+    return forms
+
+
+class TestAhpAggregator(unittest.TestCase):
+    def setUp(self):
+        self.market = consistent_forms(20, FormDataType.MARKET, seed=0)
+        self.teacher = consistent_forms(10, FormDataType.TEACHER, seed=1)
+
+    def assertSameMatrices(self, expected, result):
+        self.assertListEqual(sorted(expected), sorted(result))
+        for k in expected:
+            np.testing.assert_allclose(expected[k], result[k], atol=1e-12, err_msg=k)
+
+    def test_add(self):
+        aggregator = AhpAggregator()
+        for form in self.market + self.teacher:
+            aggregator.add(form)
+
+        for tt, forms in ((FormDataType.MARKET, self.market), (FormDataType.TEACHER, self.teacher)):
+            # o mesmo tipo de retorno de calc_mean_matrix (listas)
+            self.assertDictEqual(
+                {k: type(v) for k, v in util.calc_mean_matrix(forms).items()},
+                {k: type(v) for k, v in aggregator.mean_matrices(tt).items()})
+            self.assertSameMatrices(
+                util.calc_mean_matrix(forms), aggregator.mean_matrices(tt))
+            self.assertSameMatrices(
+                util.calc_mean_matrix(forms, mode=util.GEOMETRIC),
+                aggregator.mean_matrices(tt, mode=util.GEOMETRIC))
+            self.assertSameMatrices(
+                util.calc_ahp_for_new_mat(util.calc_mean_matrix(forms)),
+                aggregator.priorities(tt))
+
+        self.assertEqual(
+            sum(f.getMatrices()['q2'][0][0] != 0 for f in self.market),
+            aggregator.count(FormDataType.MARKET, 'q2'))
+
+    def test_remove(self):
+        aggregator = AhpAggregator()
+        for form in self.market:
+            aggregator.add(form)
+        for form in self.market[:5]:
+            aggregator.remove(form)
+        self.assertSameMatrices(
+            util.calc_mean_matrix(self.market[5:]),
+            aggregator.mean_matrices(FormDataType.MARKET))
+
+        # uma resposta que não foi adicionada
+        with self.assertRaises(ValueError):
+            aggregator.remove(self.teacher[0])
+
+        single = AhpAggregator()
+        single.add(self.market[0])
+        with self.assertRaises(util.MinimumLenghtError):
+            single.mean(FormDataType.MARKET, 'q15')
+
+    def test_zero_entries(self):
+        def form(root: List[List[float]], i: int) -> FormData:
+            return FormData({'matrices': {'root': root}, 'name': f'zero {i}', 'type': 'market'})
+
+        forms = [form([[1, 2, 1], [0.5, 1, 0.5], [1, 2, 1]], i) for i in range(3)]
+        zero = form([[1, 2, 0], [0.5, 1, 0.5], [1, 2, 1]], 3)
+
+        aggregator = AhpAggregator()
+        for f in forms:
+            aggregator.add(f)
+        expected = aggregator.to_dict()
+
+        self.assertListEqual(['root'], aggregator.add(zero))
+        self.assertSameMatrices(
+            util.calc_mean_matrix(forms + [zero], mode=util.GEOMETRIC),
+            aggregator.mean_matrices(FormDataType.MARKET, mode=util.GEOMETRIC))
+        self.assertEqual(
+            0.0, aggregator.mean(FormDataType.MARKET, 'root', mode=util.GEOMETRIC)[0][2])
+
+        # o estado continua finito, e remover a resposta restaura as médias
+        json.dumps(aggregator.to_dict(), allow_nan=False)
+        aggregator.remove(zero)
+        self.assertDictEqual(expected, aggregator.to_dict())
+        self.assertSameMatrices(
+            util.calc_mean_matrix(forms, mode=util.GEOMETRIC),
+            aggregator.mean_matrices(FormDataType.MARKET, mode=util.GEOMETRIC))
+
+    def test_state(self):
+        aggregator = AhpAggregator()
+        for form in self.market[:10]:
+            aggregator.add(form)
+
+        # o estado pode ser salvo em json
+        restored = AhpAggregator.from_dict(json.loads(json.dumps(aggregator.to_dict())))
+        for form in self.market[10:]:
+            aggregator.add(form)
+            restored.add(form)
+        self.assertSameMatrices(
+            aggregator.mean_matrices(FormDataType.MARKET),
+            restored.mean_matrices(FormDataType.MARKET))
+
+        with self.assertRaises(ValueError):
+            AhpAggregator.from_dict({'version': 'other'})
@@ -3,6 +3,8 @@
 from typing import List
 import unittest
 from modules.ahp import Ahp
+from modules.ahp.RandomIndex import random_matrices
+import numpy as np
 
 
 class TestAhpModule(unittest.TestCase):
@@ -42,3 +44,144 @@ class TestAhpModule(unittest.TestCase):
         self.assertEqual(1.0, Ahp.get_q15_value(9))
         self.assertEqual(0.1, Ahp.get_q15_value(1))
         self.assertEqual(0.0, Ahp.get_q15_value(1/9))
+
+    def test_calculate_batch(self):
+        for k in range(3, 16):
+            stack = random_matrices(50, k, k)
+            cr, priority = Ahp.calculate_batch(stack)
+            self.assertTupleEqual((50,), cr.shape)
+            self.assertTupleEqual((50, k), priority.shape)
+            for i, matrix in enumerate(stack.tolist()):
+                expected_cr, expected_pv = Ahp.calculate(matrix)
+                self.assertEqual(expected_cr, cr[i])
+                self.assertListEqual(expected_pv, priority[i].tolist())
+
+        # a lista de matrizes também pode ser usada
+        matrix = [[1, 5, 4, 7], [0.2, 1, 0.5, 3], [0.25, 2, 1, 3], [0.14, 0.33, 0.33, 1]]
+        cr, priority = Ahp.calculate_batch([matrix], roundp=2)
+        expected_cr, expected_pv = Ahp.calculate(matrix, roundp=2)
+        self.assertEqual(expected_cr, cr[0])
+        self.assertListEqual(expected_pv, priority[0].tolist())
+
+    def test_calculate_batch_small(self):
+        for k in (1, 2):
+            cr, priority = Ahp.calculate_batch(np.ones((4, k, k)))
+            self.assertListEqual([1.0]*4, cr.tolist())
+            self.assertTupleEqual((4, 0), priority.shape)
+            self.assertEqual((1, []), Ahp.calculate(np.ones((k, k)).tolist()))
+
+        with self.assertRaises(ValueError):
+            Ahp.calculate_batch(np.ones((4, 3, 2)))
+
+    def test_calculate_eigenvector(self):
+        for k in (3, 6, 15):
+            stack = random_matrices(100, k, k)
+            cr, priority = Ahp.calculate_batch(stack, method=Ahp.EIGENVECTOR)
+
+            values, vectors = np.linalg.eig(stack)
+            principal = np.argmax(values.real, axis=1)
+            for i in range(stack.shape[0]):
+                expected = vectors[i, :, principal[i]].real
+                expected /= expected.sum()
+                np.testing.assert_allclose(expected, priority[i], atol=1e-8)
+                lambda_max = values[i, principal[i]].real
+                self.assertAlmostEqual(
+                    (lambda_max-k)/(k-1)/Ahp.random_index(k), cr[i], places=7)
+
+        # uma matriz consistente possui lambda_max == k
+        matrix = [[1, 2, 4], [0.5, 1, 2], [0.25, 0.5, 1]]
+        cr, priority = Ahp.calculate(matrix, method=Ahp.EIGENVECTOR)
+        self.assertAlmostEqual(0, cr)
+        np.testing.assert_allclose([4/7, 2/7, 1/7], priority)
+        self.assertEqual(
+            (1, []), Ahp.calculate([[1, 2], [0.5, 1]], method=Ahp.EIGENVECTOR))
+
+        with self.assertRaises(ValueError):
+            Ahp.calculate(matrix, method='unknown')
+
+    def test_calculate_eigenvector_max_iter(self):
+        matrix = [[1, 2, 4], [0.5, 1, 2], [0.25, 0.5, 1]]
+        for max_iter in (0, -1):
+            with self.assertRaises(ValueError):
+                Ahp.calculate(matrix, method=Ahp.EIGENVECTOR, max_iter=max_iter)
+            with self.assertRaises(ValueError):
+                Ahp.calculate_batch([matrix], method=Ahp.EIGENVECTOR, max_iter=max_iter)
+        # o método aproximado não itera
+        self.assertEqual(Ahp.calculate(matrix), Ahp.calculate(matrix, max_iter=0))
+
+        # a matriz consistente converge na segunda iteração (o vetor não muda)
+        with self.assertLogs(Ahp.logger, 'DEBUG') as logs:
+            Ahp.calculate(matrix, method=Ahp.EIGENVECTOR, max_iter=1)
+            Ahp.calculate(matrix, method=Ahp.EIGENVECTOR)
+        stopped = [m for m in logs.output if 'stopped after' in m]
+        self.assertIn('after 1 iterations', stopped[0])
+        self.assertIn('after 2 iterations', stopped[1])
+
+
+class TestCompetenceLayout(unittest.TestCase):
+    def setUp(self):
+        self.layout = Ahp.SECTIONS_LAYOUT
+        rng = np.random.default_rng(0)
+        self.columns = list(rng.permutation(self.layout.competences)) + ['Outra']
+        self.matrix = rng.random((10, len(self.columns)))
+
+    def test_to_sections(self):
+        sections = self.layout.to_sections(self.matrix, columns=self.columns)
+        self.assertListEqual(list(self.layout.sections), list(sections))
+        for i, row in enumerate(self.matrix):
+            notas = dict(zip(self.columns, row.tolist()))
+            expected = Ahp.Mapping.to_sections(notas)
+            for section, values in sections.items():
+                self.assertTupleEqual((10, len(expected[section])), values.shape)
+                self.assertListEqual(expected[section], values[i].tolist())
+
+        with self.assertRaises(ValueError):
+            self.layout.to_sections({'PAA': 1.0})
+        with self.assertRaises(ValueError):
+            self.layout.to_sections(self.matrix)
+
+    def test_from_sections(self):
+        flat = self.layout.to_sections(self.matrix, columns=self.columns)
+        np.testing.assert_array_equal(
+            self.matrix[:, self.layout.columns(self.columns)],
+            self.layout.from_sections(flat))
+
+        # q15 como escalar e q1 do formulário (6 competências)
+        sections = {**flat, 'q15': flat['q15'][:, 0], 'q1': np.zeros((10, 6))}
+        result = self.layout.from_sections(sections)
+        np.testing.assert_array_equal(
+            1 - flat['q15'][:, 0], result[:, self.layout.index['q15'][1]])
+        np.testing.assert_array_equal(
+            np.zeros((10, 3)), result[:, self.layout.index['q1']])
+
+        # as seções que não existem são NaN
+        result = Ahp.COMPETENCES_LAYOUT.from_sections({'q12': [1, 2, 3]})
+        self.assertEqual(3, np.count_nonzero(~np.isnan(result)))
+
+        with self.assertRaises(ValueError):
+            self.layout.from_sections({'q2': [1, 2]})
+
+    def test_to_competences(self):
+        sections = {'root': [0.2, 0.3, 0.5], 'q1': [1, 2, 3, 4, 5, 6], 'q12': [1, 2, 3],
+                    'q13': [1, 2, 3, 4, 5, 6], 'q15': 0.25, 'q2': [1, 2, 3, 4, 5], 'q3': [1, 2, 3, 4]}
+        result = Ahp.Mapping.to_competences(sections)
+        self.assertListEqual(list(Ahp.COMPETENCES_LAYOUT.competences), list(result))
+        self.assertEqual(6, result[Ahp.Mapping.COMPETENCES_MATRIX_Q1[2]])
+        self.assertEqual(0.75, result[Ahp.Mapping.COMPETENCES_MATRIX_Q15[1]])
+        # a entrada não é alterada
+        self.assertEqual(6, len(sections['q1']))
+
+        with self.assertRaises(Exception):
+            Ahp.Mapping.to_competences({'q1': [1, 2, 3]})
+
+    def test_frozen(self):
+        import pickle
+        with self.assertRaises(AttributeError):
+            self.layout.competences = ()
+        with self.assertRaises(ValueError):
+            self.layout.index['q1'][0] = 1
+        with self.assertRaises(ValueError):
+            Ahp.CompetenceLayout({'a': ['x', 'y'], 'b': ['y']})
+
+        copy = pickle.loads(pickle.dumps(self.layout))
+        self.assertTupleEqual(self.layout.competences, copy.competences)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import unittest
+from modules.ahp import Ahp, Benchmark, RandomIndex
+from modules.ahp.Types import FormData
+import numpy as np
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_stored_matrices(self):
+        forms = [
+            FormData({'matrices': {
+                'q12': [[1, 1, 5], [1, 1, 3], [0.2, 0.33, 1]],
+                'q15': 5,
+                'root': [[1, 1, 3], [1, 1, 3], [0.33, 0.33, 1]]}}),
+            FormData({'matrices': {
+                'q12': [[0, 0, 0], [0, 0, 0], [0, 0, 0]],
+                'q15': 0,
+                'root': [[1, 3, 3], [0.33, 1, 1], [0.33, 1, 1]]}}),
+        ]
+        stacks = Benchmark.stored_matrices(forms)
+        self.assertListEqual(['q12', 'root'], sorted(stacks))
+        self.assertTupleEqual((1, 3, 3), stacks['q12'].shape)
+        self.assertTupleEqual((2, 3, 3), stacks['root'].shape)
+
+    def test_compare_methods(self):
+        stack = RandomIndex.random_matrices(200, 5, 0, scale=Benchmark.SCALE)
+        result = Benchmark.compare_methods(stack, repeat=1)
+        self.assertListEqual(Ahp.METHODS, result.index.to_list())
+        self.assertListEqual(
+            ['seconds', 'priority_error', 'cr_error'], result.columns.to_list())
+        self.assertLess(result.loc[Ahp.EIGENVECTOR, 'priority_error'], 1e-8)
+        self.assertTrue(np.all(result['seconds'] > 0))
+
+    def test_random_index_table(self):
+        result = Benchmark.random_index_table([3, 16], samples=500)
+        self.assertListEqual([3, 16], result.index.to_list())
+        self.assertListEqual(['ri', 'saaty', 'seconds'], result.columns.to_list())
+        self.assertEqual(0.58, result.loc[3, 'saaty'])
+        self.assertTrue(np.isnan(result.loc[16, 'saaty']))
+        self.assertGreater(result.loc[16, 'ri'], result.loc[3, 'ri'])
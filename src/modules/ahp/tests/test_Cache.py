@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import json
+import tempfile
+import unittest
+from os import path
+from modules.ahp import Ahp, Cache
+from modules.ahp.RandomIndex import random_matrices
+
+
+class TestAhpCache(unittest.TestCase):
+    def setUp(self):
+        self.matrix = [[1, 5, 4, 7], [0.2, 1, 0.5, 3], [0.25, 2, 1, 3], [0.14, 0.33, 0.33, 1]]
+
+    def test_key(self):
+        key = Cache.AhpCache.key(self.matrix)
+        # o tipo (int/float) não muda a chave
+        self.assertEqual(key, Cache.AhpCache.key(
+            [[float(v) for v in row] for row in self.matrix]))
+        self.assertNotEqual(key, Cache.AhpCache.key(self.matrix, roundp=2))
+        self.assertNotEqual(
+            key, Cache.AhpCache.key(self.matrix, method=Ahp.EIGENVECTOR))
+        self.assertNotEqual(key, Cache.AhpCache.key(self.matrix, tol=1e-3))
+
+        changed = [list(row) for row in self.matrix]
+        changed[0][1] = 3
+        self.assertNotEqual(key, Cache.AhpCache.key(changed))
+
+    def test_calculate(self):
+        cache = Cache.AhpCache()
+        expected = Ahp.calculate(self.matrix)
+        self.assertEqual(expected, cache.calculate(self.matrix))
+
+        # o resultado retornado pode ser alterado
+        cr, priority = cache.calculate(self.matrix)
+        priority[0] = 0
+        self.assertEqual(expected, cache.calculate(self.matrix))
+
+        self.assertEqual(
+            Ahp.calculate(self.matrix, method=Ahp.EIGENVECTOR),
+            cache.calculate(self.matrix, method=Ahp.EIGENVECTOR))
+        self.assertEqual((1, []), cache.calculate([[1, 3], [0.33, 1]]))
+        self.assertEqual(Cache.CacheInfo(2, 3, Cache.DEFAULT_MAXSIZE, 3), cache.info())
+
+        cache.clear()
+        self.assertEqual(Cache.CacheInfo(0, 0, Cache.DEFAULT_MAXSIZE, 0), cache.info())
+
+    def test_calculate_batch(self):
+        cache = Cache.AhpCache()
+        stack = random_matrices(20, 4, 0).round(2).tolist()
+        cache.calculate(stack[0])
+
+        results = cache.calculate_batch(stack)
+        self.assertListEqual([Ahp.calculate(m) for m in stack], results)
+        self.assertEqual(Cache.CacheInfo(1, 20, Cache.DEFAULT_MAXSIZE, 20), cache.info())
+
+        # os resultados do lote são usados por "calculate" (com as mesmas chaves)
+        for m in stack:
+            self.assertEqual(Ahp.calculate(m), cache.calculate(m))
+        self.assertEqual(21, cache.info().hits)
+        self.assertListEqual(results, cache.calculate_batch(stack))
+        self.assertEqual(41, cache.info().hits)
+
+        self.assertListEqual(
+            [(1, [])]*2, cache.calculate_batch([[[1, 3], [0.33, 1]]]*2))
+        # resultados inválidos não são guardados
+        cr, priority = cache.calculate_batch([[[0, 1, 1], [0, 1, 1], [0, 1, 1]]])[0]
+        self.assertNotEqual(cr, cr)
+        self.assertEqual(21, cache.info().currsize)
+
+    def test_lru(self):
+        cache = Cache.AhpCache(maxsize=2)
+        a, b, c = random_matrices(3, 4, 0).tolist()
+        cache.calculate(a)
+        cache.calculate(b)
+        cache.calculate(a)  # "b" passa a ser o mais antigo
+        cache.calculate(c)
+        self.assertEqual(2, cache.info().currsize)
+
+        cache.calculate(a)
+        self.assertEqual(2, cache.info().hits)
+        cache.calculate(b)
+        self.assertEqual(4, cache.info().misses)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as folder:
+            filepath = path.join(folder, 'cache.json')
+            stack = random_matrices(10, 5, 0).tolist()
+
+            cache = Cache.AhpCache(path=filepath)
+            expected = [cache.calculate(m) for m in stack]
+            self.assertEqual(filepath, cache.save())
+
+            other = Cache.AhpCache(path=filepath)
+            self.assertEqual(10, other.info().currsize)
+            self.assertListEqual(expected, [other.calculate(m) for m in stack])
+            self.assertEqual(10, other.info().hits)
+
+            # apenas os mais recentes cabem
+            self.assertEqual(3, Cache.AhpCache(maxsize=3, path=filepath).info().currsize)
+
+            # um arquivo inválido é ignorado
+            with open(filepath, 'w') as f:
+                json.dump({'version': 'other', 'results': []}, f)
+            self.assertEqual(0, Cache.AhpCache(path=filepath).info().currsize)
+
+    def test_default(self):
+        Cache.default.clear()
+        Cache.calculate(self.matrix)
+        Cache.calculate(self.matrix)
+        self.assertEqual(1, Cache.default.info().hits)
+        self.assertEqual(1, Cache.default.info().misses)
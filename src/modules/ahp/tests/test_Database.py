@@ -115,6 +115,52 @@ class TestAhpForm(unittest.TestCase):
         self.ahpConn.insert(self.data_2)
         self.assertEqual(2, len(self.ahpConn.getAll()))
 
+    def test_iterByDict(self):
+        from types import GeneratorType
+        self.ahpConn.insert(self.data_1)
+        self.ahpConn.insert(self.data_2)
+
+        result = self.ahpConn.iterByDict(
+            {'date': 'test#1'}, projection=Database.MATRICES_PROJECTION, batch_size=1)
+        self.assertIsInstance(result, GeneratorType)
+        result = list(result)
+        self.assertEqual(1, len(result))
+        self.assertEqual('Usuário Tests#1', result[0].getName())
+        self.assertIsNone(result[0].getEmail())
+        self.assertListEqual(self.data_1['matrices']['q2'], result[0].getMatrixQ2().tolist())
+
+        result = list(self.ahpConn.iterByDict({}, projection=['matrices.q15']))
+        self.assertListEqual(
+            [{'q15': 5.0}, {'q15': 5.0}], [r.getMatrices() for r in result])
+
+    def test_iterByType(self):
+        self.ahpConn.insert(self.data_1)
+        self.ahpConn.insert(self.data_2)
+        result = list(self.ahpConn.iterByType(Database.FormDataType.TEACHER, batch_size=1))
+        self.assertListEqual(['Usuário Tests#2'], [r.getName() for r in result])
+        self.assertEqual(
+            [r.toDict() for r in self.ahpConn.findByType(Database.FormDataType.TEACHER)],
+            [r.toDict() for r in result])
+
+        # o tipo é projetado por MATRICES_PROJECTION (usado por getType)
+        result = list(self.ahpConn.iterByType(
+            Database.FormDataType.TEACHER, projection=Database.MATRICES_PROJECTION))
+        self.assertEqual(Database.FormDataType.TEACHER, result[0].getType())
+        result = list(self.ahpConn.iterByType(
+            Database.FormDataType.TEACHER, projection=['matrices']))
+        with self.assertRaises(ValueError):
+            result[0].getType()
+
+    def test_iterAll(self):
+        self.ahpConn.insert(self.data_1)
+        self.ahpConn.insert(self.data_2)
+        result = self.ahpConn.iterAll(projection={'matrices': 0})
+        self.assertEqual({}, next(result).getMatrices())
+        self.assertEqual(1, len(list(result)))
+        self.assertEqual(
+            [r.toDict() for r in self.ahpConn.getAll()],
+            [r.toDict() for r in self.ahpConn.iterAll()])
+
     def test_insert(self):
         self.ahpConn.insert(self.data_1)
         self.ahpConn.insert(self.data_2)
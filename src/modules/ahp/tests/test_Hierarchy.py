@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import unittest
+from modules.ahp import Ahp, Hierarchy
+import numpy as np
+
+
+def random_priorities(seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    priorities = {}
+    for section, elements in Hierarchy.TREE.items():
+        v = rng.random(len(elements))
+        priorities[section] = (v / v.sum()).tolist()
+    priorities['q15'] = priorities['q15'][0]
+    return priorities
+
+
+class TestHierarchy(unittest.TestCase):
+    def setUp(self):
+        self.views = [random_priorities(seed) for seed in range(3)]
+
+    def test_compose(self):
+        hierarchy = Hierarchy.DEFAULT
+        self.assertTupleEqual(Ahp.SECTIONS_LAYOUT.competences, hierarchy.competences)
+
+        p = self.views[0]
+        weights = Hierarchy.compose(p)
+        self.assertTupleEqual((len(hierarchy.competences),), weights.shape)
+        self.assertAlmostEqual(1.0, weights.sum())
+
+        result = hierarchy.layout.to_dict(weights)
+        self.assertAlmostEqual(p['root'][0] * p['q1'][1] * p['q12'][2], result['PAA'])
+        self.assertAlmostEqual(
+            p['root'][0] * p['q1'][4] * (1 - p['q15']),
+            result[Ahp.Mapping.COMPETENCES_MATRIX_Q15[1]])
+        self.assertAlmostEqual(
+            p['root'][0] * p['q1'][5], result[Ahp.Mapping.COMPETENCES_MATRIX_Q1[2]])
+        self.assertAlmostEqual(
+            p['root'][2] * p['q3'][1], result[Ahp.Mapping.COMPETENCES_MATRIX_Q3[1]])
+
+        sections = hierarchy.section_weights(p)
+        self.assertAlmostEqual(p['root'][0] * p['q1'][2], sections['q13'])
+
+    def test_batch(self):
+        views = Hierarchy.stack(self.views)
+        self.assertTupleEqual((3, 2), views['q15'].shape)
+
+        weights = Hierarchy.compose(views)
+        self.assertTupleEqual((3, len(Hierarchy.DEFAULT.competences)), weights.shape)
+        for i, view in enumerate(self.views):
+            np.testing.assert_allclose(Hierarchy.compose(view), weights[i])
+
+        # 2 visões (o escalar não pode ser confundido com um vetor)
+        np.testing.assert_allclose(
+            weights[:2], Hierarchy.compose(Hierarchy.stack(self.views[:2])))
+
+        # uma seção compartilhada por todas as visões
+        views['root'] = views['root'][0]
+        np.testing.assert_allclose(weights[0], Hierarchy.compose(views)[0])
+
+        # o escalar de cada visão (sem o [x, 1-x])
+        scalars = {**Hierarchy.stack(self.views), 'q15': [view['q15'] for view in self.views]}
+        np.testing.assert_allclose(weights, Hierarchy.compose(scalars))
+        # uma visão, com [x, 1-x]
+        single = {**self.views[0], 'q15': [self.views[0]['q15'], 1 - self.views[0]['q15']]}
+        np.testing.assert_allclose(weights[0], Hierarchy.compose(single))
+
+    def test_ambiguous_scalar(self):
+        # [0.3, 0.6] são os escalares de 2 visões, ou o [x, 1-x] de uma?
+        views = Hierarchy.stack(self.views[:2])
+        with self.assertRaises(ValueError):
+            Hierarchy.compose({**views, 'q15': [0.3, 0.6]})
+        with self.assertRaises(ValueError):
+            Hierarchy.DEFAULT.section_weights({**views, 'q15': [0.3, 0.7]})
+
+    def test_invalid(self):
+        p = self.views[0]
+        with self.assertRaises(ValueError):
+            Hierarchy.compose({k: v for k, v in p.items() if k != 'q2'})
+        with self.assertRaises(ValueError):
+            Hierarchy.compose({**p, 'q1': p['q1'][:3]})
+
+        with self.assertRaises(ValueError):
+            Hierarchy.Hierarchy({'a': ['b', 'x'], 'b': ['y'], 'c': ['z']})
+        with self.assertRaises(ValueError):
+            Hierarchy.Hierarchy({'a': ['b', 'c'], 'b': ['c'], 'c': ['z']})
+        with self.assertRaises(ValueError):
+            Hierarchy.Hierarchy({'a': ['b', 'x'], 'b': ['x']})
+
+    def test_custom(self):
+        hierarchy = Hierarchy.Hierarchy({'a': ['x', 'b'], 'b': ['y', 'z']})
+        self.assertTupleEqual(('x', 'y', 'z'), hierarchy.competences)
+        np.testing.assert_allclose(
+            [[0.5, 0.25, 0.25], [0.2, 0.0, 0.8]],
+            hierarchy.compose({'a': [[0.5, 0.5], [0.2, 0.8]], 'b': [[0.5, 0.5], [0, 1]]}))
+
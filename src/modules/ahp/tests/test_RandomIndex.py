@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import unittest
+from modules.ahp import Ahp, RandomIndex
+from os import path
+import numpy as np
+import json
+import tempfile
+
+
+class TestRandomIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = path.join(self.tmp.name, 'ri', 'random_index.json')
+
+        # não usa o arquivo do usuário
+        self.default = RandomIndex.default
+        RandomIndex.default = RandomIndex.RandomIndexTable(samples=500)
+
+    def tearDown(self):
+        RandomIndex.default = self.default
+        self.tmp.cleanup()
+
+    def test_random_matrices(self):
+        stack = RandomIndex.random_matrices(50, 6, np.random.default_rng(0))
+        self.assertTupleEqual((50, 6, 6), stack.shape)
+        np.testing.assert_array_equal(np.ones((50, 6)), np.diagonal(stack, axis1=1, axis2=2))
+        np.testing.assert_allclose(stack, 1/np.swapaxes(stack, 1, 2))
+        self.assertTrue(np.all(np.isin(stack, RandomIndex.SCALE)))
+
+        # a semente e outra escala
+        np.testing.assert_array_equal(stack, RandomIndex.random_matrices(50, 6, 0))
+        scale = [1/3, 1, 3]
+        stack = RandomIndex.random_matrices(50, 6, 0, scale=scale)
+        self.assertTrue(np.all(np.isin(stack, scale)))
+        self.assertSetEqual(set(scale), set(np.unique(stack).tolist()))
+
+    def test_estimate(self):
+        # próximos aos valores calculados por Saaty
+        for length in range(3, 11):
+            self.assertAlmostEqual(
+                Ahp.random_index(length),
+                RandomIndex.estimate(length, samples=3000, seed=length),
+                delta=0.07)
+
+        self.assertEqual(
+            RandomIndex.estimate(5, samples=1000, seed=1),
+            RandomIndex.estimate(5, samples=1000, seed=1, batch_size=300))
+
+        with self.assertRaises(ValueError):
+            RandomIndex.estimate(2)
+        with self.assertRaises(ValueError):
+            RandomIndex.estimate(5, samples=0)
+
+    def test_table(self):
+        table = RandomIndex.RandomIndexTable(path=self.path, samples=500)
+        ri = table.get(16)
+        self.assertEqual(RandomIndex.estimate(16, samples=500, seed=16), ri)
+        self.assertTrue(path.isfile(self.path))
+
+        # lido do disco
+        other = RandomIndex.RandomIndexTable(path=self.path, samples=500)
+        self.assertEqual(1, len(other._values))
+        self.assertEqual(ri, other.get(16))
+        self.assertNotEqual(ri, other.get(16, samples=400))
+
+        with open(self.path, 'w') as f:
+            json.dump({'version': 'other', 'values': {}}, f)
+        with self.assertLogs(RandomIndex.logger, 'WARNING'):
+            self.assertEqual(0, RandomIndex.RandomIndexTable(path=self.path).load())
+
+    def test_large_matrices(self):
+        self.assertEqual(1.59, Ahp.random_index(15))
+        self.assertEqual(RandomIndex.default.get(20), Ahp.random_index(20))
+
+        # matriz consistente (20x20)
+        w = np.arange(1, 21, dtype=np.float64)
+        matrix = w[:, np.newaxis] / w[np.newaxis, :]
+        cr, priority = Ahp.calculate(matrix.tolist())
+        self.assertAlmostEqual(0, cr, places=3)
+        np.testing.assert_allclose(w / w.sum(), priority, atol=1e-4)
+
+        stack = np.stack([matrix, RandomIndex.random_matrices(1, 20)[0]])
+        cr, _ = Ahp.calculate_batch(stack, method=Ahp.EIGENVECTOR)
+        self.assertAlmostEqual(0, cr[0], places=6)
+        self.assertGreater(cr[1], 0.1)
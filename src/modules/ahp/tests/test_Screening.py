@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import unittest
+from modules.ahp import Ahp, Screening
+from modules.ahp.Types import FormDataType
+from modules.ahp.tests.test_Aggregator import consistent_forms
+from modules.test.test_util import random_forms
+import numpy as np
+
+
+class TestScreening(unittest.TestCase):
+    def setUp(self):
+        # respostas consistentes (mercado) e aleatórias (professores, quase sempre inconsistentes)
+        self.forms = consistent_forms(15, FormDataType.MARKET)
+        for form in random_forms(10, seed=1):
+            form.setType(FormDataType.TEACHER)
+            self.forms.append(form)
+
+    def test_screen(self):
+        result = Screening.screen(self.forms)
+        self.assertListEqual(Ahp.Mapping.MATRICES_IDENTIFIERS, result.matrices)
+        self.assertTupleEqual((25, 6), result.mask.shape)
+
+        for i, form in enumerate(self.forms):
+            self.assertEqual(form.getType().value, result.types[i])
+            for j, k in enumerate(result.matrices):
+                v = form.getMatrices()[k]
+                if v[0][0] == 0:
+                    self.assertTrue(np.isnan(result.cr[i, j]))
+                    self.assertFalse(result.mask[i, j])
+                    continue
+                cr, _ = Ahp.calculate(v)
+                self.assertEqual(cr, result.cr[i, j])
+                self.assertEqual(cr < 0.1, result.mask[i, j])
+
+    def test_counts_and_stacks(self):
+        result = Screening.screen(self.forms)
+        for t, total in (('market', 15), ('teacher', 10)):
+            do_tipo = result.types == t
+            for j, k in enumerate(result.matrices):
+                counts = result.counts.loc[(t, k)]
+                self.assertEqual(total, counts['total'])
+                self.assertEqual(
+                    total, counts['valid'] + counts['invalid'] + counts['unfilled'])
+                self.assertEqual(
+                    (do_tipo & result.mask[:, j]).sum(), counts['valid'])
+
+                stack = result.stacks[t][k]
+                self.assertEqual(counts['valid'], stack.shape[0])
+                validos = [f.getMatrices()[k] for f, ok in zip(self.forms, do_tipo & result.mask[:, j]) if ok]
+                np.testing.assert_array_equal(
+                    np.array(validos).reshape(stack.shape), stack)
+
+        self.assertGreater(result.counts.loc['market', 'valid'].sum(), 0)
+
+    def test_threshold(self):
+        result = Screening.screen(self.forms, threshold=np.inf)
+        self.assertEqual(
+            result.counts['valid'].sum(), (~np.isnan(result.cr)).sum())
+        self.assertEqual(0, result.counts['invalid'].sum())
+
+    def test_empty(self):
+        result = Screening.screen([])
+        self.assertListEqual([], result.matrices)
+        self.assertTupleEqual((0, 0), result.mask.shape)
+        self.assertEqual(0, len(result.counts))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import unittest
+from modules.ahp import Snapshot
+from modules.ahp.Types import FormData, FormDataType
+from modules.test.test_util import random_forms
+from bson.objectid import ObjectId
+from os import path
+import numpy as np
+import tempfile
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = path.join(self.tmp.name, 'snapshot', 'ahp.npz')
+
+        self.forms = []
+        for i, form in enumerate(random_forms(30, seed=4)):
+            document = {**form.toDict(), 'email': f'{i}@email.com', 'date': '03-03-2021'}
+            document['_id'] = ObjectId() if i % 2 else f'id-{i}'
+            if i % 3 == 0:
+                document['type'] = FormDataType.TEACHER.value
+            self.forms.append(FormData(document))
+        # uma resposta sem o q13 (e sem id)
+        document = self.forms[-1].toDict()
+        del document['matrices']['q13'], document['_id']
+        self.forms[-1] = FormData(document)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_export_load(self):
+        self.assertEqual(self.path, Snapshot.export(self.forms, self.path))
+
+        for mmap in (True, False):
+            snapshot = Snapshot.load(self.path, mmap=mmap)
+            self.assertEqual(len(self.forms), len(snapshot))
+            result = snapshot.getAll()
+            for expected, form in zip(self.forms, result):
+                self.assertDictEqual(expected.toDict(), form.toDict())
+            self.assertIsInstance(result[1].getId(), ObjectId)
+            self.assertIsNone(result[-1].getId())
+            self.assertNotIn('q13', result[-1].getMatrices())
+
+        # as colunas são mapeadas (somente leitura)
+        snapshot = Snapshot.load(self.path)
+        self.assertIsInstance(snapshot.columns['matrix/q1'], np.memmap)
+        with self.assertRaises(ValueError):
+            snapshot.getAll()[0].getMatrixQ1()[0][0] = 1
+
+    def test_none_fields(self):
+        from datetime import datetime
+        date = datetime(2021, 3, 3, 12, 30)
+        document = {**self.forms[0].toDict(), 'name': None, 'email': None, 'date': date}
+        self.forms[0] = FormData(document)
+        # um nome vazio não é confundido com None
+        self.forms[1].setName('')
+
+        for mmap in (True, False):
+            result = Snapshot.load(Snapshot.export(self.forms, self.path), mmap=mmap).getAll()
+            self.assertIsNone(result[0].getName())
+            self.assertIsNone(result[0].getEmail())
+            # as datas são guardadas como texto
+            self.assertEqual(str(date), result[0].getDate())
+            self.assertEqual('', result[1].getName())
+            self.assertDictEqual(
+                {**document, 'date': str(date)}, result[0].toDict())
+
+    def test_stack(self):
+        snapshot = Snapshot.load(Snapshot.export(self.forms, self.path))
+        teachers = [f for f in self.forms if f.getType() == FormDataType.TEACHER]
+
+        stack, has = snapshot.stack('q2', FormDataType.TEACHER)
+        np.testing.assert_array_equal(FormData.to_stack(teachers, 'q2'), stack)
+        self.assertTrue(has.all())
+
+        stack, has = snapshot.stack('q13')
+        self.assertTupleEqual((len(self.forms), 6, 6), stack.shape)
+        self.assertFalse(has[-1])
+        np.testing.assert_array_equal(np.zeros((6, 6)), stack[-1])
+
+        values, _ = snapshot.stack('q15')
+        np.testing.assert_array_equal(FormData.to_stack(self.forms, 'q15'), values)
+
+        self.assertListEqual(
+            [f.getName() for f in teachers],
+            [f.getName() for f in snapshot.findByType(FormDataType.TEACHER)])
+        with self.assertRaises(KeyError):
+            snapshot.stack('q4')
+
+    def test_invalid(self):
+        self.forms[0].setMatrixQ2(np.ones((4, 4)))
+        with self.assertRaises(ValueError):
+            Snapshot.export(self.forms, self.path)
+
+        other = path.join(self.tmp.name, 'other.npz')
+        np.savez(other, version=np.array('other'), types=np.array(['market']))
+        with self.assertRaises(ValueError):
+            Snapshot.load(other)
+
+    def test_compressed_and_empty(self):
+        Snapshot.export(self.forms, self.path)
+        with np.load(self.path) as data:
+            np.savez_compressed(self.path, **{k: data[k] for k in data.files})
+        snapshot = Snapshot.load(self.path)
+        self.assertDictEqual(self.forms[3].toDict(), snapshot.getAll()[3].toDict())
+
+        snapshot = Snapshot.load(Snapshot.export([], self.path))
+        self.assertEqual(0, len(snapshot))
+        self.assertListEqual([], snapshot.getAll())
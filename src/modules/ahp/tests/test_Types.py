@@ -1,48 +1,150 @@
 # -*- coding: utf-8 -*-
 import unittest
 from modules.ahp import Types
+import numpy as np
+import pickle
 
 
 class TestFormData(unittest.TestCase):
+    def setUp(self):
+        self.matrix = [[1, 3, 5], [0.33, 1, 3], [0.2, 0.33, 1]]
+        self.document = {
+            '_id': 'e2b1c8a0',
+            'date': '03-03-2021',
+            'email': 'test@email.com',
+            'matrices': {
+                'q12': self.matrix,
+                'q15': 5,
+                'root': [[1, 1, 3], [1, 1, 3], [0.33, 0.33, 1]]},
+            'name': 'Joãozinho',
+            'type': 'teacher',
+            'extra': [1, 2]}
+
     def test_email(self):
         test = Types.FormData().setEmail("test@email.com")
         self.assertEqual("test@email.com", test.getEmail())
 
     def test_type(self):
-        ...
+        test = Types.FormData()
+        self.assertEqual(Types.FormDataType.MARKET, test.getType())
+        test.setType(Types.FormDataType.TEACHER)
+        self.assertEqual(Types.FormDataType.TEACHER, test.getType())
 
     def test_date(self):
-        ...
+        test = Types.FormData().setDate("03-03-2021")
+        self.assertEqual("03-03-2021", test.getDate())
 
     def test_matrix_root(self):
-        ...
+        test = Types.FormData().setMatrixRoot(self.matrix)
+        np.testing.assert_array_equal(self.matrix, test.getMatrixRoot())
+        self.assertEqual(np.float64, test.getMatrixRoot().dtype)
+        self.assertTrue(test.getMatrixRoot().flags['C_CONTIGUOUS'])
 
     def test_matrix_q1(self):
-        ...
+        matrix = np.ones((6, 6))
+        test = Types.FormData().setMatrixQ1(matrix)
+        np.testing.assert_array_equal(matrix, test.getMatrixQ1())
 
     def test_matrix_q1sec2(self):
-        ...
+        test = Types.FormData().setMatrixQ1sec2(self.matrix)
+        np.testing.assert_array_equal(self.matrix, test.getMatrixQ1sec2())
 
     def test_matrix_q1sec3(self):
-        ...
+        # não contígua (transposta)
+        matrix = np.arange(36, dtype=np.float64).reshape(6, 6).T
+        test = Types.FormData().setMatrixQ1sec3(matrix)
+        np.testing.assert_array_equal(matrix, test.getMatrixQ1sec3())
+        self.assertTrue(test.getMatrixQ1sec3().flags['C_CONTIGUOUS'])
 
     def test_matrix_q1sec5(self):
-        ...
+        test = Types.FormData()
+        self.assertEqual(0, test.getMatrixQ1sec5())
+        test.setMatrixQ1sec5(5)
+        self.assertIs(float, type(test.getMatrixQ1sec5()))
+        self.assertEqual(5.0, test.getMatrixQ1sec5())
 
     def test_matrix_q2(self):
-        ...
+        matrix = np.ones((5, 5))
+        test = Types.FormData().setMatrixQ2(matrix)
+        np.testing.assert_array_equal(matrix, test.getMatrixQ2())
 
     def test_matrix_q3(self):
-        ...
+        matrix = np.ones((4, 4)).tolist()
+        test = Types.FormData().setMatrixQ3(matrix)
+        np.testing.assert_array_equal(matrix, test.getMatrixQ3())
+
+    def test_matrices(self):
+        test = Types.FormData(self.document)
+        self.assertListEqual(['q12', 'q15', 'root'], list(test.getMatrices()))
+        self.assertIs(test.getMatrixQ1sec2(), test.getMatrices()['q12'])
+
+        # o documento não é alterado (nem compartilhado)
+        test.getMatrixQ1sec2()[0][0] = 0
+        self.assertEqual(1, self.matrix[0][0])
+
+        # o formulário vazio possui todas as matrizes, não preenchidas
+        empty = Types.FormData().getMatrices()
+        self.assertSetEqual(
+            {*Types.MATRICES_SHAPE, Types.SCALAR}, set(empty))
+        for k, n in Types.MATRICES_SHAPE.items():
+            np.testing.assert_array_equal(np.zeros((n, n)), empty[k])
 
     def test_parse(self):
-        ...
+        test = Types.FormData(self.document)
+        result = test.parse()
+        self.assertEqual('e2b1c8a0', result['id'])
+        self.assertNotIn('_id', result)
+        self.assertEqual(self.matrix, result['matrices']['q12'])
+        self.assertEqual([1, 2], result['extra'])
+        # não é destrutivo
+        self.assertEqual(result, test.parse())
+
+        with self.assertRaises(KeyError):
+            Types.FormData().parse()
 
     def test_repr(self):
-        ...
+        test = Types.FormData(self.document)
+        self.assertIn("'name': 'Joãozinho'", repr(test))
+        self.assertIn("'q15': 5.0", repr(test))
 
     def test_pretty(self):
-        ...
+        test = Types.FormData(self.document)
+        self.assertIn("'id': 'e2b1c8a0'", test.pretty())
+        self.assertNotIn("'_id'", test.pretty())
+        self.assertIn("'name': 'SomeName'", Types.FormData().pretty())
 
     def test_toDict(self):
-        ...
+        test = Types.FormData(self.document)
+        result = test.toDict()
+        self.assertDictEqual({**self.document, 'matrices': {
+            **self.document['matrices'], 'q15': 5.0}}, result)
+        self.assertIs(list, type(result['matrices']['root']))
+
+        # é um novo dicionário
+        result['matrices']['q12'][0][0] = 0
+        self.assertEqual(1, test.getMatrixQ1sec2()[0][0])
+        self.assertDictEqual(test.toDict(), test.getDict())
+
+        self.assertDictEqual(test.toDict(), Types.FormData(test.toDict()).toDict())
+        self.assertDictEqual(
+            test.toDict(), pickle.loads(pickle.dumps(test)).toDict())
+
+    def test_to_stack(self):
+        a = Types.FormData(self.document)
+        b = Types.FormData(self.document).setMatrixQ1sec5(1/9)
+
+        stack = Types.FormData.to_stack([a, b], 'q12')
+        self.assertTupleEqual((2, 3, 3), stack.shape)
+        np.testing.assert_array_equal(self.matrix, stack[1])
+        np.testing.assert_array_equal(
+            [5, 1/9], Types.FormData.to_stack([a, b], 'q15'))
+        self.assertTupleEqual((0, 6, 6), Types.FormData.to_stack([], 'q1').shape)
+
+        with self.assertRaises(KeyError):
+            Types.FormData.to_stack([a, b], 'q2')
+        with self.assertRaises(ValueError):
+            Types.FormData.to_stack([a.setMatrixQ1sec2(np.ones((4, 4))), b], 'q12')
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            Types.FormData().other = 1
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import unittest
+from modules.ahp import Validation
+from modules.ahp.Validation import Error
+from modules.ahp.Types import FormData, FormDataType
+from modules.ahp.tests.test_Aggregator import consistent_forms
+import numpy as np
+
+
+class TestValidation(unittest.TestCase):
+    def setUp(self):
+        self.forms = consistent_forms(6, FormDataType.MARKET)
+        self.q1 = self.forms[0].getMatrixQ1().copy()
+
+    def test_valid(self):
+        result = Validation.validate(self.forms)
+        self.assertListEqual(
+            ['q1', 'q12', 'q13', 'q2', 'q3', 'root', 'q15'], result.matrices)
+        self.assertTupleEqual((6, 7), result.detail.shape)
+        self.assertTrue(result.valid.all())
+        # os documentos (antes de criar os FormData) também são aceitos
+        np.testing.assert_array_equal(
+            result.errors, Validation.validate([f.toDict() for f in self.forms]).errors)
+
+    def test_errors(self):
+        q1 = self.q1.copy()
+        q1[0, 1] *= 2  # não é recíproca
+        self.forms[0].setMatrixQ1(q1)
+        self.forms[1].setMatrixQ1(self.q1[:5, :5])
+        self.forms[2].setMatrixQ1(np.zeros((6, 6)))
+        q1 = self.q1.copy()
+        q1[2, 2] = 2
+        self.forms[3].setMatrixQ1(q1)
+        q1 = self.q1.copy()
+        q1[0, 1], q1[1, 0] = 20, 1/20
+        self.forms[4].setMatrixQ1(q1).setMatrixQ1sec5(12)
+
+        document = self.forms[5].toDict()
+        del document['matrices']['q2']
+        document['matrices']['q3'] = [[1, 2], [0.5]]
+        documents = [f.toDict() for f in self.forms[:5]] + [document]
+
+        result = Validation.validate(documents)
+        j = result.matrices.index('q1')
+        self.assertListEqual(
+            [Error.RECIPROCITY, Error.SHAPE, Error.UNFILLED, Error.DIAGONAL, Error.RANGE,
+             Error.NONE], result.detail[:, j].tolist())
+        self.assertEqual(Error.RANGE, result.detail[4, result.matrices.index('q15')])
+        self.assertEqual(Error.MISSING | Error.SHAPE, result.errors[5] & Validation.INVALID)
+        self.assertListEqual(
+            [False, False, True, False, False, False], result.valid.tolist())
+
+        # sem o q15 não é um erro, e o q15 igual a 0 não foi preenchido
+        del documents[0]['matrices']['q15']
+        documents[1]['matrices']['q15'] = 0
+        result = Validation.validate(documents)
+        j = result.matrices.index('q15')
+        self.assertListEqual([Error.NONE, Error.UNFILLED], result.detail[:2, j].tolist())
+
+    def test_validate_stack(self):
+        validator = Validation.Validator(shapes={'a': 3}, scale=(1/9, 9), rtol=0.01)
+        stack = np.stack([
+            np.ones((3, 3)),
+            [[1, 3.03, 1], [0.33, 1, 1], [1, 1, 1]],  # recíproca com arredondamento
+            [[1, 3, 1], [0.5, 1, 1], [1, 1, 1]],
+            [[1, np.nan, 1], [1, 1, 1], [1, 1, 1]],
+        ])
+        self.assertListEqual(
+            [Error.NONE, Error.NONE, Error.RECIPROCITY, Error.RANGE | Error.RECIPROCITY],
+            validator.validate_stack('a', stack).tolist())
+        self.assertListEqual(
+            [Error.SHAPE]*2, validator.validate_stack('a', np.ones((2, 4, 4))).tolist())
+        self.assertListEqual(
+            [Error.NONE, Error.UNFILLED, Error.RANGE],
+            validator.validate_stack('q15', [1/9, 0, 10]).tolist())
+        self.assertTupleEqual((0,), validator.validate([]).errors.shape)
+        with self.assertRaises(KeyError):
+            validator.validate_stack('b', stack)
@@ -0,0 +1,746 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains a vectorized builder for the competencies graphs.
+
+Instead of doing scalar lookups (``out.loc[i][competencia]``) for every class, period and
+competence, it turns the skillset dataframe into a dense matrix (classes x competences) only once.
+After that, the period sums, the heirs of each period and the weights are calculated with array
+operations.
+
+It contains:
+
+- A class that holds the dense skillset matrix, :class:`SkillsetMatrix`
+- A function to create the competencies graphs, :meth:`generate_graphs`
+- A function to create the competencies graphs sharing its nodes, :meth:`generate_graph_set`
+- A mapping that creates each competency graph only when it's needed, :class:`LazyGraphs`
+
+The competences are independent, so they can also be created in parallel (see the `workers`\
+argument of :meth:`generate_graphs`). The skillset matrix is sent to the workers only once,\
+through a shared memory block.
+
+Note
+----
+The graphs generated here have the same edges (and weights) of the ones created by
+:meth:`modules.grid.Competence._generate_competency_graphs`.
+"""
+
+# imports
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Final, Iterator, List, Mapping, Optional, Tuple, Union
+from networkx.classes.digraph import DiGraph
+from pandas.core.frame import DataFrame
+import numpy as np
+import logging
+from .Period import PeriodIndex
+from .GraphSet import CompetenceGraphSet
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# Nó final, que recebe as arestas das últimas matérias de cada competência
+END_NODE: Final[str] = 'Fim/Formou'
+
+# An edge of a competence graph: (from, to, weight)
+Edge = Tuple[str, str, float]
+
+
+class SkillsetMatrix:
+    """
+    A dense representation of the skillset dataframe.
+    It maps each class (row) and each competence (column) to an integer index.
+
+    Args
+    ----
+    `out`:
+        A dataframe mapping columns (competency) to rows (classes).\
+            See :meth:`modules.Skillset.merge_data`
+
+    Example
+    -------
+    >>> from modules.grid.Builder import SkillsetMatrix
+    >>> matrix = SkillsetMatrix(out)
+    >>> matrix.values[matrix.index['ECOI04'], matrix.columns['PAA']]
+    0.087
+    """
+
+    def __init__(self, out: DataFrame) -> None:
+        # classes (rows) and competences (columns) in the same order of the dataframe
+        self._setup(
+            out.index.to_list(),  # type: ignore
+            out.columns.to_list(),  # type: ignore
+            np.ascontiguousarray(out.to_numpy(dtype=np.float64)))
+
+    @classmethod
+    def from_values(
+            cls,
+            subjects: List[str],
+            competences: List[str],
+            values: np.ndarray) -> 'SkillsetMatrix':
+        """
+        Create the matrix from its values, without a dataframe.
+
+        Args
+        ----
+        `subjects`:
+            The class acronym of each row
+        `competences`:
+            The competence of each column
+        `values`:
+            The dense matrix (classes x competences). It isn't copied when it's already\
+                a C-contiguous float64 array (e.g: a shared memory buffer).
+
+        Returns
+        -------
+        SkillsetMatrix
+            The equivalent matrix
+        """
+        matrix = cls.__new__(cls)
+        matrix._setup(
+            list(subjects),
+            list(competences),
+            np.ascontiguousarray(values, dtype=np.float64))
+        return matrix
+
+    def _setup(
+            self,
+            subjects: List[str],
+            competences: List[str],
+            values: np.ndarray) -> None:
+        self.subjects: List[str] = subjects
+        self.competences: List[str] = competences
+
+        # matriz densa (disciplinas x competências)
+        self.values: np.ndarray = values
+
+        # mapeia uma sigla/competência para a sua linha/coluna
+        self.index: Dict[str, int] = {
+            s: i for i, s in enumerate(self.subjects)}
+        self.columns: Dict[str, int] = {
+            c: i for i, c in enumerate(self.competences)}
+
+        # usado para fazer "fancy indexing" com as linhas
+        self._names: np.ndarray = np.array(self.subjects, dtype=object)
+
+        # primeira disciplina que possui 100% de alguma competência. Usada quando ...
+        # ... apenas um período possui uma determinada competência
+        self.unitary: Optional[str] = None
+        self.update_unitary()
+
+        logger.debug(
+            f'Skillset matrix created: {self.values.shape[0]} classes x {self.values.shape[1]} competences')
+
+    def update_unitary(self) -> Optional[str]:
+        """
+        Search (again) for the first class that has 100% of some competence.\
+            It must be called when :attr:`values` changes.
+
+        Returns
+        -------
+        Optional[str]
+            The class acronym (also stored in :attr:`unitary`), or None if there's no such class
+        """
+        unitary = np.flatnonzero((self.values == 1.0).any(axis=1))
+        self.unitary = self.subjects[unitary[0]] if unitary.size else None
+        return self.unitary
+
+    def rows(self, subjects: List[str]) -> np.ndarray:
+        """
+        Get the row index of each class acronym.
+
+        Args
+        ----
+        `subjects`:
+            A list of class acronyms
+
+        Returns
+        -------
+        np.ndarray
+            An array of integers, pointing to the rows of :attr:`values`
+
+        Raises
+        ------
+        `KeyError`:
+            If some class doesn't exist in the skillset dataframe
+        """
+        return np.array([self.index[s] for s in subjects], dtype=np.intp)
+
+    def names(self, rows: np.ndarray) -> List[str]:
+        """
+        Get the class acronym of each row.
+
+        Args
+        ----
+        `rows`:
+            An array of rows of :attr:`values`
+
+        Returns
+        -------
+        List[str]
+            The class acronyms
+        """
+        return self._names[rows].tolist()
+
+
+def _period_rows(matrix: SkillsetMatrix, index: PeriodIndex) -> List[np.ndarray]:
+    """
+    Get the rows (of `matrix`) of the classes in each period.
+
+    Args
+    ----
+    `matrix`:
+        The skillset matrix
+    `index`:
+        The classes of each period
+
+    Returns
+    -------
+    List[np.ndarray]
+        The element `i` contains the rows of the classes of the period `i+1`
+    """
+    return [matrix.rows(index[p]) for p in index]
+
+
+def _period_sums(matrix: SkillsetMatrix, rows: List[np.ndarray]) -> np.ndarray:
+    """
+    Sum the values of each competence in each period.
+
+    Args
+    ----
+    `matrix`:
+        The skillset matrix
+    `rows`:
+        The rows of each period. See :meth:`_period_rows`
+
+    Returns
+    -------
+    np.ndarray
+        A matrix (periods x competences)
+
+    Note
+    ----
+    It uses :func:`numpy.cumsum` (sequential sum), instead of :func:`numpy.sum` (pairwise sum), \
+        since that we need the same rounding of the scalar version.
+    """
+    sums = np.zeros((len(rows), matrix.values.shape[1]))
+    for p, r in enumerate(rows):
+        if r.size:
+            sums[p] = np.cumsum(matrix.values[r], axis=0)[-1]
+    return sums
+
+
+def _pair_edges(
+        matrix: SkillsetMatrix,
+        rows: List[np.ndarray],
+        sums: np.ndarray,
+        col: int,
+        current: int,
+        following: int,
+        isBFS: bool = False,
+        roundp: int = 4) -> Tuple[List[Edge], np.ndarray]:
+    """
+    Calculate the edges between two periods (that have a given competence).
+
+    Args
+    ----
+    `matrix`:
+        The skillset matrix
+    `rows`:
+        The rows of each period. See :meth:`_period_rows`
+    `sums`:
+        The sum of each period. See :meth:`_period_sums`
+    `col`:
+        The competence column (of `matrix`)
+    `current`:
+        The period where the edges start (index of `rows`)
+    `following`:
+        The next period that has this competence
+
+    Keyword Args
+    ------------
+    `isBFS`:
+        when settled, it will divide the weight by the number of vertices outcoming of the node.
+    `roundp`:
+        the number of decimal places to use
+
+    Returns
+    -------
+    Tuple[List[Edge], np.ndarray]
+        The edges and the rows of the heirs (classes of `following` that have this competence)
+    """
+    column: np.ndarray = matrix.values[:, col]
+    heirs: np.ndarray = rows[following][column[rows[following]] > 0]
+    if not heirs.size:
+        return [], heirs
+
+    sources: np.ndarray = rows[current][column[rows[current]] != 0]
+    weights: np.ndarray = np.round(column[sources] / sums[current, col], roundp)
+    if isBFS:
+        weights = np.round(weights / heirs.size, roundp)
+
+    # produto cartesiano (origem x herdeira), mantendo a ordem das origens
+    edges: List[Edge] = list(zip(
+        matrix.names(np.repeat(sources, heirs.size)),
+        matrix.names(np.tile(heirs, sources.size)),
+        np.repeat(weights, heirs.size).tolist()))
+    return edges, heirs
+
+
+def _end_edges(
+        matrix: SkillsetMatrix,
+        col: int,
+        last: np.ndarray,
+        roundp: int = 4) -> List[Edge]:
+    """
+    Calculate the edges that goes to :data:`END_NODE`.
+
+    Args
+    ----
+    `matrix`:
+        The skillset matrix
+    `col`:
+        The competence column (of `matrix`)
+    `last`:
+        The rows of the last heirs of this competence
+
+    Keyword Args
+    ------------
+    `roundp`:
+        the number of decimal places to use
+
+    Returns
+    -------
+    List[Edge]
+        The edges of the last heirs. If there's none, the edge of :attr:`SkillsetMatrix.unitary`\
+            (if it exists)
+    """
+    column: np.ndarray = matrix.values[:, col]
+    if last.size:
+        total = np.cumsum(column[last])[-1]
+        return list(zip(
+            matrix.names(last),
+            [END_NODE]*last.size,
+            np.round(column[last] / total, roundp).tolist()))
+    if matrix.unitary is not None:
+        return [(matrix.unitary, END_NODE, 1.0)]
+    return []
+
+
+def _competence_edges(
+        matrix: SkillsetMatrix,
+        rows: List[np.ndarray],
+        sums: np.ndarray,
+        competencia: str,
+        isBFS: bool = False,
+        roundp: int = 4) -> Tuple[List[Edge], List[Edge]]:
+    """
+    Calculate all the edges of a single competence.
+
+    Args
+    ----
+    `matrix`:
+        The skillset matrix
+    `rows`:
+        The rows of each period. See :meth:`_period_rows`
+    `sums`:
+        The sum of each period. See :meth:`_period_sums`
+    `competencia`:
+        The competence (column of `matrix`)
+
+    Keyword Args
+    ------------
+    `isBFS`:
+        when settled, it will divide the weight by the number of vertices outcoming of the node.
+    `roundp`:
+        the number of decimal places to use
+
+    Returns
+    -------
+    Tuple[List[Edge], List[Edge]]
+        The edges between classes and the edges that goes to :data:`END_NODE`
+    """
+    col: int = matrix.columns[competencia]
+
+    # períodos que possuem essa competência (em ordem)
+    nonzero: np.ndarray = np.flatnonzero(sums[:, col] != 0)
+
+    edges: List[Edge] = []
+    last: np.ndarray = np.empty(0, dtype=np.intp)
+
+    # liga as matérias de um período com as matérias do próximo período que ...
+    # ... possuir essa competência
+    for current, following in zip(nonzero[:-1], nonzero[1:]):
+        pair, heirs = _pair_edges(
+            matrix, rows, sums, col, current, following, isBFS=isBFS, roundp=roundp)
+        if heirs.size:
+            last = heirs
+            edges.extend(pair)
+
+    # as últimas matérias são ligadas ao nó final
+    return edges, _end_edges(matrix, col, last, roundp=roundp)
+
+
+# Estado de cada worker (criado em :func:`_init_worker`): a matriz, as linhas e os somatórios ...
+# ... de cada período, o modo e o arredondamento
+_worker: Optional[tuple] = None
+
+
+def _init_worker(
+        name: str,
+        shape: Tuple[int, int],
+        subjects: List[str],
+        competences: List[str],
+        rows: List[np.ndarray],
+        isBFS: bool,
+        roundp: int) -> None:
+    """
+    Attach the worker to the shared skillset matrix. It's called once for each worker.
+
+    Args
+    ----
+    `name`:
+        The name of the shared memory block
+    `shape`:
+        The shape of the matrix (classes x competences)
+    `subjects`:
+        The class acronym of each row
+    `competences`:
+        The competence of each column
+    `rows`:
+        The rows of each period. See :meth:`_period_rows`
+    `isBFS`:
+        when settled, it will divide the weight by the number of vertices outcoming of the node.
+    `roundp`:
+        the number of decimal places to use
+    """
+    global _worker
+    shm = SharedMemory(name=name)
+    values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    matrix = SkillsetMatrix.from_values(subjects, competences, values)
+    # a referência da memória compartilhada deve existir enquanto o worker existir
+    _worker = (shm, matrix, rows, _period_sums(matrix, rows), isBFS, roundp)
+
+
+def _worker_edges(competencia: str) -> Tuple[List[Edge], List[Edge]]:
+    """
+    Calculate the edges of a competence, in the worker. See :meth:`_competence_edges`
+    """
+    _, matrix, rows, sums, isBFS, roundp = _worker
+    return _competence_edges(
+        matrix, rows, sums, competencia, isBFS=isBFS, roundp=roundp)
+
+
+def _all_edges(
+        matrix: SkillsetMatrix,
+        rows: List[np.ndarray],
+        isBFS: bool = False,
+        roundp: int = 4,
+        workers: Optional[int] = None) -> List[Tuple[List[Edge], List[Edge]]]:
+    """
+    Calculate the edges of all competences (see :meth:`_competence_edges`).
+
+    Args
+    ----
+    `matrix`:
+        The skillset matrix
+    `rows`:
+        The rows of each period. See :meth:`_period_rows`
+
+    Keyword Args
+    ------------
+    `isBFS`:
+        when settled, it will divide the weight by the number of vertices outcoming of the node.
+    `roundp`:
+        the number of decimal places to use
+    `workers`:
+        The number of processes. If None (or 1), it runs in the current process.
+
+    Returns
+    -------
+    List[Tuple[List[Edge], List[Edge]]]
+        The edges of each competence, in the order of :attr:`SkillsetMatrix.competences`
+
+    Important
+    ---------
+    The workers run the same code of the serial version and the results are merged in the order\
+        of the competences, so the output is exactly the same.
+    """
+    if workers is None or workers <= 1 or len(matrix.competences) <= 1:
+        sums: np.ndarray = _period_sums(matrix, rows)
+        return [_competence_edges(matrix, rows, sums, c, isBFS=isBFS, roundp=roundp)
+                for c in matrix.competences]
+
+    logger.debug(f'Creating competency edges with {workers} workers')
+    # a matriz é copiada uma única vez, para uma memória compartilhada pelos workers
+    shm = SharedMemory(create=True, size=max(matrix.values.nbytes, 1))
+    shared: Optional[np.ndarray] = None
+    try:
+        shared = np.ndarray(
+            matrix.values.shape, dtype=np.float64, buffer=shm.buf)
+        shared[:] = matrix.values
+
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shm.name, matrix.values.shape, matrix.subjects,
+                          matrix.competences, rows, isBFS, roundp)) as executor:
+            # map mantém a ordem das competências
+            chunksize: int = max(1, len(matrix.competences) // (4*workers))
+            results = list(executor.map(
+                _worker_edges, matrix.competences, chunksize=chunksize))
+    finally:
+        # a memória só pode ser fechada quando não existir mais referências para ela
+        del shared
+        shm.close()
+        shm.unlink()
+
+    # usa os mesmos objetos (nomes) da versão serial, que são os da matriz
+    nomes: Dict[str, str] = {s: s for s in matrix.subjects}
+    nomes[END_NODE] = END_NODE
+    return [([(nomes[u], nomes[v], w) for u, v, w in edges],
+             [(nomes[u], nomes[v], w) for u, v, w in ends])
+            for edges, ends in results]
+
+
+def _competence_graph(
+        nodes: DiGraph,
+        edges: List[Edge],
+        ends: List[Edge],
+        periods: int) -> DiGraph:
+    """
+    Create the graph of a single competence.
+
+    Args
+    ----
+    `nodes`:
+        A DiGraph containing all nodes (classes). It will be copied.
+    `edges`:
+        The edges between classes. See :meth:`_competence_edges`
+    `ends`:
+        The edges that goes to :data:`END_NODE`
+    `periods`:
+        The number of periods of the grid
+
+    Returns
+    -------
+    DiGraph
+        The competence graph
+    """
+    grafo: DiGraph = nodes.copy()
+    grafo.add_weighted_edges_from(edges)
+    grafo.add_node(END_NODE, period=periods+1)
+    grafo.add_weighted_edges_from(ends)
+    return grafo
+
+
+class LazyGraphs(Mapping[str, DiGraph]):
+    """
+    A mapping of competency to graphs equivalent, where each graph is created (and kept) only\
+        when it's accessed for the first time.
+
+    Args
+    ----
+    `matrix`:
+        The skillset matrix
+    `nodes`:
+        A DiGraph containing all nodes (classes) already inserted
+
+    Keyword Args
+    ------------
+    `isBFS`:
+        when settled, it will divide the weight by the number of vertices outcoming of the node.
+    `roundp`:
+        the number of decimal places to use
+
+    Example
+    -------
+    >>> grafos = Builder.generate_graphs(out, nodes, lazy=True)
+    >>> list(grafos)  # doesn't create any graph
+    ['Raciocínio lógico', 'PAA', ...]
+    >>> grafos['PAA']  # creates only this one
+    <networkx.classes.digraph.DiGraph object at 0x7f...>
+
+    Note
+    ----
+    The competences keep the order of the eager version, and each graph is equal to the one\
+        created by :meth:`generate_graphs`. The `nodes` are copied when the mapping is created, so\
+            later changes on it don't change the graphs.
+    """
+
+    def __init__(
+            self,
+            matrix: SkillsetMatrix,
+            nodes: DiGraph,
+            isBFS: bool = False,
+            roundp: int = 4) -> None:
+        self._matrix: SkillsetMatrix = matrix
+        self._nodes: DiGraph = nodes.copy()
+        self._isBFS: bool = isBFS
+        self._roundp: int = roundp
+
+        # as linhas e os somatórios de cada período são compartilhados por todas as competências
+        self._rows: List[np.ndarray] = _period_rows(matrix, PeriodIndex(nodes))
+        self._sums: np.ndarray = _period_sums(matrix, self._rows)
+
+        self._graphs: Dict[str, DiGraph] = {}
+
+    def __getitem__(self, competencia: str) -> DiGraph:
+        if competencia not in self._graphs:
+            if competencia not in self._matrix.columns:
+                raise KeyError(competencia)
+            edges, ends = _competence_edges(
+                self._matrix, self._rows, self._sums, competencia,
+                isBFS=self._isBFS, roundp=self._roundp)
+            self._graphs[competencia] = _competence_graph(
+                self._nodes, edges, ends, len(self._rows))
+            logger.debug(f'--> {competencia}: {len(edges) + len(ends)} edges (lazy)')
+        return self._graphs[competencia]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._matrix.competences)
+
+    def __len__(self) -> int:
+        return len(self._matrix.competences)
+
+    def __contains__(self, competencia: object) -> bool:
+        return competencia in self._matrix.columns
+
+    @property
+    def built(self) -> List[str]:
+        """
+        The competences whose graphs were already created
+        """
+        return [c for c in self._matrix.competences if c in self._graphs]
+
+
+def generate_graphs(
+        out: Union[DataFrame, SkillsetMatrix],
+        nodes: DiGraph,
+        isBFS: bool = False,
+        roundp: int = 4,
+        lazy: bool = False,
+        workers: Optional[int] = None) -> Mapping[str, DiGraph]:
+    """
+    Create graphs for each *competence* (column of `out`).
+
+    Args
+    ----
+    `out`:
+        A dataframe mapping columns (competency) to rows (classes), or its :class:`SkillsetMatrix`
+    `nodes`:
+        A DiGraph containing all nodes (classes) already inserted
+
+    Keyword Args
+    ------------
+    `isBFS`:
+        when settled, it will divide the weight by the number of vertices outcoming of the node.
+    `roundp`:
+        the number of decimal places to use
+    `lazy`:
+        If settled, returns a :class:`LazyGraphs`, that only creates a graph when it's accessed
+    `workers`:
+        The number of processes used to create the graphs. If None, it runs in the current process.\
+            The output is the same of the serial version.
+
+    Returns
+    -------
+    Mapping[str, DiGraph]
+        A dictionary mapping competency to graphs equivalent (a :class:`LazyGraphs`, when `lazy`\
+            is settled)
+
+    Raises
+    ------
+    `ValueError`:
+        If both `lazy` and `workers` are settled, since the lazy graphs are created one at a time,\
+            in the current process
+
+    Example
+    -------
+    >>> from modules.grid import Builder
+    >>> grafos = Builder.generate_graphs(out, nodes, isBFS=True)
+
+    Tip
+    ---
+    If you will generate the graphs many times for the same dataframe, create the\
+        :class:`SkillsetMatrix` once and pass it through `out`.
+
+    See Also
+    --------
+    :meth:`modules.grid.Competence._generate_competency_graphs`, the scalar version of it.
+    """
+    matrix: SkillsetMatrix = out if isinstance(out, SkillsetMatrix) \
+        else SkillsetMatrix(out)
+
+    if lazy:
+        if workers is not None:
+            raise ValueError('The lazy graphs are created in the current process, "workers" can\'t be used')
+        logger.debug('Creating competency graphs (lazy)')
+        return LazyGraphs(matrix, nodes, isBFS=isBFS, roundp=roundp)
+
+    logger.debug('Creating competency graphs (vectorized)')
+    rows: List[np.ndarray] = _period_rows(matrix, PeriodIndex(nodes))
+    arestas = _all_edges(
+        matrix, rows, isBFS=isBFS, roundp=roundp, workers=workers)
+
+    grafos: Dict[str, DiGraph] = {}
+    for competencia, (edges, ends) in zip(matrix.competences, arestas):
+        grafos[competencia] = _competence_graph(nodes, edges, ends, len(rows))
+        logger.debug(f'--> {competencia}: {len(edges) + len(ends)} edges')
+
+    return grafos
+
+
+def generate_graph_set(
+        out: Union[DataFrame, SkillsetMatrix],
+        nodes: DiGraph,
+        isBFS: bool = False,
+        roundp: int = 4,
+        workers: Optional[int] = None) -> CompetenceGraphSet:
+    """
+    Create graphs for each *competence* (column of `out`), storing the nodes only once.
+
+    Args
+    ----
+    `out`:
+        A dataframe mapping columns (competency) to rows (classes), or its :class:`SkillsetMatrix`
+    `nodes`:
+        A DiGraph containing all nodes (classes) already inserted
+
+    Keyword Args
+    ------------
+    `isBFS`:
+        when settled, it will divide the weight by the number of vertices outcoming of the node.
+    `roundp`:
+        the number of decimal places to use
+    `workers`:
+        The number of processes used to create the graphs. If None, it runs in the current process.
+
+    Returns
+    -------
+    CompetenceGraphSet
+        A mapping of competency to (read-only) graphs equivalent.\
+            See :class:`modules.grid.GraphSet.CompetenceGraphSet`
+
+    Example
+    -------
+    >>> from modules.grid import Builder
+    >>> grafos = Builder.generate_graph_set(out, nodes, isBFS=True)
+    >>> notas_aluno = Competence.BFS.walk(grafos, notas)
+    """
+    matrix: SkillsetMatrix = out if isinstance(out, SkillsetMatrix) \
+        else SkillsetMatrix(out)
+
+    logger.debug('Creating competency graph set (vectorized)')
+    index: PeriodIndex = PeriodIndex(nodes)
+    rows: List[np.ndarray] = _period_rows(matrix, index)
+    arestas = _all_edges(
+        matrix, rows, isBFS=isBFS, roundp=roundp, workers=workers)
+
+    grafos: CompetenceGraphSet = CompetenceGraphSet(nodes)
+    grafos.add_node(END_NODE, period=len(rows)+1)
+    for competencia, (edges, ends) in zip(matrix.competences, arestas):
+        grafos.add(competencia, edges + ends)
+        logger.debug(f'--> {competencia}: {len(edges) + len(ends)} edges')
+
+    return grafos
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains an on-disk cache for the competence graphs.
+
+Generating the graphs (:meth:`modules.grid.Competence.BFS.generate_graphs`) on every run isn't
+needed when neither the skill sheets nor the grid changed. The :class:`GraphCache` stores the
+generated graphs in a compact binary bundle (``.npz``), addressed by a hash of everything that
+changes the output:
+
+- The skillset matrix (classes, competences and values, see :class:`modules.grid.Builder.SkillsetMatrix`)
+- The node table (each class and its attributes, like the period)
+- The mode (BFS or DFS) and `roundp`
+
+Example
+-------
+>>> from modules.grid.Cache import GraphCache
+>>> cache = GraphCache(path.join('..', 'assets', 'cache'))
+>>> grafos = cache.generate_graphs(out, nodes, isBFS=True)  # creates the bundle
+>>> grafos = cache.generate_graphs(out, nodes, isBFS=True)  # loads it
+>>> # or, directly
+>>> grafos = Competence.BFS.generate_graphs(out, nodes, cache=cache)
+
+Note
+----
+When the cache directory is bigger than `max_bytes`, the least recently used bundles are removed.
+"""
+
+# imports
+from os import path, makedirs, remove, replace, scandir, utime
+from typing import Any, Dict, Final, List, Optional, Union
+from networkx.classes.digraph import DiGraph
+from pandas.core.frame import DataFrame
+import numpy as np
+import hashlib
+import json
+import tempfile
+import zipfile
+import zlib
+import logging
+from . import Builder
+from .GraphSet import CompetenceGraphSet, EdgeArrays
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# Versão do formato do bundle (deve mudar sempre que o formato, ou a geração, mudar)
+VERSION: Final[str] = 'grid-graphs-v1'
+
+# Tamanho máximo padrão da pasta de cache (64 MiB)
+DEFAULT_MAX_BYTES: Final[int] = 64 * 1024**2
+
+# Extensão dos bundles
+EXTENSION: Final[str] = '.npz'
+
+
+class GraphCache:
+    """
+    A content-addressed cache of competence graphs.
+
+    Args
+    ----
+    `directory`:
+        The folder where the bundles are stored. It will be created if it doesn't exist.
+
+    Keyword Args
+    ------------
+    `max_bytes`:
+        The maximum size of the folder. When exceeded, the least recently used bundles are removed.
+
+    Important
+    ---------
+    The node (and graph) attributes must be JSON serializable. In the grid, they're strings\
+        (`period`, `className`, `time`, `labTime`) and the period of the last node (an integer).
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(
+            out: Union[DataFrame, Builder.SkillsetMatrix],
+            nodes: DiGraph,
+            isBFS: bool = False,
+            roundp: int = 4) -> str:
+        """
+        Calculate the key (hash) of the graphs generated with these arguments.
+
+        Args
+        ----
+        `out`:
+            A dataframe mapping columns (competency) to rows (classes), or its\
+                :class:`modules.grid.Builder.SkillsetMatrix`
+        `nodes`:
+            A DiGraph containing all nodes (classes)
+
+        Keyword Args
+        ------------
+        `isBFS`:
+            The mode used to generate the graphs
+        `roundp`:
+            the number of decimal places to use
+
+        Returns
+        -------
+        str
+            A SHA-256 (hexadecimal)
+
+        Note
+        ----
+        The matrix is normalised before hashing: its values are always float64 (C order) and\
+            -0.0 is equal to 0.0. The order of the classes, competences and nodes is kept, since\
+                it changes the output.
+        """
+        matrix: Builder.SkillsetMatrix = out \
+            if isinstance(out, Builder.SkillsetMatrix) else Builder.SkillsetMatrix(out)
+
+        h = hashlib.sha256()
+
+        def update(value: Any) -> None:
+            h.update(json.dumps(value, sort_keys=True, default=str).encode())
+            h.update(b'\0')
+
+        update([VERSION, 'BFS' if isBFS else 'DFS', roundp])
+        update(matrix.subjects)
+        update(matrix.competences)
+        h.update(np.ascontiguousarray(matrix.values + 0.0).tobytes())
+        update(nodes.graph)
+        update(list(nodes.nodes(data=True)))
+        return h.hexdigest()
+
+    def path(self, key: str) -> str:
+        """
+        The path of the bundle of a given `key`
+        """
+        return path.join(self.directory, key + EXTENSION)
+
+    def load(self, key: str, shared: bool = False) -> Optional[Union[Dict[str, DiGraph], CompetenceGraphSet]]:
+        """
+        Load the graphs of a given `key`.
+
+        Args
+        ----
+        `key`:
+            The key of the graphs. See :meth:`key`
+
+        Keyword Args
+        ------------
+        `shared`:
+            If settled, returns a :class:`modules.grid.GraphSet.CompetenceGraphSet`.\
+                Otherwise, a dictionary of graphs (like :meth:`modules.grid.Builder.generate_graphs`)
+
+        Returns
+        -------
+        Union[Dict[str, DiGraph], CompetenceGraphSet, None]
+            The graphs, or None if they aren't in the cache
+
+        Note
+        ----
+        A bundle that can't be read is removed (and it's treated as a miss).
+        """
+        filepath: str = self.path(key)
+        if not path.isfile(filepath):
+            logger.debug(f'Cache miss: {key}')
+            return None
+
+        try:
+            with np.load(filepath, allow_pickle=False) as bundle:
+                data: Dict[str, np.ndarray] = {k: bundle[k] for k in bundle.files}
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile, zlib.error) as e:
+            # e.g: um bundle truncado (ou corrompido)
+            logger.warning(f'Removing invalid bundle "{filepath}": {e}')
+            remove(filepath)
+            return None
+
+        # usado na política de remoção (LRU)
+        utime(filepath)
+        logger.debug(f'Cache hit: {key}')
+
+        nodes: List[str] = data['nodes'].tolist()
+        attributes: List[Dict[str, Any]] = json.loads(data['attributes'].item())
+        graph: Dict[str, Any] = json.loads(data['graph'].item())
+        offsets: np.ndarray = data['offsets']
+
+        edges: Dict[str, EdgeArrays] = {}
+        for i, competence in enumerate(data['competences'].tolist()):
+            start, end = offsets[i], offsets[i+1]
+            edges[competence] = (
+                data['sources'][start:end],
+                data['targets'][start:end],
+                data['weights'][start:end])
+
+        if shared:
+            return CompetenceGraphSet.from_arrays(nodes, attributes, edges, graph)
+
+        # os nós que não fazem parte da grade (e.g: a matéria com 100% de uma competência) ...
+        # ... só existem nos grafos que possuem arestas para eles
+        base: int = int(data['base'])
+        grafos: Dict[str, DiGraph] = {}
+        for competence, (sources, targets, weights) in edges.items():
+            grafo = DiGraph(**graph)
+            grafo.add_nodes_from(
+                (n, dict(a)) for n, a in zip(nodes[:base], attributes[:base]))
+            grafo.add_weighted_edges_from(zip(
+                [nodes[s] for s in sources.tolist()],
+                [nodes[t] for t in targets.tolist()],
+                weights.tolist()))
+            grafos[competence] = grafo
+        return grafos
+
+    def save(self, key: str, grafos: CompetenceGraphSet, base: int) -> str:
+        """
+        Store the graphs of a given `key`.
+
+        Args
+        ----
+        `key`:
+            The key of the graphs. See :meth:`key`
+        `grafos`:
+            The graphs (see :meth:`modules.grid.Builder.generate_graph_set`)
+        `base`:
+            The number of nodes (of the node table) that belongs to all graphs.\
+                The other ones only exists in the graphs that have edges to them.
+
+        Returns
+        -------
+        str
+            The path of the bundle
+        """
+        competences: List[str] = list(grafos)
+        arrays: List[EdgeArrays] = [grafos.edges(c) for c in competences]
+        offsets = np.zeros(len(arrays)+1, dtype=np.int64)
+        offsets[1:] = np.cumsum([s.size for s, _, _ in arrays])
+
+        def concat(i: int, dtype) -> np.ndarray:
+            return np.concatenate([a[i] for a in arrays]).astype(dtype) \
+                if arrays else np.empty(0, dtype=dtype)
+
+        filepath: str = self.path(key)
+        # escreve em um arquivo temporário, para que um bundle nunca fique incompleto
+        with tempfile.NamedTemporaryFile(
+                dir=self.directory, suffix='.tmp', delete=False) as f:
+            try:
+                np.savez_compressed(
+                    f,
+                    version=np.array(VERSION),
+                    nodes=np.array(grafos.nodes, dtype=str),
+                    attributes=np.array(json.dumps(
+                        [grafos.attributes[n] for n in grafos.nodes])),
+                    graph=np.array(json.dumps(grafos.graph)),
+                    base=np.array(base),
+                    competences=np.array(competences, dtype=str),
+                    offsets=offsets,
+                    sources=concat(0, np.int32),
+                    targets=concat(1, np.int32),
+                    weights=concat(2, np.float64))
+            except BaseException:
+                # não deixa o arquivo temporário para trás
+                f.close()
+                remove(f.name)
+                raise
+        replace(f.name, filepath)
+        logger.debug(f'Cache stored: {key}')
+
+        self.evict(keep=filepath)
+        return filepath
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Remove the least recently used bundles, until the folder size is lower than `max_bytes`.
+
+        Keyword Args
+        ------------
+        `keep`:
+            A bundle that must not be removed (usually, the last one stored)
+
+        Returns
+        -------
+        int
+            The number of removed bundles
+        """
+        with scandir(self.directory) as it:
+            bundles = [(e.stat().st_mtime, e.stat().st_size, e.path)
+                       for e in it if e.is_file() and e.name.endswith(EXTENSION)]
+
+        total: int = sum(size for _, size, _ in bundles)
+        removed: int = 0
+        # os mais antigos primeiro
+        for _, size, filepath in sorted(bundles):
+            if total <= self.max_bytes:
+                break
+            if filepath == keep:
+                continue
+            remove(filepath)
+            total -= size
+            removed += 1
+            logger.debug(f'Cache evicted: {filepath}')
+        return removed
+
+    def clear(self) -> None:
+        """
+        Remove all bundles.
+        """
+        with scandir(self.directory) as it:
+            for e in it:
+                if e.is_file() and e.name.endswith(EXTENSION):
+                    remove(e.path)
+
+    def generate_graphs(
+            self,
+            out: Union[DataFrame, Builder.SkillsetMatrix],
+            nodes: DiGraph,
+            isBFS: bool = False,
+            roundp: int = 4,
+            shared: bool = False) -> Union[Dict[str, DiGraph], CompetenceGraphSet]:
+        """
+        Load the graphs from the cache, or generate (and store) them.
+
+        Args
+        ----
+        `out`:
+            A dataframe mapping columns (competency) to rows (classes), or its\
+                :class:`modules.grid.Builder.SkillsetMatrix`
+        `nodes`:
+            A DiGraph containing all nodes (classes) already inserted
+
+        Keyword Args
+        ------------
+        `isBFS`:
+            when settled, it will divide the weight by the number of vertices outcoming of the node.
+        `roundp`:
+            the number of decimal places to use
+        `shared`:
+            If settled, returns a :class:`modules.grid.GraphSet.CompetenceGraphSet`
+
+        Returns
+        -------
+        Union[Dict[str, DiGraph], CompetenceGraphSet]
+            The same graphs of :meth:`modules.grid.Builder.generate_graphs`\
+                (or :meth:`modules.grid.Builder.generate_graph_set`)
+        """
+        matrix: Builder.SkillsetMatrix = out \
+            if isinstance(out, Builder.SkillsetMatrix) else Builder.SkillsetMatrix(out)
+
+        key: str = self.key(matrix, nodes, isBFS=isBFS, roundp=roundp)
+        grafos = self.load(key, shared=shared)
+        if grafos is not None:
+            return grafos
+
+        graphs: CompetenceGraphSet = Builder.generate_graph_set(
+            matrix, nodes, isBFS=isBFS, roundp=roundp)
+        # todos os nós da grade, mais o nó final
+        self.save(key, graphs, base=len(nodes)+1)
+        return self.load(key, shared=shared)
@@ -43,11 +43,16 @@ Missing tests for:
 
 # imports
 from networkx import DiGraph
-from typing import Dict, Final, Generator, List, Tuple
+from typing import Dict, Final, Generator, List, Mapping, Optional, Tuple, Union
 from networkx.classes.digraph import DiGraph
+from networkx import topological_sort
 from pandas.core.frame import DataFrame
 import logging
 from copy import deepcopy
+from . import Builder
+from .Period import DEFAULT_PERIODS, PeriodIndex
+from .GraphSet import CompetenceGraphSet
+from .Cache import GraphCache
 
 # configuring logger
 logger = logging.getLogger(__name__)
@@ -56,31 +61,40 @@ logger = logging.getLogger(__name__)
 # sys.setrecursionlimit(1000)
 
 
-def __get_period() -> Generator[int, None, None]:
+def __get_period(last: int = DEFAULT_PERIODS) -> Generator[int, None, None]:
     """
     Computes the current period
 
+    :Kwargs:
+        - `last`: The last period of the grid. See :attr:`modules.grid.Period.PeriodIndex.length`
+
     :Yields:
-        A value [0,10] for every period
+        A value [1,last] for every period
     """
     p: int = 0
-    while p < 10:
+    while p < last:
         p += 1
         yield p
 
 
-def _get_period_classes(nodes: DiGraph, periodo: int) -> List[str]:
+def _get_period_classes(nodes: Union[DiGraph, PeriodIndex], periodo: int) -> List[str]:
     """
     Get all class acronyms for a given `periodo`.
 
     :Args:
-        - `nodes`: a DiGraph containing graphs and edges
+        - `nodes`: a DiGraph containing graphs and edges, or its :class:`modules.grid.Period.PeriodIndex`
         - `periodo`: current grade period. Bettween [1,10]. See :meth:`get_periodo`
 
 
     :Returns:
         A List containing all classes for a given `periodo`.
+
+    Tip
+    ---
+    Passing a :class:`modules.grid.Period.PeriodIndex` avoid scanning all nodes for each call.
     """
+    if isinstance(nodes, PeriodIndex):
+        return nodes[periodo].tolist()
     return [sigla for sigla, data in nodes.nodes(data=True) if data['period'] == str(periodo)]  # type:ignore
 
 
@@ -217,6 +231,11 @@ def _generate_competency_graphs(
     -------
     Usually, the `out` param is equal to 1 foreach column sum. It means that, at the end of the course\
         a student can have, **at maximum**, 100% of a given competence.
+
+    Note
+    ----
+    This is the scalar (reference) version. :meth:`DFS.generate_graphs` and :meth:`BFS.generate_graphs`\
+        use the vectorized one, :meth:`modules.grid.Builder.generate_graphs`.
     """
     # Obtêndo o nome de cada coluna (será utilizada no grafo novo) ...
     # ... Equivale às competências que foram encontradas (não zeradas nos csvs) ...
@@ -226,6 +245,9 @@ def _generate_competency_graphs(
     # Instância que irá ter todos os objetos de grafos indexados pelas competências
     grafos: Dict[str, DiGraph] = {}
 
+    # Agrupa as matérias de cada período uma única vez
+    index: PeriodIndex = PeriodIndex(nodes)
+
     # Obtêm as matérias do período seguinte (ou do próximo) que tiver ...
     # ... este requisito, gerando conexões entre essas disciplinas
     logger.debug('-'*100)
@@ -242,12 +264,12 @@ def _generate_competency_graphs(
 
         # Itera essa competência para os próximos períodos
         periodo: int = 0
-        for periodo in __get_period():
+        for periodo in __get_period(len(index)):
             logger.debug(f'\tPeriod: {periodo}')
 
             # Obtêm a lista de todas as matérias do período atual
             materias_periodo_atual: List[str] = _get_period_classes(
-                nodes, periodo)
+                index, periodo)
             logger.debug(f'\t\tCurrent classes: [{materias_periodo_atual}]')
 
             # Se maior igual à zero, nenhuma das matérias do período ...
@@ -266,12 +288,12 @@ def _generate_competency_graphs(
             prox_periodo: int = periodo
             logger.debug(
                 '\t\tSearching for this competence in the futures periods')
-            while prox_periodo < 10:
+            while prox_periodo < len(index):
                 prox_periodo += 1
 
                 # Obtêm a lista de todas as matérias do período atual
                 materias_proximo_periodo: List[str] = _get_period_classes(
-                    nodes, prox_periodo)
+                    index, prox_periodo)
                 logger.debug(
                     f'\t\t\t[{prox_periodo}] : Classes -> {materias_proximo_periodo}')
 
@@ -383,7 +405,11 @@ class DFS:
     @staticmethod
     def generate_graphs(
             out: DataFrame,
-            nodes: DiGraph) -> Dict[str, DiGraph]:
+            nodes: DiGraph,
+            shared: bool = False,
+            cache: Optional[GraphCache] = None,
+            lazy: bool = False,
+            workers: Optional[int] = None) -> Mapping[str, DiGraph]:
         """
         A method used to create a simple graph which, in the end of dfs :meth:`walk`, will be the sum of 1.
 
@@ -394,10 +420,26 @@ class DFS:
         `nodes`:
             The base graph, which contains all the needed nodes.
 
+        Keyword Args
+        ------------
+        `shared`:
+            If settled, returns a :class:`modules.grid.GraphSet.CompetenceGraphSet`, where the\
+                nodes are shared by all competences (and the graphs are read-only)
+        `cache`:
+            If settled, the graphs are loaded from (or stored in) this\
+                :class:`modules.grid.Cache.GraphCache`
+        `lazy`:
+            If settled, returns a :class:`modules.grid.Builder.LazyGraphs`, which creates each\
+                graph only when it's accessed. It's ignored when `shared` or `cache` are settled.
+        `workers`:
+            The number of processes used to create the graphs (each competence is independent).\
+                If None, it runs in the current process. The output is the same in both cases.\
+                    It can't be used with `lazy` (see :func:`modules.grid.Builder.generate_graphs`).
+
 
         Returns
         -------
-        Dict[str, DiGraph]
+        Mapping[str, DiGraph]
             A dictionary mapping each competence to a given graph (:class:`networkx` object)
 
 
@@ -480,7 +522,12 @@ class DFS:
         ----
         According to *Giovani*, we can have a perceptron passing a value between those.
         """
-        return _generate_competency_graphs(out, nodes)
+        if cache is not None:
+            return cache.generate_graphs(out, nodes, shared=shared)
+        if shared:
+            return Builder.generate_graph_set(out, nodes, workers=workers)
+        return Builder.generate_graphs(
+            out, nodes, lazy=lazy, workers=workers)
 
     @staticmethod
     def _get_weight(
@@ -595,10 +642,132 @@ class DFS:
         # Retorna o valor acumulado (dos filhos até ela)
         return total
 
+    @staticmethod
+    def _memoized_walk(
+            notas: Dict[str, float],
+            grafo: DiGraph,
+            materias: List[str]) -> float:
+        """
+        A memoized walk over competency graph. It returns exactly the same value of\
+            :meth:`__dfs_walk` (summed over all `materias`), however, each pair (node, accumulated\
+                value) is walked only once.
+
+        Args
+        ----
+        `notas`:
+            A dictionary mapping a class acronym to an value.\
+                Usually, this value will be the highest student's score to this class.
+        `grafo`:
+            A graph equivalent to some competency.
+        `materias`:
+            The nodes where the walks start (with `acumulado` equal to 1.0)
+
+        Returns
+        -------
+        float
+            The propagated value over all childrens/leafs of `materias`.
+
+        Important
+        ---------
+        The value that a node sends to its leafs only depends on the node and on the accumulated\
+            value that reaches it. Since the accumulated value is rounded at each step (see\
+                :meth:`_get_weight`), the paths that reach a node with the same value are merged,\
+                    and the number of pairs is bounded (instead of growing with the number of paths).\
+                        The children are summed in the same order of :meth:`__dfs_walk`.
+        """
+        # (matéria, acumulado) -> valor que chega no fim
+        memo: Dict[Tuple[str, float], float] = {}
+
+        def caminha(materia: str, acumulado: float) -> float:
+            chave: Tuple[str, float] = (materia, acumulado)
+            if chave in memo:
+                return memo[chave]
+
+            filhos = grafo[materia]
+            # atingiu o fim (última folha "Fim/Formou") do grafo
+            if not filhos:
+                return acumulado
+
+            total: float = 0
+            for filho, data in filhos.items():
+                total += caminha(filho, DFS._get_weight(
+                    notas, materia, data['weight'], acumulado))
+            memo[chave] = total
+            return total
+
+        resultado: float = 0
+        for materia in materias:
+            resultado += caminha(materia, 1.0)
+        return resultado
+
+    @staticmethod
+    def _dag_walk(
+            notas: Dict[str, float],
+            grafo: DiGraph,
+            materias: List[str]) -> float:
+        """
+        An unrounded walk over competency graph: the value of :meth:`__dfs_walk` (summed over all\
+            `materias`) without rounding the accumulated value at each step. Each node and edge is\
+                visited only once.
+
+        :Complexity: :math:`\\mathcal{O}(V+E)`
+
+        Args
+        ----
+        `notas`:
+            A dictionary mapping a class acronym to an value.\
+                Usually, this value will be the highest student's score to this class.
+        `grafo`:
+            A graph equivalent to some competency.
+        `materias`:
+            The nodes where the walks start (with `acumulado` equal to 1.0)
+
+        Returns
+        -------
+        float
+            The propagated value over all childrens/leafs of `materias`.
+
+        Important
+        ---------
+        Since that the accumulated value is linear along each path, the value that reaches the leafs\
+            is `acumulado` times the *downstream contribution* of the node:
+
+        .. math::
+
+            D(\\text{leaf}) = 1 \\
+            D(n) = f(n) \\cdot \\sum_{c \\in \\text{children}(n)} \\text{peso}_{(n,c)} \\cdot D(c)
+
+        where :math:`f(n)` is `notas[n]/10` (or 1, if the student didn't take it yet). Each :math:`D(n)`\
+            is calculated once, in reverse topological order.
+
+        Note
+        ----
+        The recursive walk rounds the accumulated value at each step (see :meth:`_get_weight`), so\
+            the results differ. The rounding error of the recursive walk grows with the number of\
+                paths: it's lower than 1e-3 in a graph of a single competence of the tests, but it\
+                    reaches ~0.07 in the graphs of the whole course. It's the propagation used by\
+                        :class:`modules.grid.Scoring.ScoringEngine`.
+        """
+        # contribuição de cada nó (valor que chega no fim para cada 1.0 que sai dele)
+        downstream: Dict[str, float] = {}
+
+        # as folhas são calculadas antes dos seus pais
+        for materia in reversed(list(topological_sort(grafo))):
+            filhos = grafo[materia]
+            if not filhos:
+                downstream[materia] = 1.0
+                continue
+            nota: float = notas[materia]/10 if materia in notas else 1.0
+            downstream[materia] = nota * sum(
+                data['weight'] * downstream[filho] for filho, data in filhos.items())
+
+        return sum(downstream[materia] for materia in materias)
+
     @staticmethod
     def walk(
             grafos: Dict[str, DiGraph],
-            notas: Dict[str, float]) -> Dict[str, float]:
+            notas: Dict[str, float],
+            memoized: bool = True) -> Dict[str, float]:
         """
         Walk over all competences(graphs), propagating the current value
         over each semester.
@@ -610,6 +779,12 @@ class DFS:
         `notas`:
             A dictionary mapping class acronym to a given score.
 
+        Keyword Args
+        ------------
+        `memoized`:
+            If settled, uses :meth:`_memoized_walk`. Otherwise, uses the recursive walk, that visits\
+                every path of the graph. Both return the same values.
+
         Returns
         -------
         Dict[str, float]
@@ -641,8 +816,8 @@ class DFS:
 
         Note
         ----
-        This function runs the :meth:`modules.grid.Competence.__dfs_walk` for \
-            all competences. Bellow you can check the **manual debugging** for this method.
+        This function runs the :meth:`_memoized_walk` (or :meth:`modules.grid.Competence.__dfs_walk`, \
+            when `memoized` is False) for all competences. Bellow you can check the **manual debugging** for this method.
 
         .. image:: _static/img/graph_example_devweb_debug_1.png
             :width: 290
@@ -684,8 +859,11 @@ class DFS:
 
             # chama o dfs para cada subgrafo independente
             resultado: float = 0
-            for materias in materias_grafos:
-                resultado += DFS.__dfs_walk(notas, grafo, materias)
+            if memoized:
+                resultado = DFS._memoized_walk(notas, grafo, materias_grafos)
+            else:
+                for materias in materias_grafos:
+                    resultado += DFS.__dfs_walk(notas, grafo, materias)
 
             logger.debug(f'\tCompetence: {competencia} = {resultado}')
             # valor das notas iteradas sobre o grafo de uma competência "N"
@@ -706,7 +884,11 @@ class BFS:
     @staticmethod
     def generate_graphs(
             out: DataFrame,
-            nodes: DiGraph) -> Dict[str, DiGraph]:
+            nodes: DiGraph,
+            shared: bool = False,
+            cache: Optional[GraphCache] = None,
+            lazy: bool = False,
+            workers: Optional[int] = None) -> Mapping[str, DiGraph]:
         """
         A method used to create a simple graph which, in the end of dfs :meth:`walk`, will be the sum of 1.
 
@@ -717,10 +899,26 @@ class BFS:
         `nodes`:
             The base graph, which contains all the needed nodes.
 
+        Keyword Args
+        ------------
+        `shared`:
+            If settled, returns a :class:`modules.grid.GraphSet.CompetenceGraphSet`, where the\
+                nodes are shared by all competences (and the graphs are read-only)
+        `cache`:
+            If settled, the graphs are loaded from (or stored in) this\
+                :class:`modules.grid.Cache.GraphCache`
+        `lazy`:
+            If settled, returns a :class:`modules.grid.Builder.LazyGraphs`, which creates each\
+                graph only when it's accessed. It's ignored when `shared` or `cache` are settled.
+        `workers`:
+            The number of processes used to create the graphs (each competence is independent).\
+                If None, it runs in the current process. The output is the same in both cases.\
+                    It can't be used with `lazy` (see :func:`modules.grid.Builder.generate_graphs`).
+
 
         Returns
         -------
-        Dict[str, DiGraph]
+        Mapping[str, DiGraph]
             A dictionary mapping each competence to a given graph (:class:`networkx` object)
 
 
@@ -815,7 +1013,13 @@ class BFS:
         This method also assumes that, for each period, the maximum obtained value propagated will be 100%. It means that, for\
                 each period, the percentual values are normalized.
         """
-        return _generate_competency_graphs(out, nodes, isBFS=True)
+        if cache is not None:
+            return cache.generate_graphs(out, nodes, isBFS=True, shared=shared)
+        if shared:
+            return Builder.generate_graph_set(
+                out, nodes, isBFS=True, workers=workers)
+        return Builder.generate_graphs(
+            out, nodes, isBFS=True, lazy=lazy, workers=workers)
 
     @staticmethod
     def _get_weight(
@@ -852,12 +1056,13 @@ class BFS:
     def walk(
             grafos: Dict[str, DiGraph],
             notas: Dict[str, float],
-            roundp: int = 2) -> Dict[str, float]:
+            roundp: int = 2,
+            index: Optional[PeriodIndex] = None) -> Dict[str, float]:
         """
         Walk over all competences(graphs), propagating the current value
         over each semester.
 
-        :Complexity: :math:`\\mathcal{O}(n^4)`
+        :Complexity: :math:`\\mathcal{O}(V+E)` for each competence
 
         Args
         ----
@@ -870,6 +1075,11 @@ class BFS:
         ------------
         `roundp`:
             The number of decimal places used when rounding.
+        `index`:
+            The :class:`modules.grid.Period.PeriodIndex` of the graphs nodes. If settled, it will be\
+                shared by all graphs (they must have the same nodes). Otherwise, it will be created\
+                    for each graph (or taken from `grafos`, when it's a\
+                        :class:`modules.grid.GraphSet.CompetenceGraphSet`).
 
         Returns
         -------
@@ -908,6 +1118,9 @@ class BFS:
             (it just skip the current period). For example, in these situations:
             - When the student hasn't taken the subject yet
             - When the student's score is equal to 0
+
+        .. versionchanged:: 0.0.10
+            It walks over all periods of the grid (the last one was ignored before)
         """
         logger.debug('-'*100)
         logger.debug('Walking over graphs')
@@ -915,10 +1128,15 @@ class BFS:
         # Dicionário que irá conter o valor sobre cada competência
         notas_aluno: Dict[str, float] = {}
 
+        # os grafos de um CompetenceGraphSet compartilham os mesmos nós
+        if index is None and isinstance(grafos, CompetenceGraphSet):
+            index = grafos.index
+
         # Itera sobre as competências
         for competencia, grafo in grafos.items():
-            # encontra todos os nós e arestas do grafo. Isso é necessário
-            nodes: Dict[str, str] = dict(grafo.nodes(data='period'))
+            # agrupa os nós do grafo por período
+            periodos: PeriodIndex = index if index is not None \
+                else PeriodIndex(grafo)
 
             logger.debug(f'\tCompetence "{competencia}" - Walking')
             # acumulado do período
@@ -927,9 +1145,9 @@ class BFS:
             c: int = 0
             logger.debug(f'\tACUMULATED = {a}')
             # anda sobre todos os periodos
-            for p in range(1, 10):
+            for p in periodos:
                 logger.debug(f'\t\t{p}:')
-                materias = filter(lambda k: nodes[k] == str(p), nodes)
+                materias = periodos[p]
                 # somatório de todas as disciplinas do periodo * aresta que saem delas
                 s: float = 0.0
                 # Calcula para cada matéria do periodo
@@ -8,21 +8,15 @@ Todo
 Implement loggers for:
 
 - Grids.set
-
-Implement tests for:
-
-- test_get
-- test_contains
-- test_insert
 """
 
 # Convert Graph to json
 import json
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple
 from networkx.classes.digraph import DiGraph
 from networkx.readwrite import json_graph
 # MongoDB
-from pymongo import MongoClient
+from modules import Mongo
 
 import logging
 logger = logging.getLogger(__name__)
@@ -40,12 +34,21 @@ class Grids(object):
     >>> unexistent_courseCode = "coxinha"
     >>> # throw this AssertionError
     >>> assert unexistent_courseCode in grids_module, "It will throw this error"
+
+    Keyword Args
+    ------------
+    `max_pool_size`:
+        *OPTIONAL*, The maximum number of connections of the client. See :mod:`modules.Mongo`
+
+    .. versionchanged:: 0.0.10
+        The client is shared by all objects with the same connection string\
+            (see :func:`modules.Mongo.get_client`).
     """
 
-    def __init__(self, connectionString) -> None:
-        # Create a mongoclient
-        self.client = MongoClient(connectionString)
-        logger.debug('Creating MongoClient')
+    def __init__(self, connectionString, max_pool_size: Optional[int] = None) -> None:
+        # Get the (shared) mongoclient
+        self.client = Mongo.get_client(connectionString, max_pool_size=max_pool_size)
+        logger.debug('Getting MongoClient')
         # Connect to database
         self.db = self.client.sigaadb
         logger.debug('Assigning MongoDB')
@@ -160,6 +163,12 @@ class Grids(object):
 
     def close(self):
         """
-        Close mongo's connections
+        Release mongo's connections
+
+        Note
+        ----
+        The client is shared (and pooled), so it isn't closed here. It's closed when the\
+            interpreter exits, or by :meth:`modules.Mongo.ClientRegistry.close`.
         """
-        self.client.close()
+        self.client = None
+        self.db = None
@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains a container for all competence graphs of a grid.
+
+Usually, each competence has its own copy of the grid graph (see
+:meth:`modules.grid.Competence._generate_competency_graphs`), which means that every node
+attribute (period, className, time, labTime) is duplicated for each competence.
+
+The :class:`CompetenceGraphSet` stores the nodes only once (an interned node table) and, for each
+competence, only its edges as arrays (source index, target index, weight). Each competence can be
+accessed as a read-only :class:`networkx.DiGraph` (see :class:`CompetenceGraph`), so the walks
+(:mod:`modules.grid.Competence`) and the plots (:mod:`modules.grid.Plot`) still work.
+
+Example
+-------
+>>> from modules.grid import Builder
+>>> grafos = Builder.generate_graph_set(out, nodes, isBFS=True)
+>>> grafos['Desenvolvimento Web e Mobile']
+<modules.grid.GraphSet.CompetenceGraph object at 0x7f...>
+>>> notas_aluno = Competence.BFS.walk(grafos, notas)
+"""
+
+# imports
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from networkx.classes.digraph import DiGraph
+import networkx as nx
+import numpy as np
+import logging
+from .Period import PeriodIndex
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# An edge of a competence graph: (from, to, weight)
+Edge = Tuple[str, str, float]
+
+# Edges stored as arrays: (source index, target index, weight)
+EdgeArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+class _Neighbors(Mapping):
+    """
+    A read-only mapping of neighbor -> edge data, for a single node.
+    It works like the inner dictionary of :attr:`networkx.DiGraph._succ`
+    """
+    __slots__ = ('_names', '_position', '_targets', '_weights')
+
+    def __init__(
+            self,
+            names: List[str],
+            position: Dict[str, int],
+            targets: np.ndarray,
+            weights: np.ndarray) -> None:
+        self._names = names
+        self._position = position
+        self._targets = targets
+        self._weights = weights
+
+    def __getitem__(self, key: str) -> Dict[str, float]:
+        found = np.flatnonzero(self._targets == self._position.get(key, -1))
+        if not found.size:
+            raise KeyError(key)
+        return {'weight': self._weights[found[0]].item()}
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._names[t] for t in self._targets.tolist())
+
+    def __len__(self) -> int:
+        return self._targets.size
+
+    def __contains__(self, key: object) -> bool:
+        return bool((self._targets == self._position.get(key, -1)).any())  # type: ignore
+
+
+class _Adjacency(Mapping):
+    """
+    A read-only mapping of node -> :class:`_Neighbors`, stored as a CSR matrix.
+    It works like the :attr:`networkx.DiGraph._succ` (or `_pred`)
+
+    Args
+    ----
+    `names`:
+        The node table
+    `position`:
+        Maps each node name to its index in `names`
+    `rows`:
+        The index of the node that owns the edge (source, for successors)
+    `cols`:
+        The index of the other node of the edge (target, for successors)
+    `weights`:
+        The weight of each edge
+
+    Note
+    ----
+    It uses a stable sort, so the neighbors keep the order of insertion (like networkx does).
+    """
+    __slots__ = ('_names', '_position', '_indptr', '_indices', '_weights')
+
+    def __init__(
+            self,
+            names: List[str],
+            position: Dict[str, int],
+            rows: np.ndarray,
+            cols: np.ndarray,
+            weights: np.ndarray) -> None:
+        order: np.ndarray = np.argsort(rows, kind='stable')
+        self._names = names
+        self._position = position
+        self._indptr: np.ndarray = np.concatenate((
+            [0], np.cumsum(np.bincount(rows, minlength=len(names)))))
+        self._indices: np.ndarray = cols[order]
+        self._weights: np.ndarray = weights[order]
+
+    def __getitem__(self, key: str) -> _Neighbors:
+        i: int = self._position[key]
+        start, end = self._indptr[i], self._indptr[i+1]
+        return _Neighbors(
+            self._names,
+            self._position,
+            self._indices[start:end],
+            self._weights[start:end])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._position
+
+
+class CompetenceGraph(DiGraph):
+    """
+    A read-only :class:`networkx.DiGraph`, for a single competence of a :class:`CompetenceGraphSet`.
+
+    The nodes (and its attributes) are shared by all competences, and the edges are read
+    from the arrays of the set.
+
+    Important
+    ---------
+    It's a frozen graph (see :func:`networkx.freeze`). To modify it, make a copy: ``grafo.copy()``.
+    """
+
+    @classmethod
+    def view(cls, graphs: 'CompetenceGraphSet', competence: str) -> 'CompetenceGraph':
+        """
+        Create the view of a given competence.
+
+        Args
+        ----
+        `graphs`:
+            The set that holds the nodes and the edges
+        `competence`:
+            The competence name
+
+        Returns
+        -------
+        CompetenceGraph
+            A frozen graph
+        """
+        sources, targets, weights = graphs.edges(competence)
+
+        grafo = cls()
+        grafo.graph = graphs.graph
+        grafo._node = graphs.attributes
+        grafo._adj = _Adjacency(
+            graphs.nodes, graphs.position, sources, targets, weights)
+        # no networkx 2.5, "_succ" é um atributo da instância (e não um alias de "_adj")
+        grafo._succ = grafo._adj
+        grafo._pred = _Adjacency(
+            graphs.nodes, graphs.position, targets, sources, weights)
+        return nx.freeze(grafo)
+
+
+class CompetenceGraphSet(Mapping):
+    """
+    Holds all competence graphs of a grid, sharing the nodes between them.
+    It can be used as a ``Dict[str, DiGraph]``.
+
+    Args
+    ----
+    `nodes`:
+        A DiGraph containing all nodes (classes). Its edges are ignored.
+
+    Example
+    -------
+    >>> from modules.grid.GraphSet import CompetenceGraphSet
+    >>> grafos = CompetenceGraphSet(nodes)
+    >>> grafos.add('PAA', [('ECOI04', 'ECOI09', 1.0), ('ECOI09', 'Fim/Formou', 1.0)])
+    >>> list(grafos['PAA'].successors('ECOI04'))
+    ['ECOI09']
+
+    Note
+    ----
+    When an edge uses an unknown node, it will be inserted in the node table, without attributes.
+    """
+
+    def __init__(self, nodes: DiGraph) -> None:
+        # grafo (atributos do grafo) compartilhado por todas as competências
+        self.graph: Dict[str, Any] = dict(nodes.graph)
+
+        self._edges: Dict[str, EdgeArrays] = {}
+        self._views: Dict[str, CompetenceGraph] = {}
+        self._index: Optional[PeriodIndex] = None
+
+        # tabela de nós (cada nó é armazenado uma única vez)
+        self.nodes: List[str] = []
+        self.position: Dict[str, int] = {}
+        self.attributes: Dict[str, Dict[str, Any]] = {}
+        for sigla, data in nodes.nodes(data=True):
+            self._intern(sigla, dict(data))
+
+    @classmethod
+    def from_graphs(cls, grafos: Dict[str, DiGraph]) -> 'CompetenceGraphSet':
+        """
+        Create a set from a dictionary of graphs.
+
+        Args
+        ----
+        `grafos`:
+            A dictionary mapping competency to graphs equivalent.\
+                See :meth:`modules.grid.Competence.BFS.generate_graphs`
+
+        Returns
+        -------
+        CompetenceGraphSet
+            The equivalent set
+
+        Important
+        ---------
+        It assumes that all graphs have the same nodes (and attributes). The node table is\
+            created from the first graph.
+        """
+        graphs: Optional[CompetenceGraphSet] = None
+        for competence, grafo in grafos.items():
+            if graphs is None:
+                graphs = cls(grafo)
+            graphs.add(competence, list(grafo.edges(data='weight')))
+        return graphs if graphs is not None else cls(DiGraph())
+
+    @classmethod
+    def from_arrays(
+            cls,
+            nodes: List[str],
+            attributes: List[Dict[str, Any]],
+            edges: Dict[str, EdgeArrays],
+            graph: Optional[Dict[str, Any]] = None) -> 'CompetenceGraphSet':
+        """
+        Create a set from its node table and edge arrays (see :meth:`edges`), without\
+            converting them into tuples.
+
+        Args
+        ----
+        `nodes`:
+            The node table
+        `attributes`:
+            The attributes of each node of `nodes`
+        `edges`:
+            A dictionary mapping each competence to its (source index, target index, weight)
+
+        Keyword Args
+        ------------
+        `graph`:
+            The graph attributes
+
+        Returns
+        -------
+        CompetenceGraphSet
+            The equivalent set
+        """
+        grafo = DiGraph(**(graph or {}))
+        grafo.add_nodes_from(zip(nodes, attributes))
+        graphs = cls(grafo)
+        for competence, (sources, targets, weights) in edges.items():
+            graphs._edges[competence] = (
+                np.asarray(sources, dtype=np.int32),
+                np.asarray(targets, dtype=np.int32),
+                np.asarray(weights, dtype=np.float64))
+        return graphs
+
+    def _intern(self, node: str, data: Dict[str, Any]) -> int:
+        """
+        Insert a node in the node table (if it isn't there yet).
+
+        Args
+        ----
+        `node`:
+            The node name
+        `data`:
+            The node attributes
+
+        Returns
+        -------
+        int
+            The index of this node in the table
+        """
+        if node not in self.position:
+            self.position[node] = len(self.nodes)
+            self.nodes.append(node)
+            self.attributes[node] = data
+            # a tabela de nós mudou, as views (e o índice) devem ser recriadas
+            self._views.clear()
+            self._index = None
+        return self.position[node]
+
+    def add_node(self, node: str, **attr) -> None:
+        """
+        Insert a node (shared by all competences) in the node table.
+
+        Args
+        ----
+        `node`:
+            The node name
+
+        Keyword Args
+        ------------
+        `attr`:
+            The node attributes. E.g: `period=11`
+        """
+        self._intern(node, dict(attr))
+
+    def add(self, competence: str, edges: List[Edge]) -> None:
+        """
+        Insert (or replace) the edges of a competence.
+
+        Args
+        ----
+        `competence`:
+            The competence name
+        `edges`:
+            A list of (from, to, weight)
+        """
+        sources = np.array(
+            [self._intern(u, {}) for u, _, _ in edges], dtype=np.int32)
+        targets = np.array(
+            [self._intern(v, {}) for _, v, _ in edges], dtype=np.int32)
+        weights = np.array([w for _, _, w in edges], dtype=np.float64)
+
+        self._edges[competence] = (sources, targets, weights)
+        # remove a view antiga, se existir
+        self._views.pop(competence, None)
+
+    def edges(self, competence: str) -> EdgeArrays:
+        """
+        Get the edges of a competence.
+
+        Args
+        ----
+        `competence`:
+            The competence name
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            The source index, the target index (both in :attr:`nodes`) and the weight of each edge
+        """
+        return self._edges[competence]
+
+    @property
+    def index(self) -> PeriodIndex:
+        """
+        The :class:`modules.grid.Period.PeriodIndex` of the node table.
+        It's the same for all competences.
+        """
+        if self._index is None:
+            grafo = DiGraph()
+            grafo.add_nodes_from(self.attributes.items())
+            self._index = PeriodIndex(grafo)
+        return self._index
+
+    def __getitem__(self, competence: str) -> CompetenceGraph:
+        """
+        Get the (read-only) graph of a competence.
+
+        Args
+        ----
+        `competence`:
+            The competence name
+
+        Returns
+        -------
+        CompetenceGraph
+            A frozen DiGraph
+        """
+        if competence not in self._views:
+            if competence not in self._edges:
+                raise KeyError(competence)
+            self._views[competence] = CompetenceGraph.view(self, competence)
+        return self._views[competence]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._edges)
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    def __contains__(self, competence: object) -> bool:
+        return competence in self._edges
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # as views são recriadas quando necessárias
+        state = dict(self.__dict__)
+        state['_views'] = {}
+        state['_index'] = None
+        return state
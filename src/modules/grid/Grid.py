@@ -43,7 +43,7 @@ def get_grid(grid: str, connection: str) -> Tuple[DiGraph, DiGraph]:
     """
     logger.info("Loading Database")
     # Store in mongodb those two graphs
-    # Create a mongoclient
+    # Get the (shared) mongoclient
     Database = Grids(connection)
 
     GraphCo: DiGraph
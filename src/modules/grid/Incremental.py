@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains an incremental version of the competence graphs generation.
+
+When a teacher changes some values of a skill sheet, only the competences (columns) of those
+cells can change. And, for each of those competences, only the edges of the periods whose sums
+(used to normalise the weights) or heirs changed. The :class:`IncrementalGraphs` keeps the
+skillset matrix and the sums of each period, so it can update only those edges.
+
+Example
+-------
+>>> from modules.grid.Incremental import IncrementalGraphs
+>>> grafos = IncrementalGraphs(out, nodes, isBFS=True)
+>>> grafos.update({('ECOI04', 'PAA'): 0.2})
+['PAA']
+>>> # or, with the new dataframe
+>>> grafos.update_frame(new_out)
+['PAA', 'Engenharia de software']
+>>> Competence.BFS.walk(grafos, notas)
+
+Important
+---------
+The graphs are updated in place, and they're equal (including the order of nodes and edges) to the
+ones created from scratch by :meth:`modules.grid.Builder.generate_graphs`.
+"""
+
+# imports
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+from networkx.classes.digraph import DiGraph
+from pandas.core.frame import DataFrame
+import numpy as np
+import logging
+from .Builder import END_NODE, Edge, SkillsetMatrix, \
+    _end_edges, _pair_edges, _period_rows, _period_sums, _competence_edges, \
+    generate_graphs
+from .GraphSet import CompetenceGraphSet
+from .Period import PeriodIndex
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# A changed cell: (class acronym, competence)
+Cell = Tuple[str, str]
+
+
+class IncrementalGraphs(Mapping):
+    """
+    The competence graphs, that can be updated when some cells of the skillset change.
+    It can be used as a ``Dict[str, DiGraph]``.
+
+    Args
+    ----
+    `out`:
+        A dataframe mapping columns (competency) to rows (classes), or its\
+            :class:`modules.grid.Builder.SkillsetMatrix`. It's copied.
+    `nodes`:
+        A DiGraph containing all nodes (classes) already inserted
+
+    Keyword Args
+    ------------
+    `isBFS`:
+        when settled, it will divide the weight by the number of vertices outcoming of the node.
+    `roundp`:
+        the number of decimal places to use
+    `grafos`:
+        The graphs already generated with these arguments (a dictionary or a\
+            :class:`modules.grid.GraphSet.CompetenceGraphSet`). If None, they will be generated.
+
+    Note
+    ----
+    For a :class:`modules.grid.GraphSet.CompetenceGraphSet`, the edges of the changed competences\
+        are replaced (since that its arrays are read-only), however, only the changed competences\
+            are calculated.
+    """
+
+    def __init__(
+            self,
+            out: Union[DataFrame, SkillsetMatrix],
+            nodes: DiGraph,
+            isBFS: bool = False,
+            roundp: int = 4,
+            grafos: Optional[Union[Dict[str, DiGraph], CompetenceGraphSet]] = None) -> None:
+        matrix: SkillsetMatrix = out if isinstance(out, SkillsetMatrix) \
+            else SkillsetMatrix(out)
+        # cópia, já que os valores serão alterados
+        self.matrix: SkillsetMatrix = SkillsetMatrix.from_values(
+            matrix.subjects, matrix.competences, matrix.values.copy())
+
+        self.isBFS: bool = isBFS
+        self.roundp: int = roundp
+
+        self.rows: List[np.ndarray] = _period_rows(
+            self.matrix, PeriodIndex(nodes))
+        self.sums: np.ndarray = _period_sums(self.matrix, self.rows)
+
+        # período (índice de rows) de cada linha da matriz (-1 se não estiver na grade)
+        self._period: np.ndarray = np.full(
+            len(self.matrix.subjects), -1, dtype=np.intp)
+        for p, r in enumerate(self.rows):
+            self._period[r] = p
+
+        # nós que existem em todos os grafos
+        self._base: Set[str] = set(nodes) | {END_NODE}
+
+        self.graphs: Union[Dict[str, DiGraph], CompetenceGraphSet] = grafos \
+            if grafos is not None else generate_graphs(
+                self.matrix, nodes, isBFS=isBFS, roundp=roundp)
+
+    def __getitem__(self, competencia: str) -> DiGraph:
+        return self.graphs[competencia]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.graphs)
+
+    def __len__(self) -> int:
+        return len(self.graphs)
+
+    def update(self, changes: Dict[Cell, float]) -> List[str]:
+        """
+        Change some cells of the skillset, updating the graphs.
+
+        Args
+        ----
+        `changes`:
+            A dictionary mapping (class acronym, competence) to its new value
+
+        Returns
+        -------
+        List[str]
+            The competences whose graphs were updated
+
+        Raises
+        ------
+        `KeyError`:
+            If the class or the competence doesn't exist in the skillset. In this case, the graphs\
+                must be generated again.
+        """
+        # períodos alterados de cada competência (coluna)
+        dirty: Dict[int, Set[int]] = {}
+        cells: List[Tuple[int, int, float]] = []
+        for (sigla, competencia), value in changes.items():
+            i: int = self.matrix.index[sigla]
+            j: int = self.matrix.columns[competencia]
+            if self.matrix.values[i, j] == value:
+                continue
+            cells.append((i, j, value))
+            periods = dirty.setdefault(j, set())
+            # disciplinas fora da grade só são usadas como "unitary"
+            if self._period[i] >= 0:
+                periods.add(int(self._period[i]))
+
+        # períodos que possuem cada competência, antes da alteração
+        old: Dict[int, np.ndarray] = {
+            j: np.flatnonzero(self.sums[:, j] != 0) for j in dirty}
+
+        for i, j, value in cells:
+            self.matrix.values[i, j] = value
+        for j, periods in dirty.items():
+            for p in periods:
+                r: np.ndarray = self.rows[p]
+                self.sums[p, j] = np.cumsum(self.matrix.values[r, j])[-1] \
+                    if r.size else 0.0
+
+        unitary: Optional[str] = self.matrix.unitary
+        unitary_changed: bool = unitary != self.matrix.update_unitary()
+
+        updated: Set[int] = set()
+        for j, periods in dirty.items():
+            if periods and self._update_competence(j, periods, old[j]):
+                updated.add(j)
+
+        # as competências que usam a "unitary" (ou que passaram a usar) mudam com ela
+        if unitary_changed:
+            for j in range(len(self.matrix.competences)):
+                if j not in updated and self._update_ends(j):
+                    updated.add(j)
+
+        result: List[str] = [
+            c for j, c in enumerate(self.matrix.competences) if j in updated]
+        logger.debug(f'Updated competences: {result}')
+        return result
+
+    def update_frame(self, out: DataFrame) -> List[str]:
+        """
+        Update the graphs with a new skillset dataframe, changing only its different cells.
+
+        Args
+        ----
+        `out`:
+            The new dataframe. It must have the same classes and competences (and order).
+
+        Returns
+        -------
+        List[str]
+            The competences whose graphs were updated
+
+        Raises
+        ------
+        `ValueError`:
+            If the classes or competences of `out` are different. In this case, the graphs\
+                must be generated again.
+        """
+        if out.index.to_list() != self.matrix.subjects or \
+                out.columns.to_list() != self.matrix.competences:
+            raise ValueError(
+                'The classes (or competences) changed, the graphs must be generated again')
+
+        values: np.ndarray = out.to_numpy(dtype=np.float64)
+        changed = np.argwhere(
+            (values != self.matrix.values) &
+            ~(np.isnan(values) & np.isnan(self.matrix.values)))
+        return self.update({
+            (self.matrix.subjects[i], self.matrix.competences[j]): values[i, j]
+            for i, j in changed.tolist()})
+
+    def _heirs(self, col: int, following: int) -> np.ndarray:
+        """
+        The rows of the classes of a period that have a competence.
+        """
+        r: np.ndarray = self.rows[following]
+        return r[self.matrix.values[r, col] > 0]
+
+    def _last(self, col: int) -> np.ndarray:
+        """
+        The rows of the last heirs of a competence (see :meth:`modules.grid.Builder._competence_edges`).
+        """
+        nonzero: np.ndarray = np.flatnonzero(self.sums[:, col] != 0)
+        for following in nonzero[:0:-1]:
+            heirs: np.ndarray = self._heirs(col, following)
+            if heirs.size:
+                return heirs
+        return np.empty(0, dtype=np.intp)
+
+    def _update_competence(self, col: int, periods: Set[int], old: np.ndarray) -> bool:
+        """
+        Update the edges of a competence.
+
+        Args
+        ----
+        `col`:
+            The competence column
+        `periods`:
+            The periods whose values changed
+        `old`:
+            The periods that had this competence, before the change
+
+        Returns
+        -------
+        bool
+            Always True (the competence changed)
+        """
+        competencia: str = self.matrix.competences[col]
+
+        if isinstance(self.graphs, CompetenceGraphSet):
+            edges, ends = _competence_edges(
+                self.matrix, self.rows, self.sums, competencia,
+                isBFS=self.isBFS, roundp=self.roundp)
+            self.graphs.add(competencia, edges + ends)
+            return True
+
+        grafo: DiGraph = self.graphs[competencia]
+        new: np.ndarray = np.flatnonzero(self.sums[:, col] != 0)
+        old_next: Dict[int, int] = dict(zip(old[:-1].tolist(), old[1:].tolist()))
+        new_next: Dict[int, int] = dict(zip(new[:-1].tolist(), new[1:].tolist()))
+
+        # as arestas que saem de um período dependem dos seus valores (e somatório), ...
+        # ... e das herdeiras do próximo período
+        recalcular: List[int] = sorted(
+            cur for cur in set(old_next) | set(new_next)
+            if cur in periods
+            or old_next.get(cur) != new_next.get(cur)
+            or new_next.get(cur) in periods)
+
+        for cur in recalcular:
+            # remove as arestas antigas (menos as do nó final, recalculadas depois)
+            names: List[str] = self.matrix.names(self.rows[cur])
+            grafo.remove_edges_from([
+                (u, v) for u in names for v in list(grafo[u]) if v != END_NODE])
+            if cur in new_next:
+                edges, _ = _pair_edges(
+                    self.matrix, self.rows, self.sums, col, cur, new_next[cur],
+                    isBFS=self.isBFS, roundp=self.roundp)
+                grafo.add_weighted_edges_from(edges)
+
+        logger.debug(
+            f'--> {competencia}: periods {[p+1 for p in recalcular]} updated')
+        self._update_ends(col)
+        return True
+
+    def _update_ends(self, col: int) -> bool:
+        """
+        Update the edges that goes to the last node of a competence.
+
+        Args
+        ----
+        `col`:
+            The competence column
+
+        Returns
+        -------
+        bool
+            True if the edges changed
+        """
+        competencia: str = self.matrix.competences[col]
+        ends: List[Edge] = _end_edges(
+            self.matrix, col, self._last(col), roundp=self.roundp)
+
+        if isinstance(self.graphs, CompetenceGraphSet):
+            sources, targets, weights = self.graphs.edges(competencia)
+            end: int = self.graphs.position[END_NODE]
+            current: List[Edge] = [
+                (self.graphs.nodes[s], END_NODE, w) for s, w in
+                zip(sources[targets == end].tolist(), weights[targets == end].tolist())]
+            if current == ends:
+                return False
+            edges, ends = _competence_edges(
+                self.matrix, self.rows, self.sums, competencia,
+                isBFS=self.isBFS, roundp=self.roundp)
+            self.graphs.add(competencia, edges + ends)
+            return True
+
+        grafo: DiGraph = self.graphs[competencia]
+        current = [(u, v, w) for u, v, w in grafo.in_edges(END_NODE, data='weight')]
+        if current == ends:
+            return False
+
+        grafo.remove_edges_from(current)
+        grafo.add_weighted_edges_from(ends)
+        # remove a antiga "unitary" (caso não seja uma disciplina da grade)
+        for u, _, _ in current:
+            if u not in self._base and not grafo.degree(u):
+                grafo.remove_node(u)
+        return True
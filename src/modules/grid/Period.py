@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains an index of the classes of each period of a grid.
+
+Instead of scanning all the nodes of the grid every time that we need the classes of a
+given period, the :class:`PeriodIndex` groups them in a single pass.
+
+Note
+----
+The periods are normalised to integers. The non numeric ones ('Optativa' and 'Complementar')
+are kept as separated buckets.
+"""
+
+# imports
+from typing import Dict, Final, Iterator, List, Union
+from networkx.classes.digraph import DiGraph
+import numpy as np
+import logging
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# Períodos que não são numéricos (veja :mod:`modules.grid.Scrapping`)
+OPTATIVA: Final[str] = 'Optativa'
+COMPLEMENTAR: Final[str] = 'Complementar'
+
+# Quantidade mínima de períodos de um curso (a grade 0192015 possui 10)
+DEFAULT_PERIODS: Final[int] = 10
+
+# A period, after normalization
+Period = Union[int, str]
+
+
+def normalize(period: Union[int, str]) -> Period:
+    """
+    Normalise a period.
+
+    Args
+    ----
+    `period`:
+        A period, like the ones stored in nodes. E.g: '1', 11 or 'Optativa'
+
+    Returns
+    -------
+    Union[int, str]
+        The period as an integer. If it isn't a number, it returns the period itself.
+
+    Example
+    -------
+    >>> normalize('3')
+    3
+    >>> normalize('Optativa')
+    'Optativa'
+    """
+    if isinstance(period, int):
+        return period
+    value: str = str(period).strip()
+    return int(value) if value.isdigit() else value
+
+
+class PeriodIndex:
+    """
+    Maps each period to the classes (acronyms) that belongs to it.
+
+    Args
+    ----
+    `nodes`:
+        A DiGraph containing all nodes (classes). Each node must have the attribute `period`
+
+    Keyword Args
+    ------------
+    `periods`:
+        The minimum number of periods of the grid. If the grid has more periods, it will use them.
+
+    Example
+    -------
+    >>> from modules.grid.Period import PeriodIndex
+    >>> index = PeriodIndex(nodes)
+    >>> index[1]
+    array(['ECOI01', 'ECOI02', 'ECOI03', ...], dtype=object)
+    >>> index.period['ECOI04']
+    2
+    >>> list(index)
+    [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+    Important
+    ---------
+    The classes of each period are kept in the same order of `nodes`.
+    """
+
+    def __init__(self, nodes: DiGraph, periods: int = DEFAULT_PERIODS) -> None:
+        # mapeia uma disciplina ao seu período (normalizado)
+        self.period: Dict[str, Period] = {}
+
+        classes: Dict[Period, List[str]] = {}
+        for sigla, period in nodes.nodes(data='period'):
+            p: Period = normalize(period)
+            self.period[sigla] = p
+            classes.setdefault(p, []).append(sigla)
+
+        self._buckets: Dict[Period, np.ndarray] = {
+            p: np.array(c, dtype=object) for p, c in classes.items()}
+
+        # o último período é o maior entre os períodos numéricos
+        numeric: List[int] = [p for p in classes if isinstance(p, int)]
+        self.length: int = max([periods, *numeric])
+
+        logger.debug(
+            f'Period index created: {self.length} periods, buckets {list(classes.keys())}')
+
+    def __getitem__(self, period: Union[int, str]) -> np.ndarray:
+        """
+        Get the classes of a given period.
+
+        Args
+        ----
+        `period`:
+            The period. E.g: 1, '1' or 'Optativa'
+
+        Returns
+        -------
+        np.ndarray
+            An array containing the acronyms. It will be empty if there's no class in this period.
+        """
+        return self._buckets.get(normalize(period), np.empty(0, dtype=object))
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterate over all numeric periods, [1, :attr:`length`]
+        """
+        return iter(range(1, self.length + 1))
+
+    def __len__(self) -> int:
+        """
+        The number of numeric periods
+        """
+        return self.length
+
+    def __contains__(self, period: Union[int, str]) -> bool:
+        """
+        Check if exists some class in this period
+        """
+        return normalize(period) in self._buckets
+
+    def buckets(self) -> List[Period]:
+        """
+        Get all periods (numeric or not) that have some class
+
+        Returns
+        -------
+        List[Union[int, str]]
+            The periods in order of appearance in `nodes`
+        """
+        return list(self._buckets.keys())
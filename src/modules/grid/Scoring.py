@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module contains a batch version of the walks (see :mod:`modules.grid.Competence`).
+
+The walks (:meth:`modules.grid.Competence.BFS.walk` and :meth:`modules.grid.Competence.DFS.walk`)
+score a single student (a ``notas`` dictionary) at a time. The :class:`ScoringEngine` compiles each
+competence graph once into sparse operators and scores a whole cohort, given as a
+grades matrix (students × subjects), returning a matrix of students × competences.
+
+Example
+-------
+>>> from modules.grid import Competence
+>>> from modules.grid.Scoring import ScoringEngine
+>>> grafos = Competence.BFS.generate_graphs(out, nodes)
+>>> engine = ScoringEngine(grafos, isBFS=True)
+>>> notas = engine.grades([notas_aluno, notas_ideal, notas_hardware])
+>>> engine.score(notas)
+array([[0.61, 0.72, ...],
+       [1.  , 1.  , ...],
+       [0.55, 0.12, ...]])
+
+Note
+----
+It only uses NumPy. The operators are stored as padded rows (ELLPACK), instead of CSR, since that\
+it keeps the order of the sums, so the results are exactly the same of the walks.
+"""
+
+# imports
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from networkx.classes.digraph import DiGraph
+from networkx import topological_sort
+from pandas.core.frame import DataFrame
+import numpy as np
+import logging
+from modules import Numeric
+from .Period import PeriodIndex
+from .GraphSet import CompetenceGraphSet
+
+# configuring logger
+logger = logging.getLogger(__name__)
+
+# A sparse matrix stored as padded rows (ELLPACK): (indices, data)
+ELL = Tuple[np.ndarray, np.ndarray]
+
+
+def _ell(groups: List[List[Tuple[int, float]]]) -> ELL:
+    """
+    Create the ELLPACK arrays of a list of groups.
+
+    Args
+    ----
+    `groups`:
+        For each output, the list of (input index, weight) that is summed into it
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The indices and the data (weights), both with shape (outputs × longest group).\
+            The shorter groups are filled with zero weights.
+    """
+    width: int = max((len(g) for g in groups), default=0)
+    indices = np.zeros((len(groups), width), dtype=np.intp)
+    data = np.zeros((len(groups), width), dtype=np.float64)
+    for i, group in enumerate(groups):
+        for j, (k, w) in enumerate(group):
+            indices[i, j] = k
+            data[i, j] = w
+    return indices, data
+
+
+def _product(values: np.ndarray, operator: ELL) -> np.ndarray:
+    """
+    Multiply a dense matrix by a sparse one: ``values @ operator``.
+
+    Args
+    ----
+    `values`:
+        A dense matrix (students × inputs)
+    `operator`:
+        The ELLPACK arrays (see :func:`_ell`), where each row is an output column
+
+    Returns
+    -------
+    np.ndarray
+        A dense matrix (students × outputs). Empty groups are equal to 0.
+
+    Important
+    ---------
+    The terms of each output are summed in order (one at a time), like the walks do. Doing so,\
+        the results are exactly the same of them (the padding only adds zeros).
+    """
+    indices, data = operator
+    result = np.zeros((values.shape[0], indices.shape[0]), dtype=np.float64)
+    for j in range(indices.shape[1]):
+        result += values[:, indices[:, j]] * data[:, j]
+    return result
+
+
+class ScoringEngine:
+    """
+    Compile the competence graphs, so they can score many students at once.
+
+    Args
+    ----
+    `grafos`:
+        A dictionary mapping competences to graphs equivalent.\
+            See :meth:`modules.grid.Competence.BFS.generate_graphs`
+
+    Keyword Args
+    ------------
+    `isBFS`:
+        If settled, it scores like :meth:`modules.grid.Competence.BFS.walk`. Otherwise, like\
+            :meth:`modules.grid.Competence.DFS._dag_walk` (the DFS walk, without rounding each step)
+    `roundp`:
+        The number of decimal places used when rounding (only used by BFS)
+
+    Example
+    -------
+    >>> engine = ScoringEngine(grafos, isBFS=True)
+    >>> engine.score(engine.grades([notas]))[0]
+    array([0.61, 0.72, ...])
+
+    Important
+    ---------
+    For each student (row), the result is the same of the walk (for DFS, the unrounded one, see\
+        :meth:`modules.grid.Competence.DFS._dag_walk`). However, when the student has no score in any\
+            period of a competence, :meth:`modules.grid.Competence.BFS.walk` raises a\
+                :class:`ZeroDivisionError`. Here, the result is 0.0
+    """
+
+    def __init__(
+            self,
+            grafos: Dict[str, DiGraph],
+            isBFS: bool = True,
+            roundp: int = 2) -> None:
+        self.isBFS: bool = isBFS
+        self.roundp: int = roundp
+        self.competences: List[str] = list(grafos.keys())
+
+        # tabela de disciplinas (colunas da matriz de notas)
+        self.subjects: List[str] = []
+        self.position: Dict[str, int] = {}
+        for grafo in grafos.values():
+            for sigla in grafo:
+                if sigla not in self.position:
+                    self.position[sigla] = len(self.subjects)
+                    self.subjects.append(sigla)
+
+        if isBFS:
+            self._compile_bfs(grafos)
+        else:
+            self._compile_dfs(grafos)
+
+        logger.debug(
+            f'Scoring engine compiled: {len(self.competences)} competences, {len(self.subjects)} nodes')
+
+    def _compile_bfs(self, grafos: Dict[str, DiGraph]) -> None:
+        """
+        Compile the graphs into three operators (like :meth:`modules.grid.Competence.BFS.walk`):
+
+        1. :attr:`_edges`: maps the subjects scores to the sum of the edges that leave them
+        2. :attr:`_periods`: maps those sums to the sum of each period of each competence
+        3. :attr:`_competences`: maps the (rounded) periods sums to the accumulated of each competence
+
+        Args
+        ----
+        `grafos`:
+            A dictionary mapping competences to graphs equivalent.
+        """
+        # os grafos de um CompetenceGraphSet compartilham os mesmos nós
+        shared: Optional[PeriodIndex] = grafos.index \
+            if isinstance(grafos, CompetenceGraphSet) else None
+
+        # uma linha para cada matéria (com filhos) de cada período de cada competência
+        edges: List[List[Tuple[int, float]]] = []
+        periods: List[List[Tuple[int, float]]] = []
+        competences: List[List[Tuple[int, float]]] = []
+        for grafo in grafos.values():
+            periodos: PeriodIndex = shared if shared is not None \
+                else PeriodIndex(grafo)
+            competence: List[Tuple[int, float]] = []
+            for p in periodos:
+                period: List[Tuple[int, float]] = []
+                for m in periodos[p]:
+                    # nota_do_aluno * aresta, para cada filho (se não tiver filhos, pula)
+                    filhos = grafo[m]
+                    if len(filhos):
+                        period.append((len(edges), 1.0))
+                        edges.append([
+                            (self.position[m], data['weight']) for data in filhos.values()])
+                if period:
+                    competence.append((len(periods), 1.0))
+                    periods.append(period)
+            competences.append(competence)
+
+        self._edges: ELL = _ell(edges)
+        self._periods: ELL = _ell(periods)
+        self._competences: ELL = _ell(competences)
+
+    def _compile_dfs(self, grafos: Dict[str, DiGraph]) -> None:
+        """
+        Compile the graphs into levels (like :meth:`modules.grid.Competence.DFS._dag_walk`). The nodes\
+            of each level only depends on the nodes of the previous levels, so each level is a single\
+                sparse product.
+
+        Args
+        ----
+        `grafos`:
+            A dictionary mapping competences to graphs equivalent.
+        """
+        self._levels: List[List[Tuple[np.ndarray, ELL]]] = []
+        self._leafs: List[np.ndarray] = []
+        self._roots: List[List[int]] = []
+
+        for grafo in grafos.values():
+            # altura de cada nó (maior distância até uma folha)
+            altura: Dict[str, int] = {}
+            for materia in reversed(list(topological_sort(grafo))):
+                altura[materia] = 1 + max(
+                    (altura[f] for f in grafo[materia]), default=-1)
+
+            niveis: Dict[int, List[str]] = {}
+            for materia, h in altura.items():
+                niveis.setdefault(h, []).append(materia)
+
+            self._leafs.append(np.array(
+                [self.position[m] for m in niveis.get(0, [])], dtype=np.intp))
+            self._levels.append([
+                (np.array([self.position[m] for m in niveis[h]], dtype=np.intp),
+                 _ell([[(self.position[f], data['weight'])
+                        for f, data in grafo[m].items()] for m in niveis[h]]))
+                for h in sorted(niveis) if h > 0])
+            self._roots.append(
+                [self.position[m] for m in self._get_roots(grafo)])
+
+    @staticmethod
+    def _get_roots(grafo: DiGraph) -> List[str]:
+        """
+        Get the nodes where the walks start, the same ones used by :meth:`modules.grid.Competence.DFS.walk`
+
+        Args
+        ----
+        `grafo`:
+            A graph equivalent to some competency.
+
+        Returns
+        -------
+        List[str]
+            The nodes of the period of the first edge, that have successors
+        """
+        edges = list(grafo.edges())
+        if not edges:
+            return []
+        periodo = grafo.nodes[edges[0][0]]['period']
+        return [k for k, v in grafo.nodes(data='period')
+                if v == periodo and len(grafo[k])]
+
+    def grades(
+            self,
+            notas: Union[Sequence[Dict[str, float]], DataFrame]) -> np.ndarray:
+        """
+        Create the grades matrix (students × :attr:`subjects`).
+
+        Args
+        ----
+        `notas`:
+            A list of dictionaries, mapping class acronym to a given score (one for each student),\
+                or a DataFrame where each row is a student and each column is a class acronym.
+
+        Returns
+        -------
+        np.ndarray
+            A matrix (students × subjects). The subjects that the student didn't take are `NaN`.
+
+        Note
+        ----
+        The classes that aren't in the graphs are ignored.
+        """
+        if isinstance(notas, DataFrame):
+            return notas.reindex(columns=self.subjects).to_numpy(dtype=np.float64)
+
+        result = np.full((len(notas), len(self.subjects)), np.nan)
+        for i, aluno in enumerate(notas):
+            for sigla, nota in aluno.items():
+                j: Optional[int] = self.position.get(sigla)
+                if j is not None:
+                    result[i, j] = nota
+        return result
+
+    def score(self, notas: np.ndarray) -> np.ndarray:
+        """
+        Score all students over all competences.
+
+        Args
+        ----
+        `notas`:
+            The grades matrix (students × :attr:`subjects`), see :meth:`grades`.
+
+        Returns
+        -------
+        np.ndarray
+            A matrix (students × :attr:`competences`)
+        """
+        notas = np.asarray(notas, dtype=np.float64)
+        if notas.ndim != 2 or notas.shape[1] != len(self.subjects):
+            raise ValueError(
+                f'Expected a matrix with {len(self.subjects)} columns (subjects), got {notas.shape}')
+        if self.isBFS:
+            return self._score_bfs(notas)
+        return self._score_dfs(notas)
+
+    def _score_bfs(self, notas: np.ndarray) -> np.ndarray:
+        """
+        See :meth:`modules.grid.Competence.BFS.walk`
+        """
+        # quem não fez a matéria não contribui com o período
+        fatores: np.ndarray = np.nan_to_num(notas/10, nan=0.0)
+        # somatório de cada período (de cada competência)
+        s: np.ndarray = _product(_product(fatores, self._edges), self._periods)
+
+        # somente altera o acumulado se ouve somatório
+        ativo: np.ndarray = s > 0.0
+        a: np.ndarray = _product(
+            np.where(ativo, Numeric.around(s, self.roundp), 0.0), self._competences)
+        # contador de períodos que tiveram esta matéria
+        c: np.ndarray = _product(ativo.astype(np.float64), self._competences)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(c > 0, Numeric.around(a/c, self.roundp), 0.0)
+
+    def _score_dfs(self, notas: np.ndarray) -> np.ndarray:
+        """
+        See :meth:`modules.grid.Competence.DFS._dag_walk`
+        """
+        # quem não fez a matéria apenas propaga o acumulado
+        fatores: np.ndarray = np.nan_to_num(notas/10, nan=1.0)
+        alunos: int = notas.shape[0]
+
+        result = np.zeros((alunos, len(self.competences)))
+        for i in range(len(self.competences)):
+            # contribuição de cada nó (valor que chega no fim para cada 1.0 que sai dele)
+            downstream = np.zeros((alunos, len(self.subjects)))
+            downstream[:, self._leafs[i]] = 1.0
+            for nodes, operator in self._levels[i]:
+                downstream[:, nodes] = fatores[:, nodes] * \
+                    _product(downstream, operator)
+            for raiz in self._roots[i]:
+                result[:, i] += downstream[:, raiz]
+        return result
@@ -5,5 +5,11 @@ This object returns grid's scrapping. It has modules/functions to:
 - Search/generate a given grid. :mod:`.Grid`
 - Methods to retrieve/store the graph in the database. :mod:`.Database`
 - Methods to iterate/walk over generated graphs. :mod:`.Competence`
+- A vectorized builder for the competence graphs. :mod:`.Builder`
+- An on-disk cache for the competence graphs. :mod:`.Cache`
+- An index of the classes of each period. :mod:`.Period`
+- A container of competence graphs sharing the same nodes. :mod:`.GraphSet`
+- An incremental update of the competence graphs, when the skillset changes. :mod:`.Incremental`
+- A batch version of the walks, scoring many students at once. :mod:`.Scoring`
 - Methods to scrapping a new grid. :mod:`.Scrapping`
 """
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from typing import Dict
+import pickle
+import unittest
+from modules.grid import Builder
+from modules.grid import Competence
+from os import path
+import pandas as pd
+import networkx as nx
+
+
+def read_nodes(data_folder: str) -> nx.DiGraph:
+    """
+    A testing function, used to get the graph of nodes (classes) of the grid.
+    It's the 'web_graph.gpickle' without its edges and the last node.
+
+    Args
+    ----
+    `data_folder`:
+      The path to data folder (where the samples will be placed)
+
+    Returns
+    -------
+    nx.DiGraph
+      A graph containing only the classes (and its periods)
+    """
+    nodes: nx.DiGraph = nx.read_gpickle(
+        path.join(data_folder, 'web_graph.gpickle'))
+    nodes.remove_node(Builder.END_NODE)
+    nodes.remove_edges_from(list(nodes.edges()))
+    return nodes
+
+
+class TestBuilder(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data_folder: str = path.join(path.dirname(__file__), 'data')
+        cls.dataframe = pd.read_csv(
+            path.join(cls.data_folder, 'dataframe.csv'), index_col='Sigla')
+        cls.nodes = read_nodes(cls.data_folder)
+
+    def assertSameGraphs(
+            self,
+            expected: Dict[str, nx.DiGraph],
+            result: Dict[str, nx.DiGraph]):
+        self.assertListEqual(list(expected.keys()), list(result.keys()))
+        for competencia in expected:
+            self.assertListEqual(
+                list(expected[competencia].edges(data='weight')),
+                list(result[competencia].edges(data='weight')),
+                competencia)
+            self.assertDictEqual(
+                dict(expected[competencia].nodes(data='period')),
+                dict(result[competencia].nodes(data='period')),
+                competencia)
+
+    def test_skillset_matrix(self):
+        matrix = Builder.SkillsetMatrix(self.dataframe)
+        self.assertEqual(self.dataframe.shape, matrix.values.shape)
+        self.assertEqual(
+            self.dataframe.loc['ECOI04']['Desenvolvimento Web e Mobile'],
+            matrix.values[
+                matrix.index['ECOI04'],
+                matrix.columns['Desenvolvimento Web e Mobile']])
+        self.assertListEqual(
+            ['ECOI04', 'MATI01'],
+            matrix.names(matrix.rows(['ECOI04', 'MATI01'])))
+
+    def test_generate_graphs_DFS(self):
+        expected = Competence._generate_competency_graphs(
+            self.dataframe, self.nodes)
+        result = Competence.DFS.generate_graphs(self.dataframe, self.nodes)
+        self.assertSameGraphs(expected, result)
+
+    def test_generate_graphs_BFS(self):
+        expected = Competence._generate_competency_graphs(
+            self.dataframe, self.nodes, isBFS=True)
+        result = Competence.BFS.generate_graphs(self.dataframe, self.nodes)
+        self.assertSameGraphs(expected, result)
+
+    def test_generate_graphs_web(self):
+        expected: nx.DiGraph = nx.read_gpickle(
+            path.join(self.data_folder, 'web_graph.gpickle'))
+        result = Builder.generate_graphs(
+            self.dataframe, self.nodes, isBFS=True)
+        self.assertSetEqual(
+            set(expected.edges(data='weight')),
+            set(result['Desenvolvimento Web e Mobile'].edges(data='weight')))
+
+    def test_generate_graphs_lazy(self):
+        expected = Builder.generate_graphs(
+            self.dataframe, self.nodes, isBFS=True)
+        result = Competence.BFS.generate_graphs(
+            self.dataframe, self.nodes, lazy=True)
+        self.assertIsInstance(result, Builder.LazyGraphs)
+
+        # nenhum grafo é criado ao listar as competências
+        self.assertListEqual(list(expected), list(result))
+        self.assertEqual(len(expected), len(result))
+        self.assertListEqual([], result.built)
+
+        web = 'Desenvolvimento Web e Mobile'
+        self.assertIs(result[web], result[web])
+        self.assertListEqual([web], result.built)
+        self.assertListEqual(
+            list(expected[web].nodes(data=True)),
+            list(result[web].nodes(data=True)))
+
+        with self.assertRaises(KeyError):
+            result['Não existe']
+
+        self.assertSameGraphs(expected, result)
+
+    def test_generate_graphs_lazy_copy_nodes(self):
+        nodes = self.nodes.copy()
+        result = Builder.generate_graphs(self.dataframe, nodes, lazy=True)
+        nodes.add_node('XXXX00', period='1')
+        self.assertNotIn('XXXX00', result['PAA'])
+
+    def test_generate_graphs_lazy_workers(self):
+        # os grafos lazy são criados no processo atual
+        with self.assertRaises(ValueError):
+            Builder.generate_graphs(
+                self.dataframe, self.nodes, lazy=True, workers=2)
+
+    def test_generate_graphs_workers(self):
+        for isBFS in (True, False):
+            expected = Builder.generate_graphs(
+                self.dataframe, self.nodes, isBFS=isBFS)
+            result = Builder.generate_graphs(
+                self.dataframe, self.nodes, isBFS=isBFS, workers=2)
+            self.assertListEqual(list(expected), list(result))
+            for competencia in expected:
+                self.assertEqual(
+                    pickle.dumps(expected[competencia]),
+                    pickle.dumps(result[competencia]),
+                    competencia)
+
+        expected = Builder.generate_graph_set(self.dataframe, self.nodes)
+        result = Competence.DFS.generate_graphs(
+            self.dataframe, self.nodes, shared=True, workers=2)
+        self.assertEqual(pickle.dumps(expected), pickle.dumps(result))
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from typing import Dict
+import os
+import tempfile
+import unittest
+from unittest import mock
+from modules.grid import Builder
+from modules.grid import Competence
+from modules.grid.Cache import GraphCache
+from modules.grid.tests.test_Builder import read_nodes
+from os import path
+import pandas as pd
+import networkx as nx
+
+
+class TestGraphCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data_folder: str = path.join(path.dirname(__file__), 'data')
+        cls.dataframe = pd.read_csv(
+            path.join(cls.data_folder, 'dataframe.csv'), index_col='Sigla')
+        cls.nodes = read_nodes(cls.data_folder)
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cache = GraphCache(self.folder.name)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def assertSameGraphs(
+            self,
+            expected: Dict[str, nx.DiGraph],
+            result: Dict[str, nx.DiGraph]):
+        self.assertListEqual(list(expected), list(result))
+        for competencia in expected:
+            self.assertListEqual(
+                list(expected[competencia].nodes(data=True)),
+                list(result[competencia].nodes(data=True)))
+            self.assertListEqual(
+                list(expected[competencia].edges(data=True)),
+                list(result[competencia].edges(data=True)))
+
+    def test_key(self):
+        key = GraphCache.key(self.dataframe, self.nodes, isBFS=True)
+        self.assertEqual(
+            key, GraphCache.key(self.dataframe.copy(), self.nodes.copy(), isBFS=True))
+        self.assertNotEqual(key, GraphCache.key(self.dataframe, self.nodes))
+        self.assertNotEqual(key, GraphCache.key(
+            self.dataframe, self.nodes, isBFS=True, roundp=3))
+
+        # uma célula alterada
+        changed = self.dataframe.copy()
+        changed.iloc[0, 0] += 0.01
+        self.assertNotEqual(
+            key, GraphCache.key(changed, self.nodes, isBFS=True))
+
+        # um período alterado
+        nodes = self.nodes.copy()
+        nodes.nodes['ECOI04']['period'] = '3'
+        self.assertNotEqual(
+            key, GraphCache.key(self.dataframe, nodes, isBFS=True))
+
+    def test_generate_graphs(self):
+        for isBFS in (True, False):
+            expected = Builder.generate_graphs(
+                self.dataframe, self.nodes, isBFS=isBFS)
+            # miss
+            self.assertSameGraphs(expected, self.cache.generate_graphs(
+                self.dataframe, self.nodes, isBFS=isBFS))
+            # hit
+            self.assertSameGraphs(expected, self.cache.generate_graphs(
+                self.dataframe, self.nodes, isBFS=isBFS))
+        self.assertEqual(2, len(os.listdir(self.folder.name)))
+
+    def test_generate_graphs_shared(self):
+        expected = Builder.generate_graph_set(
+            self.dataframe, self.nodes, isBFS=True)
+        self.cache.generate_graphs(self.dataframe, self.nodes, isBFS=True)
+        result = self.cache.generate_graphs(
+            self.dataframe, self.nodes, isBFS=True, shared=True)
+        self.assertSameGraphs(expected, result)
+        self.assertListEqual(expected.nodes, result.nodes)
+
+    def test_competence(self):
+        expected = Competence.BFS.generate_graphs(self.dataframe, self.nodes)
+        result = Competence.BFS.generate_graphs(
+            self.dataframe, self.nodes, cache=self.cache)
+        self.assertSameGraphs(expected, result)
+        self.assertTrue(path.isfile(self.cache.path(
+            GraphCache.key(self.dataframe, self.nodes, isBFS=True))))
+
+    def test_unitary(self):
+        # a competência existe em um único período (usa a matéria com 100%)
+        nodes = nx.DiGraph()
+        nodes.add_node('A', period='1')
+        nodes.add_node('B', period='2')
+        out = pd.DataFrame(
+            {'C': [0.5, 0.0, 1.0], 'D': [0.5, 0.5, 0.0]}, index=['A', 'B', 'X'])
+        expected = Builder.generate_graphs(out, nodes)
+        self.cache.generate_graphs(out, nodes)
+        self.assertSameGraphs(expected, self.cache.generate_graphs(out, nodes))
+
+    def test_invalid_bundle(self):
+        key = GraphCache.key(self.dataframe, self.nodes)
+        with open(self.cache.path(key), 'wb') as f:
+            f.write(b'not a bundle')
+        self.assertIsNone(self.cache.load(key))
+        self.assertFalse(path.exists(self.cache.path(key)))
+
+        # um bundle truncado
+        filepath = self.cache.save(
+            key, Builder.generate_graph_set(self.dataframe, self.nodes), base=0)
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        with open(filepath, 'wb') as f:
+            f.write(data[:len(data)//2])
+        self.assertIsNone(self.cache.load(key))
+        self.assertFalse(path.exists(filepath))
+
+    def test_save_error(self):
+        grafos = Builder.generate_graph_set(self.dataframe, self.nodes)
+        with mock.patch('numpy.savez_compressed', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                self.cache.save('a', grafos, base=0)
+        # o arquivo temporário é removido
+        self.assertListEqual([], os.listdir(self.folder.name))
+
+    def test_evict(self):
+        first = self.cache.save(
+            'a', Builder.generate_graph_set(self.dataframe, self.nodes), base=0)
+        os.utime(first, (0, 0))
+        size = path.getsize(first)
+
+        self.cache.max_bytes = int(size * 1.5)
+        second = self.cache.save(
+            'b', Builder.generate_graph_set(self.dataframe, self.nodes, isBFS=True), base=0)
+        self.assertFalse(path.exists(first))
+        self.assertTrue(path.exists(second))
+
+        self.cache.clear()
+        self.assertListEqual([], os.listdir(self.folder.name))
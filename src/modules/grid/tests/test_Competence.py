@@ -52,6 +52,9 @@ class TestCompetence(unittest.TestCase):
         result: List[int] = [i for i in get_period()]
         expected: List[int] = [i for i in range(1, 11)]
         self.assertListEqual(expected, result)
+        # longer programmes
+        result = [i for i in get_period(12)]
+        self.assertListEqual([i for i in range(1, 13)], result)
 
     def test_get_period_classes(self):
         ...
@@ -102,3 +105,18 @@ class TestCompetence(unittest.TestCase):
         notas = Competence.BFS.walk(graph, self.scores, roundp=2)
         # TEST
         self.assertEqual(expected, notas['Desenvolvimento Web e Mobile'])
+
+    def test_DFS_walk_memoized(self):
+        scores: Dict[str, float] = read_scores_csv(self.data_folder)
+        graph: Dict[str, nx.DiGraph] = {
+            'Desenvolvimento Web e Mobile':
+            nx.read_gpickle(
+                path.join(self.data_folder, 'web_graph.gpickle'))}
+        for notas in [scores, {}, {'HUMI01': 7.0, 'ECOI25': 9.8}]:
+            # reference: the recursive walk (every path)
+            expected = Competence.DFS.walk(graph, notas, memoized=False)
+            result = Competence.DFS.walk(graph, notas)
+            # os mesmos totais (com os mesmos arredondamentos)
+            self.assertEqual(
+                expected['Desenvolvimento Web e Mobile'],
+                result['Desenvolvimento Web e Mobile'])
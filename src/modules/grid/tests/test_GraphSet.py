@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import pickle
+import unittest
+from modules.grid import Builder
+from modules.grid import Competence
+from modules.grid.GraphSet import CompetenceGraphSet
+from modules.grid.tests.test_Builder import read_nodes
+from modules.grid.tests.test_Competence import read_scores_csv
+from os import path
+import pandas as pd
+import networkx as nx
+
+
+class TestCompetenceGraphSet(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data_folder: str = path.join(path.dirname(__file__), 'data')
+        cls.dataframe = pd.read_csv(
+            path.join(cls.data_folder, 'dataframe.csv'), index_col='Sigla')
+        cls.nodes = read_nodes(cls.data_folder)
+        cls.expected = Builder.generate_graphs(
+            cls.dataframe, cls.nodes, isBFS=True)
+        cls.graphs = Builder.generate_graph_set(
+            cls.dataframe, cls.nodes, isBFS=True)
+
+    def test_same_graphs(self):
+        self.assertListEqual(list(self.expected), list(self.graphs))
+        for competencia, expected in self.expected.items():
+            result: nx.DiGraph = self.graphs[competencia]
+            self.assertListEqual(
+                list(expected.nodes(data=True)), list(result.nodes(data=True)))
+            self.assertListEqual(
+                list(expected.edges(data=True)), list(result.edges(data=True)))
+            for node in expected:
+                self.assertListEqual(
+                    list(expected.predecessors(node)),
+                    list(result.predecessors(node)))
+
+    def test_successors(self):
+        for competencia, expected in self.expected.items():
+            result: nx.DiGraph = self.graphs[competencia]
+            self.assertIs(result._adj, result._succ)
+            self.assertListEqual(list(expected.edges()), list(result.edges()))
+            for node in expected:
+                self.assertListEqual(
+                    list(expected.successors(node)), list(result.successors(node)))
+                self.assertEqual(expected.out_degree(node), result.out_degree(node))
+
+    def test_shared_nodes(self):
+        a = self.graphs['PAA'].nodes['ECOI04']
+        b = self.graphs['Engenharia de software'].nodes['ECOI04']
+        self.assertIs(a, b)
+
+    def test_read_only(self):
+        grafo = self.graphs['PAA']
+        with self.assertRaises(nx.NetworkXError):
+            grafo.add_edge('ECOI04', 'ECOI09')
+        # a copy can be modified
+        copy = grafo.copy()
+        copy.add_edge('ECOI04', 'ECOI09', weight=1.0)
+        self.assertEqual(1.0, copy['ECOI04']['ECOI09']['weight'])
+
+    def test_walk(self):
+        scores = read_scores_csv(self.data_folder)
+        self.assertDictEqual(
+            Competence.BFS.walk(self.expected, scores),
+            Competence.BFS.walk(self.graphs, scores))
+
+        web = 'Desenvolvimento Web e Mobile'
+        self.assertDictEqual(
+            Competence.DFS.walk({web: self.expected[web]}, scores),
+            Competence.DFS.walk({web: self.graphs[web]}, scores))
+
+    def test_from_graphs(self):
+        graphs = CompetenceGraphSet.from_graphs(self.expected)
+        self.assertListEqual(list(self.expected), list(graphs))
+        self.assertListEqual(
+            list(self.expected['PAA'].edges(data=True)),
+            list(graphs['PAA'].edges(data=True)))
+
+    def test_pickle(self):
+        graphs = pickle.loads(pickle.dumps(self.graphs))
+        self.assertListEqual(
+            list(self.graphs['PAA'].edges(data=True)),
+            list(graphs['PAA'].edges(data=True)))
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+from typing import Dict
+import unittest
+from modules.grid import Builder
+from modules.grid.Incremental import IncrementalGraphs
+from modules.grid.tests.test_Builder import read_nodes
+from os import path
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+
+class TestIncrementalGraphs(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data_folder: str = path.join(path.dirname(__file__), 'data')
+        cls.dataframe = pd.read_csv(
+            path.join(cls.data_folder, 'dataframe.csv'), index_col='Sigla')
+        cls.nodes = read_nodes(cls.data_folder)
+
+    def assertSameGraphs(
+            self,
+            expected: Dict[str, nx.DiGraph],
+            result: Dict[str, nx.DiGraph]):
+        self.assertListEqual(list(expected), list(result))
+        for competencia in expected:
+            a, b = expected[competencia], result[competencia]
+            self.assertListEqual(
+                list(a.nodes(data=True)), list(b.nodes(data=True)), competencia)
+            self.assertListEqual(
+                list(a.edges(data=True)), list(b.edges(data=True)), competencia)
+            for node in a:
+                self.assertListEqual(
+                    list(a.predecessors(node)), list(b.predecessors(node)))
+
+    def test_update(self):
+        grafos = IncrementalGraphs(self.dataframe, self.nodes, isBFS=True)
+        out = self.dataframe.copy()
+        out.loc['ECOI04', 'PAA'] = 0.3
+
+        self.assertListEqual(['PAA'], grafos.update({('ECOI04', 'PAA'): 0.3}))
+        self.assertSameGraphs(
+            Builder.generate_graphs(out, self.nodes, isBFS=True), grafos)
+        # o dataframe original não é alterado
+        self.assertNotEqual(0.3, self.dataframe.loc['ECOI04', 'PAA'])
+        # nada mudou
+        self.assertListEqual([], grafos.update({('ECOI04', 'PAA'): 0.3}))
+
+        with self.assertRaises(KeyError):
+            grafos.update({('XXXX00', 'PAA'): 0.3})
+
+    def test_update_frame(self):
+        rng = np.random.default_rng(0)
+        for isBFS in (True, False):
+            for shared in (True, False):
+                grafos = Builder.generate_graph_set(
+                    self.dataframe, self.nodes, isBFS=isBFS) if shared else None
+                result = IncrementalGraphs(
+                    self.dataframe, self.nodes, isBFS=isBFS, grafos=grafos)
+
+                out = self.dataframe.copy()
+                for _ in range(10):
+                    # altera algumas células (zerando períodos, criando "unitary", ...)
+                    for _ in range(rng.integers(1, 6)):
+                        i = rng.integers(out.shape[0])
+                        j = rng.integers(out.shape[1])
+                        out.iat[i, j] = rng.choice(
+                            [0.0, 1.0, float(np.round(rng.random(), 3))])
+                    result.update_frame(out)
+
+                    expected = Builder.generate_graph_set(
+                        out, self.nodes, isBFS=isBFS) if shared \
+                        else Builder.generate_graphs(out, self.nodes, isBFS=isBFS)
+                    self.assertSameGraphs(expected, result)
+
+    def test_update_frame_invalid(self):
+        grafos = IncrementalGraphs(self.dataframe, self.nodes)
+        with self.assertRaises(ValueError):
+            grafos.update_frame(self.dataframe.iloc[1:])
+
+    def test_unitary(self):
+        # a competência "C" existe em um único período (usa a matéria com 100%)
+        nodes = nx.DiGraph()
+        nodes.add_node('A', period='1')
+        nodes.add_node('B', period='2')
+        out = pd.DataFrame(
+            {'C': [0.5, 0.0, 1.0], 'D': [0.5, 0.5, 0.0]}, index=['A', 'B', 'X'])
+        grafos = IncrementalGraphs(out, nodes)
+        self.assertIn('X', grafos['C'])
+
+        # 'X' deixa de ser a "unitary", 'A' passa a ser
+        self.assertListEqual(
+            ['C', 'D'], grafos.update({('X', 'C'): 0.0, ('A', 'D'): 1.0}))
+        out.loc['X', 'C'] = 0.0
+        out.loc['A', 'D'] = 1.0
+        self.assertSameGraphs(Builder.generate_graphs(out, nodes), grafos)
+        self.assertNotIn('X', grafos['C'])
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from typing import List
+import unittest
+from modules.grid import Period
+from modules.grid import Builder
+from modules.grid import Competence
+import networkx as nx
+import pandas as pd
+
+
+class TestPeriodIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.nodes = nx.DiGraph()
+        self.nodes.add_node('A', period='1')
+        self.nodes.add_node('B', period='2')
+        self.nodes.add_node('C', period='1')
+        self.nodes.add_node('D', period='Optativa')
+        self.nodes.add_node('E', period='Complementar')
+        self.nodes.add_node('F', period='12')
+
+    def test_normalize(self):
+        self.assertEqual(3, Period.normalize('3'))
+        self.assertEqual(3, Period.normalize(3))
+        self.assertEqual(Period.OPTATIVA, Period.normalize('Optativa'))
+
+    def test_buckets(self):
+        index = Period.PeriodIndex(self.nodes)
+        self.assertListEqual(['A', 'C'], index[1].tolist())
+        self.assertListEqual(['A', 'C'], index['1'].tolist())
+        self.assertListEqual(['D'], index[Period.OPTATIVA].tolist())
+        self.assertListEqual(['E'], index[Period.COMPLEMENTAR].tolist())
+        self.assertListEqual([], index[5].tolist())
+        self.assertEqual(2, index.period['B'])
+
+    def test_length(self):
+        index = Period.PeriodIndex(self.nodes)
+        self.assertEqual(12, len(index))
+        self.assertListEqual(list(range(1, 13)), list(index))
+
+        self.nodes.remove_node('F')
+        index = Period.PeriodIndex(self.nodes)
+        self.assertEqual(Period.DEFAULT_PERIODS, len(index))
+
+    def test_long_programme(self):
+        # a grid with 12 periods, where the competence only appears after the 10th
+        nodes = nx.DiGraph()
+        subjects: List[str] = []
+        for p in range(1, 13):
+            subjects.append(f'S{p}')
+            nodes.add_node(f'S{p}', period=str(p))
+        out = pd.DataFrame(
+            {'C': [0.0]*9 + [0.5, 0.25, 0.25]}, index=subjects)
+
+        expected = Competence._generate_competency_graphs(out, nodes)['C']
+        result = Builder.generate_graphs(out, nodes)['C']
+
+        self.assertListEqual(
+            [('S10', 'S11', 1.0), ('S11', 'S12', 1.0),
+             ('S12', Builder.END_NODE, 1.0)],
+            list(result.edges(data='weight')))
+        self.assertListEqual(
+            list(expected.edges(data='weight')),
+            list(result.edges(data='weight')))
+        self.assertEqual(13, result.nodes[Builder.END_NODE]['period'])
+
+        notas = Competence.BFS.walk({'C': result}, {'S12': 10.0})
+        self.assertEqual(1.0, notas['C'])
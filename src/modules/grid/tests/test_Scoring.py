@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from typing import Dict, List
+import unittest
+from modules.grid import Builder
+from modules.grid import Competence
+from modules.grid.Scoring import ScoringEngine
+from modules.grid.tests.test_Builder import read_nodes
+from modules.grid.tests.test_Competence import read_scores_csv
+from os import path
+import numpy as np
+import pandas as pd
+
+
+class TestScoringEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data_folder: str = path.join(path.dirname(__file__), 'data')
+        cls.dataframe = pd.read_csv(
+            path.join(cls.data_folder, 'dataframe.csv'), index_col='Sigla')
+        cls.nodes = read_nodes(cls.data_folder)
+        cls.scores = read_scores_csv(cls.data_folder)
+
+        # um grupo de alunos: o do teste, o ideal e alguns aleatórios
+        rng = np.random.default_rng(42)
+        subjects: List[str] = list(cls.nodes)
+        cls.cohort: List[Dict[str, float]] = [
+            cls.scores, {s: 10.0 for s in subjects}]
+        for _ in range(20):
+            taken = rng.random(len(subjects)) < 0.7
+            cls.cohort.append({
+                s: float(np.round(rng.uniform(0, 10), 1))
+                for s, t in zip(subjects, taken) if t})
+
+    def test_grades(self):
+        engine = ScoringEngine(
+            Builder.generate_graphs(self.dataframe, self.nodes, isBFS=True))
+        notas = engine.grades([{'ECOI04': 7.0, 'XXXX00': 5.0}, {}])
+        self.assertEqual((2, len(engine.subjects)), notas.shape)
+        self.assertEqual(7.0, notas[0, engine.position['ECOI04']])
+        self.assertEqual(1, np.count_nonzero(~np.isnan(notas)))
+
+        frame = pd.DataFrame([{'ECOI04': 7.0}])
+        np.testing.assert_array_equal(notas[:1], engine.grades(frame))
+
+        with self.assertRaises(ValueError):
+            engine.score(np.zeros((1, 3)))
+
+    def test_BFS(self):
+        grafos = Competence.BFS.generate_graphs(self.dataframe, self.nodes)
+        engine = ScoringEngine(grafos, isBFS=True)
+        result = engine.score(engine.grades(self.cohort))
+        self.assertEqual(
+            (len(self.cohort), len(engine.competences)), result.shape)
+
+        for i, notas in enumerate(self.cohort):
+            expected = Competence.BFS.walk(grafos, notas)
+            self.assertListEqual(
+                list(expected.values()), result[i].tolist())
+
+    def test_BFS_without_scores(self):
+        grafos = Competence.BFS.generate_graphs(self.dataframe, self.nodes)
+        engine = ScoringEngine(grafos, isBFS=True)
+        result = engine.score(engine.grades([{}]))
+        self.assertListEqual([0.0]*len(grafos), result[0].tolist())
+
+    def test_BFS_shared(self):
+        grafos = Competence.BFS.generate_graphs(
+            self.dataframe, self.nodes, shared=True)
+        engine = ScoringEngine(grafos, isBFS=True)
+        result = engine.score(engine.grades(self.cohort))
+        for i, notas in enumerate(self.cohort):
+            expected = Competence.BFS.walk(grafos, notas)
+            self.assertListEqual(
+                list(expected.values()), result[i].tolist())
+
+    def test_DFS(self):
+        grafos = Competence.DFS.generate_graphs(self.dataframe, self.nodes)
+        engine = ScoringEngine(grafos, isBFS=False)
+        cohort = self.cohort + [{}]
+        result = engine.score(engine.grades(cohort))
+
+        for i, notas in enumerate(cohort):
+            # a propagação sem arredondamentos (veja DFS._dag_walk)
+            expected = [
+                Competence.DFS._dag_walk(notas, grafo, ScoringEngine._get_roots(grafo))
+                for grafo in grafos.values()]
+            self.assertListEqual(expected, result[i].tolist())
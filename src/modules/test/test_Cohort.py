@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from typing import Dict
+import json
+import pickle
+import tempfile
+import unittest
+from os import path
+import numpy as np
+import pandas as pd
+from modules import Cohort
+from modules import Score
+from modules.grid import Competence
+from modules.grid.tests.test_Builder import read_nodes
+
+
+class TestCohort(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        data_folder: str = path.join(
+            path.dirname(__file__), '..', 'grid', 'tests', 'data')
+        dataframe = pd.read_csv(
+            path.join(data_folder, 'dataframe.csv'), index_col='Sigla')
+        cls.nodes = read_nodes(data_folder)
+        cls.grafos = Competence.BFS.generate_graphs(dataframe, cls.nodes)
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.directory: str = self.folder.name
+
+        # históricos simulados (no formato do Score.parse_pdf)
+        rng = np.random.default_rng(7)
+        self.histories: Dict[str, dict] = {}
+        for i in range(9):
+            history = {'2016.1': {}, '2016.2': {}}
+            for sigla in self.nodes:
+                periodo = history['2016.1' if rng.random() < 0.5 else '2016.2']
+                periodo[sigla] = {
+                    'scores': float(np.round(rng.uniform(5, 10), 1)),
+                    'situation': 'APR',
+                    'freq': 100.0}
+            self.histories[f'20160{i:02d}'] = history
+            with open(path.join(self.directory, f'20160{i:02d}.json'), 'w') as f:
+                f.write(json.dumps(history))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_list_histories(self):
+        files = Cohort.list_histories(self.directory)
+        self.assertEqual(9, len(files))
+        self.assertListEqual(sorted(files), files)
+
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as out:
+            output = path.join(out, 'competences.csv')
+            total = Cohort.run(
+                self.directory, self.grafos, output, workers=2, chunksize=2)
+            self.assertEqual(9, total)
+
+            result = pd.read_csv(output, index_col=Cohort.STUDENT, dtype={
+                Cohort.STUDENT: str})
+
+        self.assertListEqual(sorted(self.histories), result.index.tolist())
+        self.assertListEqual(list(self.grafos), result.columns.tolist())
+        for aluno, history in self.histories.items():
+            expected = Competence.BFS.walk(
+                self.grafos, Score.best_scores(history))
+            self.assertListEqual(
+                list(expected.values()), result.loc[aluno].tolist())
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as out:
+            graphs: str = path.join(out, 'grafos.pickle')
+            with open(graphs, 'wb') as f:
+                pickle.dump(self.grafos, f)
+            output: str = path.join(out, 'competences.csv')
+            Cohort.main([self.directory, output, '--graphs', graphs,
+                         '--workers', '1'])
+            result = pd.read_csv(output, index_col=Cohort.STUDENT)
+        self.assertEqual(9, len(result))
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import unittest
+from modules import Numeric
+import numpy as np
+
+
+class TestNumeric(unittest.TestCase):
+    def test_around(self):
+        rng = np.random.default_rng(0)
+        values = np.concatenate([
+            rng.random(1000)*10,
+            # empates (na escala decimal)
+            np.array([2.675, 0.615, 0.285, 1.005, 0.125, -2.675]),
+            np.arange(0, 10, 0.005)])
+        for roundp in [1, 2, 4]:
+            expected = [round(float(v), roundp) for v in values]
+            self.assertListEqual(expected, Numeric.around(values, roundp).tolist())
+
+    def test_around_matrix(self):
+        values = np.array([[2.675, np.nan], [0.615, 1.0]])
+        result = Numeric.around(values, 2)
+        self.assertTupleEqual((2, 2), result.shape)
+        np.testing.assert_array_equal([[2.67, np.nan], [0.61, 1.0]], result)
+
+    def test_broadcast_shapes(self):
+        self.assertTupleEqual((), Numeric.broadcast_shapes())
+        self.assertTupleEqual((), Numeric.broadcast_shapes((), ()))
+        self.assertTupleEqual((4,), Numeric.broadcast_shapes((4,), ()))
+        self.assertTupleEqual((3, 4), Numeric.broadcast_shapes((4,), (3, 1), (1, 4)))
+        self.assertTupleEqual((0, 2), Numeric.broadcast_shapes((0, 1), (2,)))
+        with self.assertRaises(ValueError):
+            Numeric.broadcast_shapes((3,), (4,))
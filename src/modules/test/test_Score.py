@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import unittest
+from modules import Score
 
 
 class TestScore(unittest.TestCase):
@@ -12,3 +13,17 @@ class TestScore(unittest.TestCase):
 
     def test_parse_pdf(self):
         ...
+
+    def test_best_scores(self):
+        student_grid = {
+            '2016.1': {
+                'MATI01': {'scores': 4.5, 'situation': 'REP', 'freq': 90.0},
+                'HUMI01': {'scores': 8.0, 'situation': 'APR', 'freq': 100.0},
+            },
+            '2016.2': {
+                'MATI01': {'scores': 7.0, 'situation': 'APR', 'freq': 95.0},
+                'ECOI04': {'scores': '--', 'situation': 'MATR', 'freq': '--'},
+            },
+        }
+        self.assertDictEqual(
+            {'MATI01': 7.0, 'HUMI01': 8.0}, Score.best_scores(student_grid))
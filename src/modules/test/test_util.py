@@ -2,8 +2,38 @@
 
 from typing import List
 import unittest
+import json
+import warnings
 import modules
 import modules.util
+from modules.ahp import Ahp
+from modules.ahp.RandomIndex import random_matrices
+from modules.ahp.Types import FormData, FormDataType
+from statistics import mean
+import numpy as np
+import pandas as pd
+
+
+def random_forms(n: int, seed: int = 0, consistent: int = 0) -> List[FormData]:
+    """
+    Create `n` random answers (some matrices aren't filled). The first `consistent` answers have\
+        consistent matrices (a[i][j] = w[i]/w[j]).
+    """
+    rng = np.random.default_rng(seed)
+    sizes = {'root': 3, 'q1': 6, 'q12': 3, 'q13': 6, 'q2': 5, 'q3': 4}
+    forms: List[FormData] = []
+    for i in range(n):
+        matrices = {}
+        for k, size in sizes.items():
+            matrices[k] = np.zeros((size, size)).tolist() if rng.random() < 0.2 \
+                else random_matrices(1, size, int(rng.integers(2**31)))[0].round(2).tolist()
+            if i < consistent:
+                w = rng.random(size) + 0.5
+                matrices[k] = (w[:, None] / w[None, :]).round(2).tolist()
+        matrices['q15'] = float(rng.choice([1/9, 1/3, 1, 3, 9]))
+        forms.append(FormData(
+            {'matrices': matrices, 'name': f'Resposta {i}', 'type': 'market'}))
+    return forms
 
 
 class TestBasics(unittest.TestCase):
@@ -30,17 +60,142 @@ class TestBasics(unittest.TestCase):
                     expected_result[row][col],
                     f"result[{row}][{col}] = {result[row][col]}")
 
+    def test_average_stack(self):
+        stack = random_matrices(30, 6, 0)
+        result = modules.util.average(stack)
+        self.assertIs(list, type(result))
+        self.assertTupleEqual((6, 6), np.shape(result))
+        for row in range(6):
+            for col in range(6):
+                self.assertAlmostEqual(
+                    round(mean(stack[:, row, col]), 4), result[row][col], 12)
+        # matrizes não quadradas
+        self.assertTupleEqual(
+            (2, 3), np.shape(modules.util.average(np.ones((3, 2, 3)))))
+
+    def test_average_geometric(self):
+        stack = random_matrices(30, 5, 0)
+        weights = np.arange(1, 31)
+
+        result = np.array(modules.util.average(
+            stack, roundp=12, mode=modules.util.GEOMETRIC, weights=weights))
+        expected = np.prod(stack ** (weights / weights.sum())[:, None, None], axis=0)
+        np.testing.assert_allclose(expected, result, atol=1e-11)
+        # a média geométrica mantém a reciprocidade
+        np.testing.assert_allclose(np.ones((5, 5)), result * result.T, atol=1e-10)
+
+        self.assertEqual(2.0, modules.util.average(
+            [1, 2, 4], mode=modules.util.GEOMETRIC))
+        self.assertEqual(0.0, modules.util.average(
+            [0, 2, 4], mode=modules.util.GEOMETRIC))
+
+        # um peso 0 ignora o elemento, mesmo que ele seja 0
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            result = modules.util.average(
+                [[[0, 2], [.5, 1]], [[1, 2], [.5, 1]]], mode=modules.util.GEOMETRIC, weights=[0, 1])
+        self.assertListEqual([[1.0, 2.0], [0.5, 1.0]], result)
+
+    def test_average_weights(self):
+        self.assertEqual(
+            2.5, modules.util.average([1.0, 3.0], weights=[1, 3]))
+        # um peso 0 ignora o elemento
+        result = modules.util.average(
+            [np.ones((3, 3)), np.zeros((3, 3))], weights=[1, 0])
+        np.testing.assert_array_equal(np.ones((3, 3)), result)
+
+        for weights in ([1], [1, -1], [0, 0]):
+            with self.assertRaises(ValueError):
+                modules.util.average([1.0, 3.0], weights=weights)
+        with self.assertRaises(ValueError):
+            modules.util.average([1.0, 3.0], mode='unknown')
+
     def test_raise_MinimumLenghtError(self):
-        ...
+        with self.assertRaises(modules.util.MinimumLenghtError):
+            modules.util.average([1.0])
 
     def test_raise_TypeError(self):
-        ...
+        with self.assertRaises(TypeError):
+            modules.util.average({1.0, 2.0})
+        with self.assertRaises(TypeError):
+            modules.util.average([[1.0, 2.0], [3.0, 4.0]])
+        with self.assertRaises(TypeError):
+            modules.util.average([[[1.0]], [[1.0, 2.0]]])
 
     def test_get_competences_and_consistency(self):
-        ...
+        forms = random_forms(20)
+        competences, consistency = modules.util.get_competences_and_consistency(
+            forms, FormDataType.MARKET)
+
+        self.assertListEqual(
+            modules.util.CONSISTENCY_COLUMNS, consistency.columns.to_list())
+        self.assertListEqual(
+            modules.util.COMPETENCES_COLUMNS,
+            competences.columns.to_list()[:len(modules.util.COMPETENCES_COLUMNS)])
+        self.assertEqual(20, len(competences))
+
+        for i, form in enumerate(forms):
+            self.assertEqual(form.getName(), consistency.loc[i, 'name'])
+            self.assertEqual('market', competences.loc[i, 'type'])
+            secoes = {}
+            for k, v in form.getMatrices().items():
+                if k == 'q15':
+                    secoes[k] = Ahp.get_q15_value(v)
+                elif v[0][0] != 0:
+                    cr, secoes[k] = Ahp.calculate(v)
+                    self.assertEqual(cr, consistency.loc[i, k])
+                else:
+                    secoes[k] = [0]*len(v)
+                    self.assertEqual(0, consistency.loc[i, k])
+            for competence, value in Ahp.Mapping.to_competences(secoes).items():
+                self.assertEqual(value, competences.loc[i, competence], competence)
+
+        # em paralelo, o resultado é o mesmo
+        parallel = modules.util.get_competences_and_consistency(
+            forms, FormDataType.MARKET, workers=2)
+        pd.testing.assert_frame_equal(competences, parallel[0])
+        pd.testing.assert_frame_equal(consistency, parallel[1])
+
+        empty = modules.util.get_competences_and_consistency([], FormDataType.MARKET)
+        self.assertListEqual(
+            modules.util.COMPETENCES_COLUMNS, empty[0].columns.to_list())
+        self.assertEqual(0, len(empty[1]))
+
+    def test_shared_cache(self):
+        from modules.ahp import Cache
+        forms = random_forms(20, consistent=10)
+        Cache.default.clear()
+        modules.util.get_competences_and_consistency(forms, FormDataType.MARKET)
+        # cada matriz preenchida (distinta) é calculada uma única vez
+        filled = len({
+            Cache.AhpCache.key(v) for f in forms
+            for k, v in f.getMatrices().items() if k != 'q15' and v[0][0] != 0})
+        self.assertEqual(filled, Cache.default.info().misses)
+
+        # a segunda passagem apenas consulta o cache
+        hits = Cache.default.info().hits
+        modules.util.calc_mean_matrix(forms)
+        occurrences = sum(
+            1 for f in forms for k, v in f.getMatrices().items() if k != 'q15' and v[0][0] != 0)
+        self.assertEqual(filled, Cache.default.info().misses)
+        self.assertEqual(hits + occurrences, Cache.default.info().hits)
 
     def test_calc_mean_matrix(self):
-        ...
+        forms = random_forms(20, consistent=10)
+        result = modules.util.calc_mean_matrix(forms)
+        # listas, como o dicionário da entrada (pode ser serializado)
+        self.assertDictEqual(result, json.loads(json.dumps(result)))
+
+        for k, value in result.items():
+            if k == 'q15':
+                expected = mean(Ahp.get_q15_value(f.getMatrices()[k]) for f in forms)
+                self.assertEqual(round(expected, 4), value)
+                continue
+            validas = [
+                f.getMatrices()[k] for f in forms if f.getMatrices()[k][0][0] != 0
+                and Ahp.calculate(f.getMatrices()[k])[0] <= 0.1]
+            self.assertIs(list, type(value))
+            np.testing.assert_allclose(np.mean(validas, axis=0), value, atol=5e-5)
 
     def test_calc_ahp_for_new_mat(self):
         ...
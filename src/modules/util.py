@@ -10,17 +10,16 @@ Implement tests for:
 - test_raise_MinimumLenghtError
 - test_raise_TypeError
 - test_get_competences_and_consistency
-- test_calc_mean_matrix
 - test_calc_ahp_for_new_mat
 """
 
 from __future__ import annotations
 import sys
-from typing import Dict, List, Tuple, Union, overload
+from typing import Any, Dict, Final, List, Optional, Tuple, Union, overload
 import logging as logger
 import numpy as np
 import pandas as pd
-from modules.ahp import Ahp
+from modules.ahp import Ahp, Cache
 from modules.ahp.Types import FormData, FormDataType
 # numpy linear algebra functions
 from numpy import linalg
@@ -43,8 +42,35 @@ class MinimumLenghtError(Exception):
         super().__init__(self.message)
 
 
+# Modos de agregação de :meth:`average`
+ARITHMETIC: Final[str] = 'arithmetic'
+GEOMETRIC: Final[str] = 'geometric'
+
+# Colunas dos dataframes de :meth:`get_competences_and_consistency`
+CONSISTENCY_COLUMNS: Final[List[str]] = [
+    'type',
+    'name',
+    *Ahp.Mapping.MATRICES_IDENTIFIERS,
+]
+COMPETENCES_COLUMNS: Final[List[str]] = [
+    'type',
+    'name',
+    *Ahp.Mapping.COMPETENCES_MATRIX_ROOT,
+    *Ahp.Mapping.COMPETENCES_MATRIX_FORM_Q1,
+    *Ahp.Mapping.COMPETENCES_MATRIX_Q12,
+    *Ahp.Mapping.COMPETENCES_MATRIX_Q13,
+    *Ahp.Mapping.COMPETENCES_MATRIX_Q15,
+    *Ahp.Mapping.COMPETENCES_MATRIX_Q2,
+    *Ahp.Mapping.COMPETENCES_MATRIX_Q3,
+]
+
+
 @overload
-def average(args: List[float], roundp: int = 4) -> float:
+def average(
+        args: List[float],
+        roundp: int = 4,
+        mode: str = ARITHMETIC,
+        weights: Optional[List[float]] = None) -> float:
     """
     Calculate the mean of a given amount of values.
 
@@ -57,6 +83,10 @@ def average(args: List[float], roundp: int = 4) -> float:
     ------------
     `roundp`:
         Number of decimal places used to round
+    `mode`:
+        `ARITHMETIC` or `GEOMETRIC` mean
+    `weights`:
+        The weight of each value. If None, all values have the same weight
 
     Returns
     -------
@@ -67,11 +97,14 @@ def average(args: List[float], roundp: int = 4) -> float:
     -------
     >>> l = [1, 1, 1, 1, 1]
     >>> average(l)
-    1
+    1.0
 
     .. centered:: Equation that describes its behavior:
     .. math:: \\frac{\\sum_{i=0}^N\\text{arg}_i}{N}
 
+    .. versionchanged:: 0.0.10
+        Added the `mode` and `weights` arguments.
+
     .. versionchanged:: 0.0.9
         Separated into two documentations
     """
@@ -79,7 +112,11 @@ def average(args: List[float], roundp: int = 4) -> float:
 
 
 @overload
-def average(args: List[List[List[float]]], roundp: int = 4) -> np.ndarray:
+def average(
+        args: Union[List[List[List[float]]], np.ndarray],
+        roundp: int = 4,
+        mode: str = ARITHMETIC,
+        weights: Optional[List[float]] = None) -> List[List[float]]:
     """
     Calculate the mean of a given amount of values.
     It can performs the mean over List[List[float]] or List[float].
@@ -87,16 +124,20 @@ def average(args: List[List[List[float]]], roundp: int = 4) -> np.ndarray:
     Args
     ----
     `args`:
-        A list of matrices
+        A list of matrices (or a stack, with shape N×rows×cols)
 
     Keyword Args
     ------------
     `roundp`:
         Number of decimal places used to round
+    `mode`:
+        `ARITHMETIC` or `GEOMETRIC` mean (the aggregation of individual judgments, AIJ)
+    `weights`:
+        The weight of each matrix (respondent). If None, all matrices have the same weight
 
     Returns
     -------
-    np.ndarray
+    List[List[float]]
         The matrix that corresponds to median for each position
 
     Example
@@ -106,13 +147,20 @@ def average(args: List[List[List[float]]], roundp: int = 4) -> np.ndarray:
     .. centered:: Equation that describes its behavior:
     .. math:: \\text{output} = \\frac{\\sum_{n=0}^N \\mathb{M}[n]_\\text{i x j}}{N}
 
+    .. versionchanged:: 0.0.10
+        Added the `mode` and `weights` arguments.
+
     .. versionchanged:: 0.0.7
         Fixed the problem with multiples pointers to the same memory address.
     """
     ...
 
 
-def average(args: ..., roundp: int = 4) -> ...:
+def average(
+        args: ...,
+        roundp: int = 4,
+        mode: str = ARITHMETIC,
+        weights: Optional[List[float]] = None) -> ...:
     """
     Calculate the mean of a given amount of values.
     It can performs the mean over List[List[float]] or List[float].
@@ -129,15 +177,26 @@ def average(args: ..., roundp: int = 4) -> ...:
 
         \\text{output}_\\text{(i,j)} = \\frac{\\sum_{n=0}^N \\text{Matrix}[n]_\\text{(i,j)}}{N} \\text{,     } \\forall \\text{ }0 \\leq i,j < N
 
+    .. centered:: Equation that describes the `GEOMETRIC` mode, with weights (normalized to sum 1):
+
+    .. math::
+
+        \\text{output}_\\text{(i,j)} = \\prod_{n=0}^N \\text{Matrix}[n]_\\text{(i,j)}^{w_n}
+
     Args
     ----
     `args`:
-        A list of floats or a list of matrices
+        A list of floats or a list of matrices (or a stack, with shape N×rows×cols)
 
     Keyword Args
     ------------
     `roundp`:
         Number of decimal places used to round
+    `mode`:
+        `ARITHMETIC` or `GEOMETRIC` mean. The geometric one is the standard aggregation of\
+            individual judgments (AIJ) for AHP groups, since it keeps the reciprocity of the matrices.
+    `weights`:
+        The weight of each element (respondent). If None, all elements have the same weight
 
     Raises
     ------
@@ -145,6 +204,8 @@ def average(args: ..., roundp: int = 4) -> ...:
         if the len(args) are less than 2
     `TypeError`:
         if the input type are not List[List[List[float]]] or List[float]
+    `ValueError`:
+        if the `mode` is unknown, or the `weights` are invalid (wrong length, negative or summing 0)
 
 
     Examples
@@ -153,7 +214,7 @@ def average(args: ..., roundp: int = 4) -> ...:
 
     >>> l = [1, 1, 1, 1, 1]
     >>> average(l)
-    1
+    1.0
 
     Using a list of list of floats
 
@@ -170,6 +231,19 @@ def average(args: ..., roundp: int = 4) -> ...:
     ...    for col in range(3):
     ...        assert result[row][col] == expected_result[row][col]
 
+    Using the geometric mean, where the first respondent has twice the weight of the second
+
+    >>> average([[[1, 9], [1/9, 1]], [[1, 1], [1, 1]]], mode=GEOMETRIC, weights=[2, 1])
+    [[1.0, 4.3267], [0.2311, 1.0]]
+
+    Note
+    ----
+    All elements are reduced at once (a stacked array), so the mean may differ from\
+        :func:`statistics.mean` in the last bits (before rounding).
+
+    .. versionchanged:: 0.0.10
+        Reduces a stacked array (instead of each position), and added the `mode` and `weights`\
+            arguments. The mean matrix is returned as lists (`List[List[float]]`).
 
     .. versionchanged:: 0.0.9
         Create two functions, splicing documentation according with param type.
@@ -177,42 +251,49 @@ def average(args: ..., roundp: int = 4) -> ...:
     .. versionchanged:: 0.0.7
         Fixed the problem with multiples pointers to the same memory address.
     """
-    from statistics import mean
-
     # must exist at least two elements
     if len(args) < 2:
         raise MinimumLenghtError(
             f"You should pass, at least, an array with 2 elements")
 
-    if type(args[0]) != float and type(args) != list:
+    if not isinstance(args, (list, tuple, np.ndarray)):
         raise TypeError(
             f"The elements must be a List[float] or List[List[List[float]]]. The type is {type(args)}")
 
-    # logger.debug(f'Average called.')
-    # if passed a list of float, returns a single float element
-    if type(args[0]) is not list:
-        out: float = round(
-            mean([scalar for scalar in args]), roundp)  # type:ignore
-        # logger.debug(f"It's a list of floats: {args} --> Mean={out}")
-        return out
-
-    # otherwise, create a new matrix
-    matrix_length = len(args[0])
-    # output_matrix: List[List[float]] = [[0.0]*matrix_length] * matrix_length
-    output_matrix: List[List[float]] = np.zeros((matrix_length, matrix_length))
-
-    # calcula a média item a item
-    for row in range(matrix_length):
-        for col in range(matrix_length):
-            current_elements = [m[row][col] for m in args]  # type: ignore
-            current_mean = mean(current_elements)
-            output_matrix[row][col] = round(current_mean, roundp)
+    try:
+        values: np.ndarray = np.asarray(args, dtype=np.float64)
+    except (TypeError, ValueError) as e:
+        raise TypeError(
+            f"The elements must be a List[float] or List[List[List[float]]]: {e}")
+    if values.ndim not in (1, 3):
+        raise TypeError(
+            f"The elements must be a List[float] or List[List[List[float]]]. The shape is {values.shape}")
+
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.shape != (len(values),) or (weights < 0).any() or not weights.sum() > 0:
+            raise ValueError(
+                f"Expected {len(values)} non negative weights (not all 0), got {weights}")
+
+    # reduz todos os elementos (eixo 0) de uma vez
+    if mode == ARITHMETIC:
+        out = np.average(values, axis=0, weights=weights)
+    elif mode == GEOMETRIC:
+        # um elemento 0 resulta em 0 (e os de peso 0 não participam, evitando 0 * -inf)
+        if weights is not None:
+            values, weights = values[weights > 0], weights[weights > 0]
+        with np.errstate(divide='ignore'):
+            out = np.exp(np.average(np.log(values), axis=0, weights=weights))
+    else:
+        raise ValueError(
+            f"Unknown mode \"{mode}\". Expected \"{ARITHMETIC}\" or \"{GEOMETRIC}\"")
 
-            # logger.debug(
-            #     f'Analysing for {row},{col} = {current_elements} --> Mean={current_mean}')
-    # logger.debug(f'It\'s a matrix:Mean={output_matrix}')
+    # if passed a list of float, returns a single float element
+    if values.ndim == 1:
+        return round(float(out), roundp)
 
-    return output_matrix
+    # otherwise, the new matrix (as lists, like the input)
+    return np.round(out, roundp).tolist()
 
 
 def errprint(msg: str) -> None:
@@ -227,9 +308,75 @@ def errprint(msg: str) -> None:
     sys.stderr.write('Error: ' + msg)
 
 
+def _competences_and_consistency(
+        data: List[FormData],
+        t: str,
+        method: str = Ahp.APPROXIMATE
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Calculate the rows of :meth:`get_competences_and_consistency` for a chunk of responses.
+
+    Returns
+    -------
+    Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]
+        The rows of the competences and of the consistency dataframes
+    """
+    respostas: List[Dict[str, Any]] = [response.getMatrices() for response in data]
+
+    # agrupa as matrizes preenchidas por id (e tamanho), calculando o ahp de cada grupo de uma vez
+    grupos: Dict[Tuple[str, int], List[int]] = {}
+    for i, matrices in enumerate(respostas):
+        for k, v in matrices.items():
+            # ... NOTE que aceita AHP errados
+            if k != "q15" and v[0][0] != 0:  # type: ignore
+                grupos.setdefault((k, len(v)), []).append(i)
+
+    # os resultados são guardados no cache compartilhado (usado depois por "calc_mean_matrix")
+    ahp: Dict[Tuple[int, str], Tuple[float, List[float]]] = {}
+    for (k, _), indices in grupos.items():
+        results = Cache.calculate_batch(
+            [respostas[i][k] for i in indices], method=method)
+        for i, result in zip(indices, results):
+            ahp[(i, k)] = result
+
+    competences: List[Dict[str, Any]] = []
+    consistency: List[Dict[str, Any]] = []
+    for i, (response, matrices) in enumerate(zip(data, respostas)):
+        _name: str = response.getName()
+
+        _secoes = {}
+        _cline: Dict[str, Any] = {k: "" for k in CONSISTENCY_COLUMNS}
+        _cline['type'] = t
+        _cline['name'] = _name
+
+        for k, v in matrices.items():
+            # verifica se é um escalar
+            if k == "q15":
+                priority_vec = Ahp.get_q15_value(v)  # type:ignore
+            elif (i, k) in ahp:
+                _cline[k], priority_vec = ahp[(i, k)]
+            else:
+                _cline[k] = 0
+                priority_vec = [0]*len(v)  # type: ignore
+
+            # adiciona as competências para cada matriz
+            _secoes[k] = priority_vec
+
+        consistency.append(_cline)
+        # faz o mapping para essas competências
+        _n: Dict[str, Any] = Ahp.Mapping.to_competences(_secoes)
+        _n['type'] = t
+        _n['name'] = _name
+        competences.append(_n)
+
+    return competences, consistency
+
+
 def get_competences_and_consistency(
         data: List[FormData],
-        tt: FormDataType
+        tt: FormDataType,
+        method: str = Ahp.APPROXIMATE,
+        workers: Optional[int] = None
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     It calculates the ahp for each *data*
@@ -241,79 +388,71 @@ def get_competences_and_consistency(
     `tt`:
         Type of each list of *data*. See more on :class:`modules.ahp.Types.FormDataType`
 
+    Keyword Args
+    ------------
+    `method`:
+        The AHP method. See :meth:`modules.ahp.Ahp.calculate`
+    `workers`:
+        The number of processes. If None (or 1), the responses are processed in this process.\
+            Otherwise, they are splitted in `workers` chunks.
+
     Returns
     -------
     Tuple[pd.DataFrame, pd.DataFrame]
         A tuple that contains:
             1. The mongo competences calculated and parsed to each competence
             2. The mongo consistency for each matrix
+
+    Note
+    ----
+    The matrices with the same id are calculated at once (see :meth:`modules.ahp.Cache.calculate_batch`),\
+        and each dataframe is created only once, from its rows. The results are stored in the shared\
+            cache (:data:`modules.ahp.Cache.default`), so :meth:`calc_mean_matrix` only looks them up.\
+                With `workers`, they're calculated (and cached) in the other processes.
+
+    .. versionchanged:: 0.0.10
+        Builds the dataframes from lists of rows (instead of `DataFrame.append`), and added\
+            the `method` and `workers` arguments.
     """
     t: str = tt.value
 
+    competences: List[Dict[str, Any]] = []
+    consistency: List[Dict[str, Any]] = []
+    if workers is None or workers <= 1 or len(data) < 2:
+        competences, consistency = _competences_and_consistency(data, t, method)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        size: int = -(-len(data) // workers)
+        chunks: List[List[FormData]] = [
+            data[i:i+size] for i in range(0, len(data), size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for rows, lines in executor.map(
+                    _competences_and_consistency,
+                    chunks, [t]*len(chunks), [method]*len(chunks)):
+                competences.extend(rows)
+                consistency.extend(lines)
+
     # dataframe de consistência para cada resposta
-    _dfconsist = [
-        'type',
-        'name',
-        *Ahp.Mapping.MATRICES_IDENTIFIERS,
-    ]
     mongo_competences_consistency: pd.DataFrame = pd.DataFrame(
-        columns=_dfconsist)
-
-    # cria um dataframe para armazenar a relação de respostas por competência
-    mongo_competences: pd.DataFrame = pd.DataFrame(columns=[
-        'type',
-        'name',
-        *Ahp.Mapping.COMPETENCES_MATRIX_ROOT,
-        *Ahp.Mapping.COMPETENCES_MATRIX_FORM_Q1,
-        *Ahp.Mapping.COMPETENCES_MATRIX_Q12,
-        *Ahp.Mapping.COMPETENCES_MATRIX_Q13,
-        *Ahp.Mapping.COMPETENCES_MATRIX_Q15,
-        *Ahp.Mapping.COMPETENCES_MATRIX_Q2,
-        *Ahp.Mapping.COMPETENCES_MATRIX_Q3,
-    ])
-
-    for response in data:
-        _type: str = t
-        _name: str = response.getName()
-
-        _secoes = {}
-        _matrices = response.getMatrices()
-        _cline = {k: "" for k in _dfconsist}
-        _cline['type'] = _type
-        _cline['name'] = _name
+        consistency, columns=CONSISTENCY_COLUMNS)
 
-        for k, v in _matrices.items():
-            # verifica se é um escalar
-            if k == "q15":
-                priority_vec = Ahp.get_q15_value(v)  # type:ignore
-                logger.debug(f"q15: {v} -> {priority_vec}")
-            else:
-                # caso seja uma matriz, calcula o ahp ...
-                # ... NOTE que aceita AHP errados
-                if v[0][0] != 0:  # type: ignore
-                    _cline[k], priority_vec = Ahp.calculate(v)  # type: ignore
-                else:
-                    _cline[k] = 0  # type: ignore
-                    priority_vec = [0]*len(v)  # type: ignore
-
-            # adiciona as competências para cada matriz
-            _secoes[k]: Union[float, List[float]
-                              ] = priority_vec  # type: ignore
-
-        mongo_competences_consistency = mongo_competences_consistency.append(
-            _cline, ignore_index=True)
-        # faz o mapping para essas competências
-        # _n: Dict[str, float] = Ahp.mapping_competences(_secoes)
-        _n: Dict[str, float] = Ahp.Mapping.to_competences(_secoes)
-        _n['type'] = _type  # type:ignore
-        _n['name'] = _name  # type:ignore
-        # adiciona o dicionário de competências ao dataframe
-        mongo_competences = mongo_competences.append(_n, ignore_index=True)
+    # cria um dataframe para armazenar a relação de respostas por competência ...
+    # ... as competências que não estão nas colunas são adicionadas no final
+    mongo_competences: pd.DataFrame = pd.DataFrame(
+        competences, columns=None if competences else COMPETENCES_COLUMNS)
+    extra: List[str] = [
+        c for c in mongo_competences.columns if c not in COMPETENCES_COLUMNS]
+    mongo_competences = mongo_competences.reindex(
+        columns=COMPETENCES_COLUMNS + extra)
 
     return mongo_competences, mongo_competences_consistency
 
 
-def calc_mean_matrix(data: List[FormData]) -> Dict[str, Union[float, List[List[float]]]]:
+def calc_mean_matrix(
+        data: List[FormData],
+        method: str = Ahp.APPROXIMATE,
+        mode: str = ARITHMETIC) -> Dict[str, Union[float, List[List[float]]]]:
     """
     It calculates the mean matrix that corresponds to the mean of all *data*.
 
@@ -327,6 +466,14 @@ def calc_mean_matrix(data: List[FormData]) -> Dict[str, Union[float, List[List[f
     `data`:
         The list of data obtained from :meth:`modules.ahp.Database.AhpForm.findByType`
 
+    Keyword Args
+    ------------
+    `method`:
+        The AHP method used to check if a matrix is valid. See :meth:`modules.ahp.Ahp.calculate`
+    `mode`:
+        How the matrices are aggregated (the q15 values always use the arithmetic mean).\
+            See :meth:`average`
+
     Returns
     -------
     Dict[str, Union[float, List[List[float]]]]
@@ -360,7 +507,7 @@ def calc_mean_matrix(data: List[FormData]) -> Dict[str, Union[float, List[List[f
                 if current[0][0] != 0:  # type: ignore
                     # logger.debug(
                     # f'\t\tThe matrix for this respondent was fullfilled')
-                    cr, _ = Ahp.calculate(current)  # type: ignore
+                    cr, _ = Cache.calculate(current, method=method)  # type: ignore
                 # também verifica se é um ahp válido
                 if cr <= 0.1:
                     # logger.debug(
@@ -377,7 +524,7 @@ def calc_mean_matrix(data: List[FormData]) -> Dict[str, Union[float, List[List[f
         # logger.debug(f'All matrices: {all_matrices}')
 
         # calcula a média ponderada para cada matriz válida
-        mean = average(all_matrices)
+        mean = average(all_matrices, mode=mode if matrix != 'q15' else ARITHMETIC)
         # logger.debug(f'Mean for:\n{all_matrices}\nis: {mean}')
         matrices[matrix] = mean  # type:ignore
 
@@ -385,7 +532,8 @@ def calc_mean_matrix(data: List[FormData]) -> Dict[str, Union[float, List[List[f
 
 
 def calc_ahp_for_new_mat(
-    matrices: Dict[str, Union[List[List[float]], float]]
+    matrices: Dict[str, Union[List[List[float]], float]],
+    method: str = Ahp.APPROXIMATE
 ) -> Dict[str, Union[List[float], float]]:
     """
     This function are only used to calculate AHP for each `matrices`
@@ -395,6 +543,11 @@ def calc_ahp_for_new_mat(
     `matrices`:
         A dictionary mapping a matrix to a matrix or a float
 
+    Keyword Args
+    ------------
+    `method`:
+        The AHP method. See :meth:`modules.ahp.Ahp.calculate`
+
     Returns
     -------
     Dict[str, Union[List[float], float]]
@@ -414,7 +567,8 @@ def calc_ahp_for_new_mat(
 
         # se for uma matriz, calcula o ahp. Senão, mantém o valor do q15
         if matrix != 'q15':
-            cr, priorityVec = Ahp.calculate(matrices[matrix])  # type: ignore
+            cr, priorityVec = Cache.calculate(
+                matrices[matrix], method=method)  # type: ignore
             logger.debug(f'Cr calculated: {cr}')
             logger.debug(f'PriorityVec: {priorityVec}')
             # arredonda o vetor de saída (resultante) para 2 casas decimais